@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+Ressources partagées de l'application, gérées par le lifespan FastAPI.
+
+Le conteneur construit le client OpenAI (pool de connexions dimensionné), les
+clients HTTP Fedlex et entscheidsuche et les pools de navigateurs, précharge
+les articles les plus demandés, suit les traitements en cours pour les laisser
+se terminer à l'arrêt, et indique si le worker est prêt à recevoir du trafic.
+
+Uvicorn ferme les WebSocket (code 1012) et attend les requêtes HTTP avant
+d'exécuter l'arrêt du lifespan : lancé par create_server, le serveur vide le
+worker dès le signal d'arrêt, avant de fermer les connexions. Lancé autrement
+(``uvicorn app.main:app``), seule la vidange du lifespan s'applique.
+"""
+import asyncio
+import functools
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from entscheidsuche_api import EntscheidsucheApiClient
+from fedlex_extractor import close_driver_pool, get_driver_pool
+from fedlex_http import FedlexHttpFetcher
+from playwright_manager import playwright_manager
+
+logger = logging.getLogger(__name__)
+
+APP_RESOURCES_SETTINGS = {
+    "openai_max_connections": int(os.getenv("OPENAI_MAX_CONNECTIONS", "20")),
+    "openai_max_keepalive_connections": int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "10")),
+    "openai_keepalive_expiry": float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "30")),
+    "openai_timeout": float(os.getenv("OPENAI_TIMEOUT", "120")),  # Réponses longues en streaming
+    "openai_connect_timeout": float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5")),
+    "prewarm_file": os.getenv("FEDLEX_PREWARM_FILE", os.path.join(os.path.dirname(__file__), "prewarm_articles.txt")),
+    "prewarm_count": int(os.getenv("FEDLEX_PREWARM_COUNT", "20")),  # 0 : pas de préchargement
+    "drain_timeout": float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT", "30")),
+}
+
+ArticleFetcher = Callable[[str, str], Awaitable[Dict[str, Any]]]
+
+
+class ServiceDraining(Exception):
+    """
+    Levée lorsqu'un traitement est demandé pendant l'arrêt du worker.
+    """
+
+
+def load_prewarm_list(path: Optional[str], count: int) -> List[Tuple[str, str]]:
+    """
+    Lit la liste des articles à précharger.
+
+    Args:
+        path (Optional[str]): Fichier "<code de loi> <numéro>" par ligne, du plus demandé au moins demandé.
+        count (int): Nombre maximal d'articles retenus.
+
+    Returns:
+        List[Tuple[str, str]]: (code de loi, numéro d'article), liste vide si le fichier est absent.
+    """
+    if not path or count <= 0 or not os.path.exists(path):
+        return []
+    articles = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            law_code, _, article_number = line.rpartition(" ")
+            if not law_code or not article_number:
+                logger.warning(f"Ligne ignorée dans {path} : {line}")
+                continue
+            articles.append((law_code.strip(), article_number))
+            if len(articles) >= count:
+                break
+    return articles
+
+
+def build_openai_client(api_key: Optional[str]) -> Any:
+    """
+    Client OpenAI asynchrone sur un pool de connexions dimensionné pour le contrôle d'admission.
+
+    Les réessais du SDK sont désactivés : seuls les 429 sont réessayés, dans create_gpt4_completion.
+    """
+    import httpx
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=APP_RESOURCES_SETTINGS["openai_max_connections"],
+            max_keepalive_connections=APP_RESOURCES_SETTINGS["openai_max_keepalive_connections"],
+            keepalive_expiry=APP_RESOURCES_SETTINGS["openai_keepalive_expiry"],
+        ),
+        timeout=httpx.Timeout(APP_RESOURCES_SETTINGS["openai_timeout"], connect=APP_RESOURCES_SETTINGS["openai_connect_timeout"]),
+    )
+    return AsyncOpenAI(api_key=api_key, max_retries=0, http_client=http_client)
+
+
+class AppResources:
+    """
+    Conteneur des clients et pools partagés, démarré et fermé par le lifespan.
+
+    Les clients sont aussi créés à la première utilisation, pour les appels hors
+    de l'application (scripts, tests) ; le lifespan les construit et les
+    préchauffe avant d'annoncer le worker comme prêt.
+    """
+
+    def __init__(self, openai_api_key: Optional[str], fedlex_backend: str = "http", jurisprudence_backend: str = "api"):
+        """
+        Args:
+            openai_api_key (Optional[str]): Clé de l'API OpenAI.
+            fedlex_backend (str): "http" ou "selenium" (pool WebDriver à préchauffer).
+            jurisprudence_backend (str): "api" ou "browser" (navigateur Playwright à démarrer).
+        """
+        self._openai_api_key = openai_api_key
+        self.fedlex_backend = fedlex_backend
+        self.jurisprudence_backend = jurisprudence_backend
+        self._openai: Any = None
+        self._fedlex_http: Optional[FedlexHttpFetcher] = None
+        self._entscheidsuche: Optional[EntscheidsucheApiClient] = None
+        self.playwright = playwright_manager
+        self.started = False
+        self.draining = False
+        self.warmed_drivers = 0
+        self._in_flight: Set[asyncio.Task] = set()
+        self._prewarm_task: Optional[asyncio.Task] = None
+        self._shutdown_task: Optional[asyncio.Task] = None
+        self._prewarm = {"requested": 0, "loaded": 0, "failed": 0, "done": False, "duration": None}
+
+    @property
+    def openai(self) -> Any:
+        if self._openai is None:
+            self._openai = build_openai_client(self._openai_api_key)
+        return self._openai
+
+    @property
+    def fedlex_http(self) -> FedlexHttpFetcher:
+        if self._fedlex_http is None:
+            self._fedlex_http = FedlexHttpFetcher()
+        return self._fedlex_http
+
+    @property
+    def entscheidsuche(self) -> EntscheidsucheApiClient:
+        if self._entscheidsuche is None:
+            self._entscheidsuche = EntscheidsucheApiClient()
+        return self._entscheidsuche
+
+    async def start(self) -> None:
+        """
+        Construit les clients et préchauffe les pools de navigateurs nécessaires au backend choisi.
+        """
+        self._openai = self._openai or build_openai_client(self._openai_api_key)
+        self._fedlex_http = self._fedlex_http or FedlexHttpFetcher()
+        self._entscheidsuche = self._entscheidsuche or EntscheidsucheApiClient()
+        if self.fedlex_backend == "selenium":
+            driver_pool = get_driver_pool()
+            self.warmed_drivers = await asyncio.to_thread(driver_pool.warm)
+            logger.info(f"Pool WebDriver préchauffé : {self.warmed_drivers}/{driver_pool.size} sessions")
+        if self.jurisprudence_backend == "browser":
+            try:
+                await self.playwright.start()
+            except Exception as e:
+                # Le démarrage sera retenté au premier emprunt d'une page
+                logger.error(f"Impossible de démarrer Playwright: {e}")
+        self.started = True
+
+    def start_prewarm(self, fetch_article: ArticleFetcher) -> None:
+        """
+        Lance en arrière-plan le préchargement des articles les plus demandés.
+
+        Args:
+            fetch_article (ArticleFetcher): Extraction d'un article (cache compris), appelée avec (code de loi, numéro).
+        """
+        articles = load_prewarm_list(APP_RESOURCES_SETTINGS["prewarm_file"], APP_RESOURCES_SETTINGS["prewarm_count"])
+        self._prewarm["requested"] = len(articles)
+        self._prewarm_task = asyncio.create_task(self._run_prewarm(fetch_article, articles))
+
+    async def _run_prewarm(self, fetch_article: ArticleFetcher, articles: List[Tuple[str, str]]) -> None:
+        started_at = time.perf_counter()
+        results = await asyncio.gather(*(fetch_article(law_code, number) for law_code, number in articles), return_exceptions=True)
+        for (law_code, number), result in zip(articles, results):
+            if isinstance(result, dict) and result.get("success"):
+                self._prewarm["loaded"] += 1
+            else:
+                self._prewarm["failed"] += 1
+                logger.warning(f"Préchargement de l'article {law_code} {number} impossible : {result if isinstance(result, Exception) else result.get('error')}")
+        self._prewarm["done"] = True
+        self._prewarm["duration"] = round(time.perf_counter() - started_at, 3)
+        logger.info(f"Articles préchargés : {self._prewarm['loaded']}/{self._prewarm['requested']} en {self._prewarm['duration']} s")
+
+    @asynccontextmanager
+    async def in_flight(self) -> AsyncIterator[None]:
+        """
+        Enregistre la tâche courante comme traitement en cours, attendu à l'arrêt.
+
+        Raises:
+            ServiceDraining: Si le worker est en cours d'arrêt.
+        """
+        if self.draining:
+            raise ServiceDraining("Service en cours d'arrêt, veuillez réessayer")
+        task = asyncio.current_task()
+        self._in_flight.add(task)
+        try:
+            yield
+        finally:
+            self._in_flight.discard(task)
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """
+        Refuse les nouveaux traitements et attend la fin de ceux en cours (annulés au-delà du délai).
+        """
+        self.draining = True
+        if self._prewarm_task is not None:
+            self._prewarm_task.cancel()
+        pending = {task for task in self._in_flight if not task.done()}
+        if not pending:
+            return
+        timeout = APP_RESOURCES_SETTINGS["drain_timeout"] if timeout is None else timeout
+        logger.info(f"Arrêt : attente de {len(pending)} traitements en cours (au plus {timeout} s)")
+        _, pending = await asyncio.wait(pending, timeout=timeout)
+        if pending:
+            logger.warning(f"Arrêt : {len(pending)} traitements annulés après {timeout} s")
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def start_shutdown(self, forward: Callable[[], Any]) -> None:
+        """
+        Vide le worker puis appelle ``forward`` (arrêt du serveur) ; immédiatement si la vidange est déjà lancée.
+
+        Args:
+            forward (Callable[[], Any]): Suite de l'arrêt, appelée sur la boucle d'événements.
+        """
+        if self._shutdown_task is not None or self.draining:
+            forward()
+            return
+        logger.info("Signal d'arrêt reçu : vidange avant la fermeture des connexions")
+        self._shutdown_task = asyncio.ensure_future(self._drain_then(forward))
+
+    async def _drain_then(self, forward: Callable[[], Any]) -> None:
+        try:
+            await self.drain()
+        finally:
+            forward()
+
+    async def aclose(self) -> None:
+        """
+        Ferme les clients HTTP, le navigateur Playwright et le pool WebDriver.
+        """
+        await self.playwright.stop()
+        if self._fedlex_http is not None:
+            await self._fedlex_http.aclose()
+        if self._entscheidsuche is not None:
+            await self._entscheidsuche.aclose()
+        if self._openai is not None:
+            await self._openai.close()
+        await asyncio.to_thread(close_driver_pool)
+        self.started = False
+
+    def readiness(self) -> Dict[str, Any]:
+        """
+        État de préparation du worker : prêt lorsque les pools nécessaires sont chauds et le préchargement terminé.
+        """
+        checks: Dict[str, Any] = {"started": self.started, "draining": self.draining, "prewarm": dict(self._prewarm)}
+        ready = self.started and not self.draining and self._prewarm["done"]
+        if self.fedlex_backend == "selenium":
+            checks["driver_pool"] = {**get_driver_pool().stats(), "warmed": self.warmed_drivers}
+            ready = ready and self.warmed_drivers > 0
+        if self.jurisprudence_backend == "browser":
+            checks["playwright"] = self.playwright.stats()
+            ready = ready and self.playwright.started
+        return {"ready": ready, "in_flight": len(self._in_flight), "checks": checks}
+
+
+def create_server(app: Any, resources: AppResources, **config: Any) -> Any:
+    """
+    Serveur uvicorn qui vide le worker au premier signal d'arrêt, avant de fermer les connexions.
+
+    Le premier SIGINT/SIGTERM refuse les nouvelles questions et attend celles en cours
+    (au plus drain_timeout), WebSocket ouvertes ; l'arrêt d'uvicorn suit. Un second
+    signal pendant la vidange arrête le serveur sans attendre.
+
+    Args:
+        app (Any): Application ASGI.
+        resources (AppResources): Ressources à vider.
+        **config (Any): Paramètres de uvicorn.Config (host, port...).
+
+    Returns:
+        uvicorn.Server: Serveur à lancer avec ``run()``.
+    """
+    import uvicorn
+
+    class DrainingServer(uvicorn.Server):
+        def handle_exit(self, sig: int, frame: Any) -> None:
+            forward = functools.partial(super().handle_exit, sig, frame)
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                forward()
+                return
+            loop.call_soon_threadsafe(resources.start_shutdown, forward)
+
+    return DrainingServer(uvicorn.Config(app, **config))
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Reconnaissance des citations d'articles de loi dans les réponses GPT-4o.
+
+Le même analyseur de ligne sert à l'analyse complète de la réponse
+(parse_articles) et à l'analyse incrémentale pendant le streaming, qui permet
+de lancer l'extraction Fedlex d'un article dès que sa ligne est terminée.
+"""
+import logging
+import re
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from article_numbers import LATIN_SUFFIXES
+
+logger = logging.getLogger(__name__)
+
+ARTICLES_SECTION_HEADER = "Articles de Loi :"
+# Numéro d'article : chiffres suivis d'un suffixe latin (« 6bis ») ou d'une lettre (« 266g »)
+_ARTICLE_NUMBER = r'\d+(?:' + '|'.join(sorted(LATIN_SUFFIXES, key=len, reverse=True)) + r'|[a-z])?'
+ARTICLE_LINE_PATTERN = re.compile(
+    r'\s*-\s*\*\*(?:art\.|article)\s*(' + _ARTICLE_NUMBER + r'(?:-' + _ARTICLE_NUMBER + r')?)\s*([^*]+)\*\*\s*:\s*(.+)',
+    re.IGNORECASE,
+)
+
+LawCodeNormalizer = Callable[[str], Optional[str]]
+
+
+def parse_article_line(line: str, normalize_law_code: LawCodeNormalizer) -> Dict[str, str]:
+    """
+    Analyse une ligne de la section « Articles de Loi ».
+
+    Args:
+        line (str): Ligne de la forme "- **art. 41 CO** : description".
+        normalize_law_code (LawCodeNormalizer): Normalisation du code de loi (None si inconnu).
+
+    Returns:
+        Dict[str, str]: {article_number, law_code, description}, ou {"error": message}.
+    """
+    match = ARTICLE_LINE_PATTERN.match(line.strip())
+    if not match:
+        return {"error": f"Format d'article non reconnu: {line.strip()}"}
+    article_number, law_code, description = match.groups()
+    normalized = normalize_law_code(law_code.strip())
+    if not normalized:
+        return {"error": f"Code de loi non reconnu: {law_code.strip()}"}
+    return {
+        "article_number": article_number.strip(),
+        "law_code": normalized,
+        "description": description.strip(),
+    }
+
+
+def parse_articles(section: str, normalize_law_code: LawCodeNormalizer) -> List[Dict[str, str]]:
+    """
+    Analyse une section « Articles de Loi » complète (la première ligne est l'en-tête).
+    """
+    return [parse_article_line(line, normalize_law_code) for line in section.split('\n')[1:]]
+
+
+class IncrementalArticleParser:
+    """
+    Reconnaît les citations d'articles au fil des fragments d'une réponse en streaming.
+
+    Chaque ligne terminée de la section « Articles de Loi » est analysée avec
+    parse_article_line ; chaque article reconnu est signalé une seule fois.
+    Le résultat de référence reste l'analyse de la réponse complète.
+    """
+
+    def __init__(self, normalize_law_code: LawCodeNormalizer, on_article: Callable[[str, str], None]):
+        """
+        Args:
+            normalize_law_code (LawCodeNormalizer): Normalisation du code de loi.
+            on_article (Callable[[str, str], None]): Appelée avec (law_code, article_number) pour chaque article reconnu.
+        """
+        self._normalize_law_code = normalize_law_code
+        self._on_article = on_article
+        self._buffer = ""
+        self._in_articles_section = False
+        self.seen: Set[Tuple[str, str]] = set()
+
+    def feed(self, delta: str) -> None:
+        self._buffer += delta
+        *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            self._process_line(line)
+
+    def close(self) -> None:
+        if self._buffer:
+            self._process_line(self._buffer)
+            self._buffer = ""
+
+    def _process_line(self, line: str) -> None:
+        if not line:
+            # Ligne vide : fin de section, comme le découpage "\n\n" de l'analyse complète
+            self._in_articles_section = False
+        elif self._in_articles_section:
+            article = parse_article_line(line, self._normalize_law_code)
+            if "error" in article:
+                return
+            key = (article["law_code"], article["article_number"])
+            if key not in self.seen:
+                self.seen.add(key)
+                self._on_article(*key)
+        elif ARTICLES_SECTION_HEADER in line:
+            self._in_articles_section = True
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Numérotation des articles Fedlex et expansion des plages d'articles.
+
+Les articles insérés entre deux articles existants portent un suffixe latin
+(« 6bis », « 6ter », « 6quater »...) ou une lettre (« 266a » ... « 266g »).
+Une plage citée par GPT-4o (« 266-266g », « 319-362 ») est développée d'après
+la liste des articles réellement présents dans l'acte lorsqu'elle est connue,
+sinon d'après cette numérotation.
+"""
+import logging
+import os
+import re
+from typing import Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_RANGE_ARTICLES = int(os.getenv("FEDLEX_MAX_RANGE_ARTICLES", "200"))  # Articles au plus par plage citée
+
+LATIN_SUFFIXES = (
+    "bis", "ter", "quater", "quinquies", "sexies", "septies", "octies", "novies", "decies",
+    "undecies", "duodecies", "terdecies", "quaterdecies", "quinquiesdecies", "sexiesdecies", "septiesdecies",
+)
+ARTICLE_NUMBER_PATTERN = re.compile(r"^(\d+)([a-z]*)$")
+ARTICLE_RANGE_PATTERN = re.compile(r"^(.+?)\s*[-–]\s*(.+)$")
+
+ArticleKey = Tuple[int, int, str]
+
+
+def canonical_article_number(article_number: str) -> str:
+    """
+    Normalise un numéro d'article (minuscules, sans « art. », espaces ni soulignés).
+    """
+    return re.sub(r"[\s_]", "", article_number.lower().replace("art.", ""))
+
+
+def article_sort_key(article_number: str) -> ArticleKey:
+    """
+    Clé de tri d'un numéro d'article dans l'ordre de l'acte : 6 < 6a < 6b, 6 < 6bis < 6ter < 7.
+
+    Args:
+        article_number (str): Numéro de l'article (ex. "266g", "6bis").
+
+    Returns:
+        ArticleKey: (numéro de base, rang du suffixe, suffixe).
+
+    Raises:
+        ValueError: Si le numéro n'est pas de la forme chiffres + suffixe.
+    """
+    match = ARTICLE_NUMBER_PATTERN.match(canonical_article_number(article_number))
+    if not match:
+        raise ValueError(f"Numéro d'article invalide: {article_number}")
+    base, suffix = match.groups()
+    if not suffix:
+        rank = 0
+    elif suffix in LATIN_SUFFIXES:
+        rank = LATIN_SUFFIXES.index(suffix) + 1
+    elif len(suffix) == 1:
+        rank = ord(suffix) - ord("a") + 1
+    else:
+        # Suffixe inconnu : classé après les suffixes reconnus du même article
+        rank = len(LATIN_SUFFIXES) + 26
+    return int(base), rank, suffix
+
+
+def split_article_range(article_number: str) -> Optional[Tuple[str, str]]:
+    """
+    Sépare les bornes d'une plage d'articles ("266-266g" -> ("266", "266g")).
+
+    Returns:
+        Optional[Tuple[str, str]]: Les bornes normalisées, ou None s'il ne s'agit pas d'une plage.
+    """
+    match = ARTICLE_RANGE_PATTERN.match(article_number.strip())
+    if not match:
+        return None
+    return canonical_article_number(match.group(1)), canonical_article_number(match.group(2))
+
+
+def _suffixes_between(first_rank: int, last_rank: int, latin: bool) -> List[str]:
+    if latin:
+        return list(LATIN_SUFFIXES[max(first_rank, 1) - 1:last_rank])
+    return [chr(ord("a") + rank - 1) for rank in range(max(first_rank, 1), min(last_rank, 26) + 1)]
+
+
+def expand_article_range(start: str, end: str, known_numbers: Optional[Iterable[str]] = None, limit: int = MAX_RANGE_ARTICLES) -> List[str]:
+    """
+    Développe une plage d'articles en la liste ordonnée de ses membres.
+
+    Args:
+        start (str): Premier article de la plage.
+        end (str): Dernier article de la plage (les bornes inversées sont acceptées).
+        known_numbers (Optional[Iterable[str]]): Numéros des articles de l'acte, s'ils sont connus.
+        limit (int): Nombre maximal de membres renvoyés.
+
+    Returns:
+        List[str]: Numéros normalisés des articles de la plage, bornes comprises.
+
+    Raises:
+        ValueError: Si une borne n'est pas un numéro d'article.
+    """
+    first, last = sorted((article_sort_key(start), article_sort_key(end)))
+
+    members: List[Tuple[ArticleKey, str]] = []
+    for number in known_numbers or ():
+        try:
+            key = article_sort_key(number)
+        except ValueError:
+            continue
+        if first <= key <= last:
+            members.append((key, canonical_article_number(number)))
+
+    if members:
+        numbers = [number for _, number in sorted(members)]
+    else:
+        # Acte non disponible : membres déduits de la numérotation
+        first_base, first_rank, first_suffix = first
+        last_base, last_rank, last_suffix = last
+        latin = first_suffix in LATIN_SUFFIXES or last_suffix in LATIN_SUFFIXES
+        if first_base == last_base:
+            numbers = [f"{first_base}{first_suffix}"] + [f"{first_base}{suffix}" for suffix in _suffixes_between(first_rank + 1, last_rank, latin)]
+        else:
+            numbers = [f"{first_base}{first_suffix}"] + [str(base) for base in range(first_base + 1, last_base + 1)]
+            numbers += [f"{last_base}{suffix}" for suffix in _suffixes_between(1, last_rank, latin)]
+
+    if len(numbers) > limit:
+        logger.warning(f"Plage d'articles {start}-{end} tronquée à {limit} articles sur {len(numbers)}")
+        numbers = numbers[:limit]
+    return numbers
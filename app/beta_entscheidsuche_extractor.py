@@ -1,17 +1,13 @@
 # -*- coding: utf-8 -*-
 import asyncio
 import random
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 import logging
 import sys
 import json
 import io
 import unicodedata
 from typing import List, Dict, Any
-
-# Configuration de l'encodage
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+from playwright_manager import PlaywrightManager, STEALTH_INIT_SCRIPT
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -30,6 +26,9 @@ async def human_typing(page, selector, text, delay=0.1):
 
 async def wait_for_results(page, timeout=60000, max_retries=3):
     """Attend que les résultats apparaissent avec gestion des retries."""
+    # Import différé : Playwright n'est chargé qu'à la première recherche
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
     for attempt in range(max_retries):
         try:
             await page.wait_for_selector('div.result-item', timeout=timeout)
@@ -70,19 +69,8 @@ async def extract_results(page, limit=20) -> List[Dict[str, str]]:
     logger.info(f"Nombre de résultats uniques extraits : {len(extracted_data)}")
     return extracted_data
 
-async def run(playwright, query: str) -> List[Dict[str, Any]]:
-    browser = await playwright.chromium.launch(headless=True)
-    context = await browser.new_context(locale='fr-FR')
-
-    # Masquer les indicateurs d'automatisation
-    await context.add_init_script("""
-        Object.defineProperty(navigator, 'webdriver', {
-            get: () => undefined
-        });
-    """)
-
-    page = await context.new_page()
-
+async def search(page, query: str) -> List[Dict[str, Any]]:
+    """Effectue une recherche sur une page Playwright déjà ouverte (les erreurs de navigation sont propagées)."""
     try:
         # Accéder à l'URL
         logger.info("Accès à l'URL : https://beta.entscheidsuche.ch/")
@@ -116,17 +104,42 @@ async def run(playwright, query: str) -> List[Dict[str, Any]]:
 
     except Exception as e:
         logger.error(f"Une erreur s'est produite : {e}")
-        await page.screenshot(path="error_screenshot.png")
-        return []
+        try:
+            await page.screenshot(path="error_screenshot.png")
+        except Exception as screenshot_error:
+            logger.debug(f"Capture d'écran impossible : {screenshot_error}")
+        # L'erreur remonte jusqu'au pool de pages, qui recycle le contexte
+        raise
+
+async def run(playwright, query: str) -> List[Dict[str, Any]]:
+    browser = await playwright.chromium.launch(headless=True)
+    context = await browser.new_context(locale='fr-FR')
+    await context.add_init_script(STEALTH_INIT_SCRIPT)
+    page = await context.new_page()
+
+    try:
+        return await search(page, query)
     finally:
         await browser.close()
 
 async def main(query: str) -> List[Dict[str, Any]]:
+    from playwright.async_api import async_playwright
+
     query = normalize_text(query.encode('utf-8').decode('utf-8'))
     async with async_playwright() as playwright:
         return await run(playwright, query)
 
+async def search_with_manager(manager: PlaywrightManager, query: str) -> List[Dict[str, Any]]:
+    """Recherche en empruntant une page au navigateur partagé du processus."""
+    query = normalize_text(query)
+    async with manager.page() as page:
+        return await search(page, query)
+
 if __name__ == "__main__":
+    # Configuration de l'encodage (uniquement en ligne de commande, pas à l'import)
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
     if len(sys.argv) != 2:
         print("Usage: python beta_entscheidsuche_extractor.py <keyword>")
         sys.exit(1)
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estime la taille mémoire d'une valeur à partir de sa sérialisation JSON.
+    """
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 0
+
+
+class BoundedTTLCache:
+    """
+    Cache borné (nombre d'entrées et/ou octets) avec expiration TTL et éviction LRU.
+
+    Thread-safe : utilisable depuis la boucle d'événements comme depuis les
+    threads de ``asyncio.to_thread``. Les compteurs hits/misses/evictions/expirations
+    sont exposés par ``stats()``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = 1024,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        sizeof: Callable[[Any], int] = estimate_size,
+    ):
+        """
+        Args:
+            name (str): Nom du cache (utilisé dans les statistiques).
+            max_entries (int): Nombre maximal d'entrées.
+            max_bytes (Optional[int]): Taille maximale estimée en octets (aucune limite si None).
+            ttl (Optional[float]): Durée de vie des entrées en secondes (pas d'expiration si None).
+            sizeof (Callable[[Any], int]): Fonction d'estimation de la taille d'une valeur.
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self._stats["misses"] += 1
+                return default
+            value, expires_at, _ = entry
+            if expires_at and expires_at <= time.monotonic():
+                self._remove(key)
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return default
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        size = self._sizeof(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            logger.warning(f"Valeur trop volumineuse pour le cache {self.name} ({size} octets), ignorée")
+            return
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, time.monotonic() + ttl if ttl else 0.0, size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes):
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self._stats["evictions"] += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+            }
+
+
+_caches: Dict[str, BoundedTTLCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name: str, max_entries: int = 1024, max_bytes: Optional[int] = None, ttl: Optional[float] = None) -> BoundedTTLCache:
+    """
+    Retourne le cache nommé, créé au premier appel.
+
+    Les limites peuvent être surchargées par les variables d'environnement
+    CACHE_<NOM>_MAX_ENTRIES, CACHE_<NOM>_MAX_BYTES et CACHE_<NOM>_TTL.
+
+    Args:
+        name (str): Nom du cache.
+        max_entries (int): Nombre maximal d'entrées par défaut.
+        max_bytes (Optional[int]): Taille maximale par défaut, en octets.
+        ttl (Optional[float]): Durée de vie par défaut, en secondes.
+
+    Returns:
+        BoundedTTLCache: Le cache partagé portant ce nom.
+    """
+    with _caches_lock:
+        if name not in _caches:
+            prefix = f"CACHE_{name.upper()}_"
+            _caches[name] = BoundedTTLCache(
+                name,
+                max_entries=int(os.getenv(prefix + "MAX_ENTRIES", max_entries)),
+                max_bytes=int(os.getenv(prefix + "MAX_BYTES", max_bytes or 0)) or None,
+                ttl=float(os.getenv(prefix + "TTL", ttl or 0)) or None,
+            )
+        return _caches[name]
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    with _caches_lock:
+        caches = list(_caches.values())
+    return {cache.name: cache.stats() for cache in caches}
+
+
+def cached(
+    cache: BoundedTTLCache,
+    should_cache: Callable[[Any], bool] = lambda result: result is not None,
+    key: Optional[Callable[..., Hashable]] = None,
+):
+    """
+    Décorateur de mémoïsation d'une fonction synchrone dans un BoundedTTLCache.
+
+    Contrairement à functools.lru_cache, seuls les résultats acceptés par
+    ``should_cache`` sont conservés (les échecs ne sont pas mis en cache).
+
+    Args:
+        cache (BoundedTTLCache): Cache de destination.
+        should_cache (Callable[[Any], bool]): Prédicat indiquant si un résultat peut être mis en cache.
+        key (Optional[Callable[..., Hashable]]): Calcul de la clé à partir des arguments (tous les arguments par défaut).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+            result = cache.get(cache_key, _MISSING)
+            if result is not _MISSING:
+                return result
+            result = func(*args, **kwargs)
+            if should_cache(result):
+                cache.set(cache_key, result)
+            return result
+        wrapper.cache = cache
+        return wrapper
+    return decorator
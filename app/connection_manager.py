@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+Registre des connexions WebSocket et diffusion de messages à tous les clients.
+
+Chaque client dispose d'une file d'envoi bornée, vidée par sa propre tâche :
+la diffusion ne fait que déposer le message dans chaque file et n'attend
+jamais un client lent. Un client dont la file est pleine perd le message,
+ou est déconnecté selon la politique choisie. Un backend pub/sub optionnel
+(Redis, ou en mémoire pour un processus unique et les tests) relaie les
+diffusions vers les clients connectés aux autres workers.
+"""
+import asyncio
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+import orjson
+
+from ws_outbox import WebSocketOutbox
+
+logger = logging.getLogger(__name__)
+
+CONNECTION_MANAGER_SETTINGS = {
+    "max_queue": int(os.getenv("WS_CLIENT_QUEUE_SIZE", "100")),
+    "slow_consumer_policy": os.getenv("WS_SLOW_CONSUMER_POLICY", "drop"),  # "drop" : message perdu, "disconnect" : client déconnecté
+    "pubsub_url": os.getenv("BROADCAST_PUBSUB_URL"),
+    "channel": "lextutor:broadcast",
+}
+
+
+class PubSubBackend(ABC):
+    """
+    Interface d'un canal de diffusion entre workers.
+    """
+
+    name = "abstract"
+
+    @abstractmethod
+    async def publish(self, channel: str, payload: bytes) -> None:
+        pass
+
+    @abstractmethod
+    def subscribe(self, channel: str) -> AsyncIterator[bytes]:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+
+class InMemoryPubSub(PubSubBackend):
+    """
+    Pub/sub en mémoire : même interface que Redis, limité au processus courant.
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    async def publish(self, channel: str, payload: bytes) -> None:
+        for queue in list(self._subscribers.get(channel, ())):
+            queue.put_nowait(payload)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[bytes]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(channel, set()).add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers[channel].discard(queue)
+
+
+class RedisPubSub(PubSubBackend):
+    """
+    Pub/sub Redis (redis.asyncio), partagé par tous les workers.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        from redis import asyncio as redis_asyncio
+
+        self._client = redis_asyncio.from_url(url)
+
+    async def publish(self, channel: str, payload: bytes) -> None:
+        await self._client.publish(channel, payload)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[bytes]:
+        pubsub = self._client.pubsub()
+        await pubsub.subscribe(channel)
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    yield message["data"]
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.close()
+
+    async def aclose(self) -> None:
+        await self._client.close()
+
+
+def create_pubsub(url: Optional[str]) -> Optional[PubSubBackend]:
+    """
+    Construit le backend pub/sub à partir de son URL.
+
+    Args:
+        url (Optional[str]): "redis://hôte:port/db", "memory://", ou vide pour une diffusion locale uniquement.
+
+    Returns:
+        Optional[PubSubBackend]: Le backend, ou None si aucun n'est configuré.
+    """
+    if not url:
+        return None
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisPubSub(url)
+    if url.startswith("memory://"):
+        return InMemoryPubSub()
+    raise ValueError(f"Backend pub/sub non supporté: {url}")
+
+
+class _Client:
+    __slots__ = ("client_id", "outbox", "queue", "pump", "dropped")
+
+    def __init__(self, client_id: str, outbox: WebSocketOutbox, max_queue: int):
+        self.client_id = client_id
+        self.outbox = outbox
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.pump: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+
+class ConnectionManager:
+    """
+    Registre des clients WebSocket connectés (enregistrement et retrait en O(1)) et diffusion.
+    """
+
+    def __init__(self, max_queue: int = 100, slow_consumer_policy: str = "drop", pubsub: Optional[PubSubBackend] = None, channel: str = "lextutor:broadcast"):
+        """
+        Args:
+            max_queue (int): Taille de la file d'envoi de chaque client.
+            slow_consumer_policy (str): "drop" (message perdu) ou "disconnect" (client déconnecté) si la file est pleine.
+            pubsub (Optional[PubSubBackend]): Relais entre workers (diffusion locale uniquement si None).
+            channel (str): Canal pub/sub des diffusions.
+        """
+        self.max_queue = max_queue
+        self.slow_consumer_policy = slow_consumer_policy
+        self.pubsub = pubsub
+        self.channel = channel
+        self._clients: Dict[str, _Client] = {}
+        self._subscriber: Optional[asyncio.Task] = None
+        self._closing: Set[asyncio.Task] = set()
+        self._stats = {"broadcasts": 0, "delivered": 0, "dropped": 0, "disconnected": 0}
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def register(self, client_id: str, outbox: WebSocketOutbox) -> None:
+        client = _Client(client_id, outbox, self.max_queue)
+        client.pump = asyncio.create_task(self._pump(client))
+        self._clients[client_id] = client
+
+    def unregister(self, client_id: str) -> None:
+        client = self._clients.pop(client_id, None)
+        if client is not None and client.pump is not None:
+            client.pump.cancel()
+
+    async def _pump(self, client: _Client) -> None:
+        while True:
+            message = await client.queue.get()
+            try:
+                await client.outbox.send(message)
+            except Exception as e:
+                logger.info(f"Diffusion interrompue pour {client.client_id} : {e}")
+                self.unregister(client.client_id)
+                return
+
+    async def broadcast(self, message: Dict[str, Any], local: bool = False) -> None:
+        """
+        Diffuse un message à tous les clients.
+
+        Args:
+            message (Dict[str, Any]): Message à envoyer.
+            local (bool): Si True, seuls les clients de ce worker le reçoivent, même avec un backend pub/sub.
+        """
+        if self.pubsub is not None and not local:
+            await self.pubsub.publish(self.channel, orjson.dumps(message))
+        else:
+            self.deliver(message)
+
+    def deliver(self, message: Dict[str, Any]) -> int:
+        """
+        Dépose un message dans la file de chaque client de ce worker, sans attendre aucun d'eux.
+
+        Returns:
+            int: Nombre de clients auxquels le message a été remis.
+        """
+        self._stats["broadcasts"] += 1
+        delivered = 0
+        for client in list(self._clients.values()):
+            try:
+                client.queue.put_nowait(message)
+                delivered += 1
+            except asyncio.QueueFull:
+                client.dropped += 1
+                self._stats["dropped"] += 1
+                if self.slow_consumer_policy == "disconnect":
+                    logger.warning(f"Client lent {client.client_id} déconnecté (file de diffusion pleine)")
+                    self._stats["disconnected"] += 1
+                    self.unregister(client.client_id)
+                    task = asyncio.create_task(self._disconnect(client))
+                    self._closing.add(task)
+                    task.add_done_callback(self._closing.discard)
+        self._stats["delivered"] += delivered
+        return delivered
+
+    async def _disconnect(self, client: _Client) -> None:
+        try:
+            await client.outbox.websocket.close(code=1013)
+        except Exception as e:
+            logger.debug(f"Fermeture de {client.client_id} impossible : {e}")
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async for payload in self.pubsub.subscribe(self.channel):
+                    self.deliver(orjson.loads(payload))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Abonnement pub/sub interrompu, nouvelle tentative : {e}")
+                await asyncio.sleep(1)
+
+    async def start(self) -> None:
+        if self.pubsub is not None and self._subscriber is None:
+            self._subscriber = asyncio.create_task(self._listen())
+            # Laisse l'abonnement s'établir avant les premières diffusions
+            await asyncio.sleep(0)
+
+    async def stop(self) -> None:
+        if self._subscriber is not None:
+            self._subscriber.cancel()
+            self._subscriber = None
+        for client_id in list(self._clients):
+            self.unregister(client_id)
+        if self.pubsub is not None:
+            await self.pubsub.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "clients": len(self._clients),
+            "queued": sum(client.queue.qsize() for client in self._clients.values()),
+            "pubsub": self.pubsub.name if self.pubsub else None,
+        }
+
+
+connection_manager = ConnectionManager(
+    max_queue=CONNECTION_MANAGER_SETTINGS["max_queue"],
+    slow_consumer_policy=CONNECTION_MANAGER_SETTINGS["slow_consumer_policy"],
+    pubsub=create_pubsub(CONNECTION_MANAGER_SETTINGS["pubsub_url"]),
+    channel=CONNECTION_MANAGER_SETTINGS["channel"],
+)
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Recherche de jurisprudence directement sur l'index Elasticsearch d'entscheidsuche.ch.
+
+Évite la saisie simulée et les défilements de beta_entscheidsuche_extractor :
+la requête est envoyée telle quelle, paginée côté serveur, et les résultats
+sont renvoyés au même format {title, link, summary}.
+"""
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from beta_entscheidsuche_extractor import normalize_text
+from rate_limiter import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+ENTSCHEIDSUCHE_API_SETTINGS = {
+    "search_url": os.getenv("ENTSCHEIDSUCHE_SEARCH_URL", "https://entscheidsuche.ch/_searchV2.php"),
+    "page_size": 20,
+    "max_results": 20,
+    "timeout": 30,
+    "languages": ("fr", "de", "it"),  # Ordre de préférence pour les titres et résumés
+}
+
+SOURCE_FIELDS = ["title", "abstract", "reference", "date", "attachment.content_url"]
+
+
+def build_search_body(query: str, offset: int, size: int) -> Dict[str, Any]:
+    """
+    Construit la requête Elasticsearch pour une page de résultats.
+
+    Args:
+        query (str): Mots-clés recherchés.
+        offset (int): Index du premier résultat.
+        size (int): Nombre de résultats par page.
+
+    Returns:
+        Dict[str, Any]: Corps JSON de la requête _search.
+    """
+    return {
+        "query": {"simple_query_string": {"query": query, "default_operator": "and"}},
+        "sort": [{"_score": "desc"}, {"date": "desc"}],
+        "_source": SOURCE_FIELDS,
+        "from": offset,
+        "size": size,
+    }
+
+
+def _localized(value: Any, languages=None) -> str:
+    if isinstance(value, dict):
+        for language in languages or ENTSCHEIDSUCHE_API_SETTINGS["languages"]:
+            if value.get(language):
+                return str(value[language]).strip()
+        return next((str(text).strip() for text in value.values() if text), "")
+    if isinstance(value, list):
+        return ", ".join(str(item) for item in value)
+    return str(value).strip() if value else ""
+
+
+def hit_to_result(hit: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Convertit un résultat Elasticsearch en entrée {title, link, summary}.
+    """
+    source = hit.get("_source", {})
+    reference = _localized(source.get("reference"))
+    title = _localized(source.get("title"))
+    if reference and reference not in title:
+        title = f"{reference} - {title}" if title else reference
+    return {
+        "title": title or "No Title",
+        "link": (source.get("attachment") or {}).get("content_url") or "No Link",
+        "summary": _localized(source.get("abstract")) or "No Summary",
+    }
+
+
+class EntscheidsucheApiClient:
+    """
+    Client de l'API de recherche, sur un client httpx partagé (pool de connexions).
+    """
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None, search_url: Optional[str] = None):
+        self._client = client or httpx.AsyncClient(
+            timeout=ENTSCHEIDSUCHE_API_SETTINGS["timeout"],
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            headers={"User-Agent": "Lextutor/1.0"},
+        )
+        self._search_url = search_url or ENTSCHEIDSUCHE_API_SETTINGS["search_url"]
+
+    async def search(self, query: str, max_results: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Recherche des décisions, page par page, jusqu'à max_results résultats uniques.
+
+        Args:
+            query (str): Mots-clés recherchés.
+            max_results (Optional[int]): Nombre maximal de résultats.
+
+        Returns:
+            List[Dict[str, str]]: Résultats au format {title, link, summary}.
+
+        Raises:
+            httpx.HTTPError: En cas d'erreur réseau ou de réponse HTTP en erreur.
+        """
+        query = normalize_text(query)
+        max_results = max_results or ENTSCHEIDSUCHE_API_SETTINGS["max_results"]
+        page_size = min(ENTSCHEIDSUCHE_API_SETTINGS["page_size"], max_results)
+        results: List[Dict[str, str]] = []
+        seen_titles = set()
+        offset = 0
+
+        while len(results) < max_results:
+            await rate_limiter.acquire(self._search_url)
+            response = await self._client.post(self._search_url, json=build_search_body(query, offset, page_size))
+            response.raise_for_status()
+            hits = response.json().get("hits", {})
+            page = hits.get("hits", [])
+            for hit in page:
+                result = hit_to_result(hit)
+                if result["title"] not in seen_titles:
+                    seen_titles.add(result["title"])
+                    results.append(result)
+                    if len(results) >= max_results:
+                        break
+            offset += len(page)
+            total = hits.get("total", {})
+            total = total.get("value", 0) if isinstance(total, dict) else total
+            if len(page) < page_size or offset >= total:
+                break
+
+        logger.info(f"Nombre de résultats uniques via l'API pour '{query}' : {len(results)}")
+        return results
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+"""
+Instantané hors ligne du corpus Fedlex.
+
+Un instantané est un répertoire versionné contenant :
+    - articles.dat : le contenu JSON (UTF-8) de chaque article, mis bout à bout ;
+    - index.dat    : un index trié (code de loi, numéro d'article) -> (offset, longueur)
+                     à enregistrements de taille fixe, lu par recherche dichotomique via mmap ;
+    - meta.json    : informations de construction.
+
+Le fichier CURRENT à la racine désigne la version active ; il est remplacé
+atomiquement (os.replace) à la fin d'un nouveau crawl. Un crawl dont certains
+actes échouent reprend, pour ces actes, les articles de la version active ; il
+n'est pas publié si l'un d'eux en est absent.
+
+Usage:
+    python fedlex_corpus.py build --output corpus [--laws CO CC]
+    python fedlex_corpus.py get --output corpus CO 266g
+"""
+import argparse
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from article_numbers import canonical_article_number
+
+logger = logging.getLogger(__name__)
+
+INDEX_MAGIC = b"LXIDX001"
+INDEX_HEADER = struct.Struct("<8sI")
+INDEX_RECORD = struct.Struct("<16s16sQI")
+KEY_SIZE = 16
+ARTICLES_FILE = "articles.dat"
+INDEX_FILE = "index.dat"
+META_FILE = "meta.json"
+CURRENT_FILE = "CURRENT"
+VERSIONS_DIR = "versions"
+
+
+def _encode_key(value: str) -> bytes:
+    encoded = value.encode("utf-8")
+    if len(encoded) > KEY_SIZE:
+        raise ValueError(f"Clé trop longue pour l'index: {value}")
+    return encoded.ljust(KEY_SIZE, b"\0")
+
+
+def write_snapshot(directory: str, articles: Iterable[Tuple[str, str, Dict[str, Any]]], meta: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Écrit un instantané (contenu + index trié) dans un répertoire.
+
+    Args:
+        directory (str): Répertoire de l'instantané, créé si nécessaire.
+        articles (Iterable[Tuple[str, str, Dict[str, Any]]]): Triplets (code de loi, numéro d'article, article).
+        meta (Optional[Dict[str, Any]]): Informations additionnelles écrites dans meta.json.
+
+    Returns:
+        int: Nombre d'articles écrits.
+    """
+    os.makedirs(directory, exist_ok=True)
+    entries: Dict[Tuple[bytes, bytes], Tuple[int, int]] = {}
+    offset = 0
+    with open(os.path.join(directory, ARTICLES_FILE), "wb") as blob:
+        for law_code, article_number, article in articles:
+            key = (_encode_key(law_code), _encode_key(canonical_article_number(article_number)))
+            payload = json.dumps(
+                {"title": article.get("title", ""), "content": article.get("content", "")},
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ).encode("utf-8")
+            blob.write(payload)
+            entries[key] = (offset, len(payload))
+            offset += len(payload)
+
+    with open(os.path.join(directory, INDEX_FILE), "wb") as index:
+        index.write(INDEX_HEADER.pack(INDEX_MAGIC, len(entries)))
+        for (law_key, article_key), (article_offset, length) in sorted(entries.items()):
+            index.write(INDEX_RECORD.pack(law_key, article_key, article_offset, length))
+
+    with open(os.path.join(directory, META_FILE), "w", encoding="utf-8") as f:
+        json.dump({**(meta or {}), "articles": len(entries)}, f, ensure_ascii=False, indent=2)
+
+    return len(entries)
+
+
+def publish_version(root: str, version: str) -> None:
+    """
+    Active atomiquement une version de l'instantané en réécrivant le fichier CURRENT.
+
+    Args:
+        root (str): Racine du corpus.
+        version (str): Nom du répertoire de version à activer.
+    """
+    if not os.path.isfile(os.path.join(root, VERSIONS_DIR, version, INDEX_FILE)):
+        raise FileNotFoundError(f"Version de corpus introuvable: {version}")
+    tmp_path = os.path.join(root, f"{CURRENT_FILE}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(version)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, os.path.join(root, CURRENT_FILE))
+
+
+class CorpusSnapshot:
+    """
+    Lecture d'un instantané via mmap ; chaque recherche est une dichotomie sur l'index.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_FILE), "rb") as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = INDEX_HEADER.unpack_from(self._index, 0)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"Index de corpus invalide: {directory}")
+        articles_path = os.path.join(directory, ARTICLES_FILE)
+        if os.path.getsize(articles_path):
+            with open(articles_path, "rb") as f:
+                self._articles = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._articles = b""
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        """
+        Libère les mmaps ; l'instantané ne doit plus être lu ensuite.
+        """
+        self._index.close()
+        if isinstance(self._articles, mmap.mmap):
+            self._articles.close()
+
+    def _record(self, position: int) -> Tuple[bytes, bytes, int, int]:
+        return INDEX_RECORD.unpack_from(self._index, INDEX_HEADER.size + position * INDEX_RECORD.size)
+
+    def _lower_bound(self, target: Tuple[bytes, bytes]) -> int:
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            law_key, article_key, _, _ = self._record(middle)
+            if (law_key, article_key) < target:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def article_numbers(self, law_code: str) -> List[str]:
+        """
+        Liste les numéros d'articles d'une loi (ordre de l'index, non numérique).
+        """
+        try:
+            law_key = _encode_key(law_code)
+        except ValueError:
+            return []
+        numbers = []
+        for position in range(self._lower_bound((law_key, b"")), self._count):
+            record_law_key, article_key, _, _ = self._record(position)
+            if record_law_key != law_key:
+                break
+            numbers.append(article_key.rstrip(b"\0").decode("utf-8"))
+        return numbers
+
+    def get(self, law_code: str, article_number: str) -> Optional[Dict[str, Any]]:
+        """
+        Recherche un article dans l'instantané.
+
+        Args:
+            law_code (str): Code de loi normalisé (ex. "CO").
+            article_number (str): Numéro de l'article (ex. "266g").
+
+        Returns:
+            Optional[Dict[str, Any]]: L'article au format de fedlex_extractor, ou None.
+        """
+        try:
+            target = (_encode_key(law_code), _encode_key(canonical_article_number(article_number)))
+        except ValueError:
+            return None
+        low = self._lower_bound(target)
+        if low == self._count:
+            return None
+        law_key, article_key, offset, length = self._record(low)
+        if (law_key, article_key) != target:
+            return None
+        data = json.loads(bytes(self._articles[offset:offset + length]).decode("utf-8"))
+        return {
+            "success": True,
+            "law_code": law_code,
+            "article_number": article_number,
+            "title": data["title"],
+            "content": data["content"],
+        }
+
+    def articles(self, law_code: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Parcourt les articles d'une loi : (numéro d'article, article).
+        """
+        for article_number in self.article_numbers(law_code):
+            yield article_number, self.get(law_code, article_number)
+
+    def law_codes(self) -> List[str]:
+        codes = []
+        for position in range(self._count):
+            law_code = self._record(position)[0].rstrip(b"\0").decode("utf-8")
+            if not codes or codes[-1] != law_code:
+                codes.append(law_code)
+        return codes
+
+
+class FedlexCorpus:
+    """
+    Accès au corpus versionné ; charge sans interruption les nouvelles versions publiées.
+
+    Les lectures (get, article_numbers) ne font aucune entrée-sortie sur CURRENT :
+    seul refresh, appelé périodiquement hors de la boucle d'événements (voir
+    watch_fedlex_corpus dans main.py), charge une nouvelle version.
+    """
+
+    def __init__(self, root: str, refresh_interval: float = 30.0):
+        """
+        Args:
+            root (str): Racine du corpus.
+            refresh_interval (float): Intervalle de vérification de CURRENT, en secondes, utilisé par l'appelant.
+        """
+        self.root = root
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._snapshot: Optional[CorpusSnapshot] = None
+        # Instantané remplacé au dernier rechargement : des lectures peuvent encore le tenir
+        self._retired: Optional[CorpusSnapshot] = None
+        self._version: Optional[str] = None
+        self.refresh()
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._version
+
+    def refresh(self) -> bool:
+        """
+        Charge la version désignée par CURRENT si elle a changé.
+
+        Returns:
+            bool: True si une nouvelle version a été chargée.
+        """
+        current_path = os.path.join(self.root, CURRENT_FILE)
+        try:
+            with open(current_path, "r", encoding="utf-8") as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return False
+        if not version or version == self._version:
+            return False
+        try:
+            snapshot = CorpusSnapshot(os.path.join(self.root, VERSIONS_DIR, version))
+        except (OSError, ValueError) as e:
+            logger.error(f"Impossible de charger la version de corpus {version}: {e}")
+            return False
+        # L'instantané remplacé reste ouvert pour les lectures en cours ; celui remplacé
+        # au rechargement précédent, que plus aucune lecture ne tient, est fermé
+        with self._lock:
+            if self._version is not None and version == self._version:
+                snapshot.close()
+                return False
+            stale, self._retired = self._retired, self._snapshot
+            self._snapshot, self._version = snapshot, version
+        if stale is not None:
+            stale.close()
+        logger.info(f"Corpus Fedlex version {version} chargé ({len(snapshot)} articles)")
+        return True
+
+    def get(self, law_code: str, article_number: str) -> Optional[Dict[str, Any]]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        return snapshot.get(law_code, article_number)
+
+    def article_numbers(self, law_code: str) -> List[str]:
+        snapshot = self._snapshot
+        return snapshot.article_numbers(law_code) if snapshot is not None else []
+
+    def articles(self, law_code: str) -> List[Tuple[str, Dict[str, Any]]]:
+        snapshot = self._snapshot
+        return list(snapshot.articles(law_code)) if snapshot is not None else []
+
+    def close(self) -> None:
+        """
+        Ferme l'instantané actif et celui remplacé en dernier.
+        """
+        with self._lock:
+            snapshots = [self._snapshot, self._retired]
+            self._snapshot = self._retired = self._version = None
+        for snapshot in snapshots:
+            if snapshot is not None:
+                snapshot.close()
+
+
+def build_corpus(root: str, law_codes: Optional[List[str]] = None, version: Optional[str] = None) -> str:
+    """
+    Crawle chaque acte Fedlex une seule fois et publie un nouvel instantané.
+
+    Les articles d'un acte dont le crawl échoue sont repris de la version active.
+
+    Args:
+        root (str): Racine du corpus.
+        law_codes (Optional[List[str]]): Lois à inclure (par défaut, toutes celles de FEDLEX_LINKS).
+        version (Optional[str]): Nom de la version (par défaut, horodatage UTC).
+
+    Returns:
+        str: Nom de la version publiée.
+
+    Raises:
+        RuntimeError: Si un acte en échec est absent de la version active (la nouvelle version n'est pas publiée).
+    """
+    from fedlex_extractor import FEDLEX_LINKS, extract_fedlex_act
+
+    version = version or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    law_codes = law_codes or list(FEDLEX_LINKS)
+    previous = FedlexCorpus(root)
+    previous_version = previous.version
+    failed, carried_over, missing = [], [], []
+
+    def crawl():
+        for law_code in law_codes:
+            try:
+                articles = extract_fedlex_act(law_code)
+            except Exception as e:
+                logger.error(f"Échec du crawl de {law_code}: {e}")
+                failed.append(law_code)
+                kept = previous.articles(law_code)
+                if not kept:
+                    missing.append(law_code)
+                    continue
+                logger.warning(f"{law_code}: {len(kept)} articles repris de la version {previous.version}")
+                carried_over.append(law_code)
+                for article_number, article in kept:
+                    yield law_code, article_number, article
+                continue
+            logger.info(f"{law_code}: {len(articles)} articles")
+            for article_number, article in articles.items():
+                yield article["law_code"], article_number, article
+
+    directory = os.path.join(root, VERSIONS_DIR, version)
+    try:
+        count = write_snapshot(directory, crawl(), meta={
+            "version": version,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "laws": law_codes,
+        })
+    finally:
+        previous.close()
+    with open(os.path.join(directory, META_FILE), "r+", encoding="utf-8") as f:
+        meta = json.load(f)
+        meta["failed"] = failed
+        meta["carried_over"] = {"version": previous_version, "laws": carried_over} if carried_over else None
+        f.seek(0)
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+        f.truncate()
+    if missing:
+        raise RuntimeError(f"Corpus {version} non publié : aucune version antérieure pour {', '.join(missing)}")
+    publish_version(root, version)
+    logger.info(f"Corpus {version} publié : {count} articles, {len(failed)} lois en échec dont {len(carried_over)} reprises")
+    return version
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Instantané hors ligne du corpus Fedlex")
+    parser.add_argument("--output", default=os.getenv("FEDLEX_CORPUS_DIR", "corpus"), help="Racine du corpus")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Crawler les actes et publier une nouvelle version")
+    build_parser.add_argument("--laws", nargs="*", help="Codes de loi à inclure")
+    get_parser = subparsers.add_parser("get", help="Lire un article de la version active")
+    get_parser.add_argument("law_code")
+    get_parser.add_argument("article_number")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        print(build_corpus(args.output, args.laws))
+    else:
+        article = FedlexCorpus(args.output).get(args.law_code, args.article_number)
+        if article is None:
+            print(json.dumps({"success": False, "error": "Article absent du corpus"}, ensure_ascii=False, indent=2))
+            sys.exit(1)
+        print(json.dumps(article, ensure_ascii=False, indent=2))
@@ -5,18 +5,20 @@ import logging
 import sys
 import re
 import time
-from functools import lru_cache
-import chromedriver_autoinstaller
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from bs4 import BeautifulSoup
+import random
+import threading
 from dotenv import load_dotenv
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
+from webdriver_pool import WebDriverPool
+from cache import BoundedTTLCache, cached, get_cache
+from article_numbers import canonical_article_number
+from law_registry import law_registry
+from metrics import fedlex_extraction_seconds
+
+# Selenium, chromedriver_autoinstaller et BeautifulSoup sont importés à la première
+# extraction : le démarrage d'un worker qui n'utilise pas le navigateur ne les charge pas
+if TYPE_CHECKING:
+    from selenium import webdriver
 
 # Configuration du logger
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -25,113 +27,51 @@ logger = logging.getLogger(__name__)
 # Charger les variables d'environnement depuis le fichier .env
 load_dotenv()
 
-# Configuration des liens Fedlex
-FEDLEX_LINKS = {
-    "CC": {"lien": "https://www.fedlex.admin.ch/eli/cc/24/233_245_233/fr", "titre": "Code civil"},
-    "CO": {"lien": "https://www.fedlex.admin.ch/eli/cc/27/317_321_377/fr", "titre": "Code des obligations"},
-    "CP": {"lien": "https://www.fedlex.admin.ch/eli/cc/54/757_781_799/fr", "titre": "Code pénal"},
-    "CPM": {"lien": "https://www.fedlex.admin.ch/eli/cc/43/359_375_369/fr", "titre": "Code pénal militaire"},
-    "CPC": {"lien": "https://www.fedlex.admin.ch/eli/cc/2010/262/fr", "titre": "Code de procédure civile"},
-    "CPP": {"lien": "https://www.fedlex.admin.ch/eli/cc/2010/267/fr", "titre": "Code de procédure pénale"},
-    "Cst": {"lien": "https://www.fedlex.admin.ch/eli/cc/1999/404/fr", "titre": "Constitution fédérale"},
-    "LAA": {"lien": "https://www.fedlex.admin.ch/eli/cc/1982/1676_1676_1676/fr", "titre": "Loi fédérale sur l'assurance-accidents"},
-    "LACI": {"lien": "https://www.fedlex.admin.ch/eli/cc/1982/2184_2184_2184/fr", "titre": "Loi sur l'assurance-chômage"},
-    "LAgr": {"lien": "https://www.fedlex.admin.ch/eli/cc/1998/3033_3033_3033/fr", "titre": "Loi sur l'agriculture"},
-    "LAI": {"lien": "https://www.fedlex.admin.ch/eli/cc/1959/827_857_845/fr", "titre": "Loi fédérale sur l'assurance-invalidité"},
-    "LAMal": {"lien": "https://www.fedlex.admin.ch/eli/cc/1995/1328_1328_1328/fr", "titre": "Loi fédérale sur l'assurance-maladie"},
-    "LAS": {"lien": "https://www.fedlex.admin.ch/eli/cc/1978/1456_1456_1456/fr", "titre": "Loi fédérale en matière d'assistance"},
-    "LAT": {"lien": "https://www.fedlex.admin.ch/eli/cc/1979/1573_1573_1573/fr", "titre": "Loi sur l'aménagement du territoire"},
-    "LAVS": {"lien": "https://www.fedlex.admin.ch/eli/cc/1952/1021_1046_1050/fr", "titre": "Loi fédérale sur l'assurance-vieillesse et survivants"},
-    "LB": {"lien": "https://www.fedlex.admin.ch/eli/cc/51/117_121_129/fr", "titre": "Loi sur les banques"},
-    "LBA": {"lien": "https://www.fedlex.admin.ch/eli/cc/1998/892_892_892/fr", "titre": "Loi sur le blanchiment d'argent"},
-    "LBFA": {"lien": "https://www.fedlex.admin.ch/eli/cc/1979/570_570_570/fr", "titre": "Loi fédérale sur le bail à ferme agricole"},
-    "LBI": {"lien": "https://www.fedlex.admin.ch/eli/cc/1955/871_893_899/fr", "titre": "Loi sur les brevets"},
-    "LBVM": {"lien": "https://www.fedlex.admin.ch/eli/cc/1997/68_68_68/fr", "titre": "Loi sur les bourses"},
-    "LCA": {"lien": "https://www.fedlex.admin.ch/eli/cc/24/719_735_717/fr", "titre": "Loi fédérale sur le contrat d'assurance"},
-    "LCaim": {"lien": "https://www.fedlex.admin.ch/eli/cc/2020/982/fr", "titre": "Loi sur les cautionnements solidaires liés au COVID-19"},
-    "LCAP": {"lien": "https://www.fedlex.admin.ch/eli/cc/1994/2806_2806_2806/fr", "titre": "Loi encourageant la construction et l'accession à la propriété de logements"},
-    "LCART": {"lien": "https://www.fedlex.admin.ch/eli/cc/1996/546_546_546/fr", "titre": "Loi sur les cartels"},
-    "LCdF": {"lien": "https://www.fedlex.admin.ch/eli/cc/1958/335_341_347/fr", "titre": "Loi sur les chemins de fer"},
-    "LChim": {"lien": "https://www.fedlex.admin.ch/eli/cc/2004/724/fr", "titre": "Loi sur les produits chimiques"},
-    "LChP": {"lien": "https://www.fedlex.admin.ch/eli/cc/1988/506_506_506/fr", "titre": "Loi sur la chasse"},
-    "LCITES": {"lien": "https://www.fedlex.admin.ch/eli/cc/2013/600/fr", "titre": "Loi fédérale sur la circulation des espèces de faune et de flore protégées"},
-    "LCR": {"lien": "https://www.fedlex.admin.ch/eli/cc/1959/679_705_685/fr", "titre": "Loi sur la circulation routière"},
-    "LDA": {"lien": "https://www.fedlex.admin.ch/eli/cc/1993/1798_1798_1798/fr", "titre": "Loi sur le droit d'auteur"},
-    "LDIP": {"lien": "https://www.fedlex.admin.ch/eli/cc/1988/1776_1776_1776/fr", "titre": "Loi fédérale sur le droit international privé"},
-    "LEaux": {"lien": "https://www.fedlex.admin.ch/eli/cc/2018/801/fr", "titre": "Loi fédérale sur la protection des eaux"},
-    "LEFin": {"lien": "https://www.fedlex.admin.ch/eli/cc/2018/801/fr", "titre": "Loi sur les établissements financiers"},
-    "LEg": {"lien": "https://www.fedlex.admin.ch/eli/cc/1996/1498_1498_1498/fr", "titre": "Loi sur l'égalité"},
-    "LEHE": {"lien": "https://www.fedlex.admin.ch/eli/cc/2014/691/fr", "titre": "Loi sur l'encouragement et la coordination des hautes écoles"},
-    "LEI": {"lien": "https://www.fedlex.admin.ch/eli/cc/2007/758/fr", "titre": "Loi fédérale sur les étrangers et l'intégration"},
-    "LEmb": {"lien": "https://www.fedlex.admin.ch/eli/cc/2002/564/fr", "titre": "Loi sur les embargos"},
-    "LEne": {"lien": "https://www.fedlex.admin.ch/eli/fga/2023/1603/fr", "titre": "Loi sur l'énergie"},
-    "LEnu": {"lien": "https://www.fedlex.admin.ch/eli/cc/2004/723/fr", "titre": "Loi sur les énergies renouvelables"},
-    "LFo": {"lien": "https://www.fedlex.admin.ch/eli/cc/1992/2521_2521_2521/fr", "titre": "Loi sur les forêts"},
-    "LFH": {"lien": "https://www.fedlex.admin.ch/eli/cc/33/189_191_191/fr", "titre": "Loi sur les forces hydrauliques"},
-    "LFAIE": {"lien": "https://www.fedlex.admin.ch/eli/cc/1984/1148_1148_1148/fr", "titre": "Loi fédérale sur l'acquisition d'immeubles par des personnes à l'étranger"},
-    "LFINMA": {"lien": "https://www.fedlex.admin.ch/eli/cc/2008/736/fr", "titre": "Loi sur l'Autorité fédérale de surveillance des marchés financiers"},
-    "LFLP": {"lien": "https://www.fedlex.admin.ch/eli/fga/2024/913/fr", "titre": "Loi sur le libre passage"},
-    "LFPr": {"lien": "https://www.fedlex.admin.ch/eli/cc/2002/728/fr", "titre": "Loi sur la formation professionnelle"},
-    "LFSP": {"lien": "https://www.fedlex.admin.ch/eli/cc/1991/2259_2259_2259/fr", "titre": "Loi fédérale sur la pêche"},
-    "LFus": {"lien": "https://www.fedlex.admin.ch/eli/cc/2004/320/fr", "titre": "Loi sur la fusion"},
-    "LGA": {"lien": "https://www.fedlex.admin.ch/eli/cc/1995/2513/fr", "titre": "Loi sur le génie génétique"},
-    "LGéo": {"lien": "https://www.fedlex.admin.ch/eli/cc/2008/388/fr", "titre": "Loi sur la géoinformation"},
-    "LGG": {"lien": "https://www.fedlex.admin.ch/eli/cc/2003/705/fr", "titre": "Loi sur le génie génétique"},
-    "LHand": {"lien": "https://www.fedlex.admin.ch/eli/cc/2003/667/fr", "titre": "Loi sur l'égalité pour les handicapés"},
-    "LIFD": {"lien": "https://www.fedlex.admin.ch/eli/cc/1991/1184_1184_1184/fr", "titre": "Loi fédérale sur l'impôt fédéral direct"},
-    "LHID": {"lien": "https://www.fedlex.admin.ch/eli/cc/1991/1256_1256_1256/fr", "titre": "Loi fédérale sur l'harmonisation des impôts directs des cantons et des communes"},
-    "LMCFA": {"lien": "https://www.fedlex.admin.ch/eli/cc/2006/440/fr", "titre": "Loi sur le Contrôle fédéral des finances"},
-    "LMP": {"lien": "https://www.fedlex.admin.ch/eli/cc/2020/126/fr", "titre": "Loi fédérale sur les marchés publics"},
-    "LMSI": {"lien": "https://www.fedlex.admin.ch/eli/cc/1998/1546_1546_1546/fr", "titre": "Loi fédérale instituant des mesures visant au maintien de la sûreté intérieure"},
-    "LN": {"lien": "https://www.fedlex.admin.ch/eli/cc/2016/404/fr", "titre": "Loi sur la nationalité suisse"},
-    "LPA": {"lien": "https://www.fedlex.admin.ch/eli/cc/1969/737_757_755/fr", "titre": "Loi fédérale sur la procédure administrative"},
-    "LPAC": {"lien": "https://www.fedlex.admin.ch/eli/cc/2015/435/fr", "titre": "Loi sur la poste"},
-    "LPC": {"lien": "https://www.fedlex.admin.ch/eli/cc/2007/804/fr", "titre": "Loi sur les prestations complémentaires à l'AVS et à l’AI"},
-    "LPCC": {"lien": "https://www.fedlex.admin.ch/eli/cc/2006/822/fr", "titre": "Loi fédérale sur les fonds de placement"},
-    "LPCy": {"lien": "https://www.fedlex.admin.ch/eli/cc/2022/614/fr", "titre": "Loi fédérale sur la cybersécurité"},
-    "LPE": {"lien": "https://www.fedlex.admin.ch/eli/cc/1984/1122_1122_1122/fr", "titre": "Loi sur la protection de l'environnement"},
-    "LPers": {"lien": "https://www.fedlex.admin.ch/eli/cc/2001/123/fr", "titre": "Loi sur le personnel de la Confédération"},
-    "LPGA": {"lien": "https://www.fedlex.admin.ch/eli/cc/2002/510/fr", "titre": "Loi fédérale sur la partie générale du droit des assurances sociales"},
-    "LPD": {"lien": "https://www.fedlex.admin.ch/eli/cc/2022/491/fr", "titre": "Loi fédérale sur la protection des données"},
-    "LPM": {"lien": "https://www.fedlex.admin.ch/eli/cc/1993/274_274_274/fr", "titre": "Loi sur la protection des marques"},
-    "LPMA": {"lien": "https://www.fedlex.admin.ch/eli/cc/2001/118/fr", "titre": "Loi fédérale sur la procréation médicalement assistée"},
-    "LPN": {"lien": "https://www.fedlex.admin.ch/eli/cc/1966/1637_1694_1679/fr", "titre": "Loi fédérale sur la protection de la nature et du paysage"},
-    "LPP": {"lien": "https://www.fedlex.admin.ch/eli/cc/1983/797_797_797/fr", "titre": "Loi fédérale sur la prévoyance professionnelle vieillesse, survivants et invalidité"},
-    "LRTV": {"lien": "https://www.fedlex.admin.ch/eli/cc/2007/150/fr", "titre": "Loi sur la radio et la télévision"},
-    "LRENS": {"lien": "https://www.fedlex.admin.ch/eli/cc/2017/494/fr", "titre": "Loi sur le renseignement"},
-    "LRHa": {"lien": "https://www.fedlex.admin.ch/eli/cc/2016/365/fr", "titre": "Loi fédérale sur l'harmonisation des registres des habitants et d'autres registres officiels de personnes"},
-    "LRH": {"lien": "https://www.fedlex.admin.ch/eli/cc/2013/617/fr", "titre": "Loi relative à la recherche sur l'être humain"},
-    "LRV": {"lien": "https://www.fedlex.admin.ch/eli/cc/2005/707/fr", "titre": "Loi sur les recueils du droit fédéral et la Feuille fédérale"},
-    "LSA": {"lien": "https://www.fedlex.admin.ch/eli/cc/2005/735/fr", "titre": "Loi sur la surveillance des assurances"},
-    "LSFin": {"lien": "https://www.fedlex.admin.ch/eli/cc/2018/801/fr", "titre": "Loi sur les établissements financiers"},
-    "LStup": {"lien": "https://www.fedlex.admin.ch/eli/cc/1952/241_241_245/fr", "titre": "Loi fédérale sur les stupéfiants et les substances psychotropes"},
-    "LTAF": {"lien": "https://www.fedlex.admin.ch/eli/cc/2006/352/fr", "titre": "Loi sur le Tribunal administratif fédéral"},
-    "LTC": {"lien": "https://www.fedlex.admin.ch/eli/cc/1997/2187_2187_2187/fr", "titre": "Loi sur les télécommunications"},
-    "LTV": {"lien": "https://www.fedlex.admin.ch/eli/cc/2009/680/fr", "titre": "Loi sur le transport de voyageurs"},
-    "LTVA": {"lien": "https://www.fedlex.admin.ch/eli/cc/2009/615/fr", "titre": "Loi sur la TVA"},
-    "LTr": {"lien": "https://www.fedlex.admin.ch/eli/cc/1966/57_57_57/fr", "titre": "Loi sur le travail"},
-    "LUMV": {"lien": "https://www.fedlex.admin.ch/eli/cc/1993/478_478_478/fr", "titre": "Loi sur l'unité monétaire et les moyens de paiement"},
-    "LVC": {"lien": "https://www.fedlex.admin.ch/eli/cc/2022/790/fr", "titre": "Loi fédérale les voies cyclables"}
-}
+# Configuration des liens Fedlex : registre unique des lois (fedlex_references.json)
+FEDLEX_LINKS = law_registry.links
 
 # Définir les paramètres d'extraction de Fedlex
 FEDLEX_EXTRACTION_SETTINGS = {
     "timeout": 30,
     "max_retries": 3,
-    "retry_delay": 5,
-    "rate_limit_delay": 1  # Délai entre les requêtes en secondes
+    "retry_delay": 1,  # Délai de base du backoff exponentiel entre les tentatives, en secondes
+    "retry_max_delay": 10,
+    "stability_quiet_ms": 250,  # Durée sans mutation du DOM au-delà de laquelle le contenu est considéré stable
+    "stability_max_ms": 2000,  # Borne supérieure de l'attente de stabilisation
+    "rate_limit_delay": 1,  # Délai entre les requêtes en secondes
+    "driver_pool_size": int(os.getenv("FEDLEX_DRIVER_POOL_SIZE", "2")),
+    "driver_max_uses": int(os.getenv("FEDLEX_DRIVER_MAX_USES", "50")),
+    "driver_acquire_timeout": 120,  # Attente maximale d'une session libre en secondes
+    "act_store_max_acts": int(os.getenv("FEDLEX_ACT_STORE_MAX_ACTS", "20")),  # Lois gardées en mémoire (LRU)
+    "mode": os.getenv("FEDLEX_EXTRACTION_MODE", "act")  # "act" : page complète de la loi, "article" : une page par article
 }
 
 last_request_time = 0
+_rate_limit_lock = threading.Lock()
+
+_chromedriver_installed = False
+_chromedriver_lock = threading.Lock()
+_driver_pool: Optional[WebDriverPool] = None
+_driver_pool_lock = threading.Lock()
 
-def setup_driver() -> webdriver.Chrome:
+def setup_driver() -> "webdriver.Chrome":
     """
     Configure et retourne une instance de Chrome WebDriver.
 
     Returns:
         webdriver.Chrome: Instance de Chrome WebDriver.
     """
-    chromedriver_autoinstaller.install()
+    import chromedriver_autoinstaller
+    from selenium import webdriver
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.chrome.options import Options
+
+    # Le préchauffage crée plusieurs sessions en parallèle : une seule installation de chromedriver
+    global _chromedriver_installed
+    with _chromedriver_lock:
+        if not _chromedriver_installed:
+            chromedriver_autoinstaller.install()
+            _chromedriver_installed = True
 
     chrome_options = Options()
     chrome_options.add_argument("--headless")
@@ -146,6 +86,34 @@ def setup_driver() -> webdriver.Chrome:
         logger.error(f"Erreur lors de la création du webdriver: {e}")
         raise
 
+def get_driver_pool() -> WebDriverPool:
+    """
+    Retourne le pool partagé de sessions Chrome, créé au premier appel.
+
+    Returns:
+        WebDriverPool: Pool de sessions WebDriver dimensionné par FEDLEX_EXTRACTION_SETTINGS.
+    """
+    global _driver_pool
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            _driver_pool = WebDriverPool(
+                setup_driver,
+                size=FEDLEX_EXTRACTION_SETTINGS['driver_pool_size'],
+                max_uses=FEDLEX_EXTRACTION_SETTINGS['driver_max_uses'],
+                acquire_timeout=FEDLEX_EXTRACTION_SETTINGS['driver_acquire_timeout'],
+            )
+        return _driver_pool
+
+def close_driver_pool() -> None:
+    """
+    Ferme le pool partagé et toutes ses sessions Chrome.
+    """
+    global _driver_pool
+    with _driver_pool_lock:
+        pool, _driver_pool = _driver_pool, None
+    if pool is not None:
+        pool.close()
+
 def extract_content(element, level=0) -> str:
     """
     Extrait et formate le contenu HTML d'un élément BeautifulSoup.
@@ -177,32 +145,409 @@ def normalize_law_code(law_code: str) -> str:
         law_code (str): Code de la loi.
 
     Returns:
-        str: Code de la loi normalisé.
+        str: Code de la loi dans le registre, ou le code d'origine s'il n'est pas reconnu.
     """
-    law_code = law_code.strip().upper()
-    if law_code in ["CST", "CST."]:
-        return "Cst"
-    return law_code
+    return law_registry.resolve(law_code) or law_code.strip()
 
 def rate_limit():
     """
-    Implémente un rate limiting basique.
+    Implémente un rate limiting basique, sûr entre threads.
+
+    Utilisé par les appels synchrones (CLI, construction du corpus) ; l'application
+    FastAPI passe plutôt une attente sur le limiteur asynchrone de rate_limiter.py
+    (voir apply_throttle).
     """
     global last_request_time
-    current_time = time.time()
-    time_since_last_request = current_time - last_request_time
-    if time_since_last_request < FEDLEX_EXTRACTION_SETTINGS['rate_limit_delay']:
-        time.sleep(FEDLEX_EXTRACTION_SETTINGS['rate_limit_delay'] - time_since_last_request)
-    last_request_time = time.time()
+    with _rate_limit_lock:
+        # Chaque appelant réserve son créneau sous verrou puis attend hors verrou
+        scheduled = max(time.time(), last_request_time + FEDLEX_EXTRACTION_SETTINGS['rate_limit_delay'])
+        last_request_time = scheduled
+    delay = scheduled - time.time()
+    if delay > 0:
+        time.sleep(delay)
+
+# Régulation avant chaque chargement de page : True (rate_limit), False (aucune), ou fonction bloquante appelée à chaque chargement
+Throttle = Union[bool, Callable[[], Any]]
+
+def apply_throttle(throttle: Throttle) -> None:
+    """
+    Attend l'autorisation d'un chargement de page Fedlex.
+
+    L'application passe une fonction qui attend un jeton du limiteur asynchrone
+    (rate_limiter.py) depuis le thread d'extraction : chaque tentative et chaque
+    repli consomment ainsi leur propre jeton.
+    """
+    if callable(throttle):
+        throttle()
+    elif throttle:
+        rate_limit()
+
+# Résout dès que la cible n'a plus subi de mutation pendant quietMs, ou au plus tard après maxMs.
+# La cible est le plus proche ancêtre commun des éléments du sélecteur (le conteneur de l'acte
+# pour "article[id^='art_']"), ce qui ignore les mutations du reste de la page.
+WAIT_FOR_STABLE_DOM_SCRIPT = """
+const [selector, quietMs, maxMs, done] = arguments;
+const matches = document.querySelectorAll(selector);
+let target = matches[0] || document.body;
+for (const element of matches) {
+    while (!target.contains(element)) target = target.parentElement;
+}
+let quietTimer = null;
+let capTimer = null;
+const observer = new MutationObserver(() => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(() => finish(true), quietMs);
+});
+function finish(stable) {
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(capTimer);
+    done(stable);
+}
+observer.observe(target, {childList: true, subtree: true, characterData: true, attributes: true});
+quietTimer = setTimeout(() => finish(true), quietMs);
+capTimer = setTimeout(() => finish(false), maxMs);
+"""
+
+def wait_for_stable_content(driver, css_selector: str) -> bool:
+    """
+    Attend que le contenu ciblé cesse de changer, avec une borne supérieure stricte.
+
+    Remplace l'attente fixe de 2 secondes : un article déjà rendu est rendu
+    après quelques centaines de millisecondes sans mutation.
+
+    Args:
+        driver (webdriver.Chrome): Session WebDriver.
+        css_selector (str): Sélecteur CSS des éléments à surveiller (leur plus proche ancêtre commun est observé).
+
+    Returns:
+        bool: True si le contenu s'est stabilisé avant la borne supérieure.
+    """
+    from selenium.common.exceptions import TimeoutException
+
+    quiet_ms = FEDLEX_EXTRACTION_SETTINGS['stability_quiet_ms']
+    max_ms = FEDLEX_EXTRACTION_SETTINGS['stability_max_ms']
+    driver.set_script_timeout(max_ms / 1000 + 5)
+    try:
+        stable = driver.execute_async_script(WAIT_FOR_STABLE_DOM_SCRIPT, css_selector, quiet_ms, max_ms)
+    except TimeoutException:
+        stable = False
+    if not stable:
+        logger.warning(f"Contenu {css_selector} encore instable après {max_ms} ms")
+    return bool(stable)
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Calcule le délai avant une nouvelle tentative (backoff exponentiel avec gigue).
+
+    Args:
+        attempt (int): Numéro de la tentative échouée, à partir de 0.
+
+    Returns:
+        float: Délai en secondes.
+    """
+    delay = min(FEDLEX_EXTRACTION_SETTINGS['retry_max_delay'], FEDLEX_EXTRACTION_SETTINGS['retry_delay'] * 2 ** attempt)
+    return random.uniform(delay / 2, delay)
+
+def article_id_from_number(article_number: str) -> str:
+    """
+    Convertit un numéro d'article en identifiant d'ancre Fedlex (ex. "266g" -> "266_g").
+
+    Args:
+        article_number (str): Numéro de l'article.
+
+    Returns:
+        str: Identifiant utilisé dans l'attribut id="art_..." de Fedlex.
+    """
+    return re.sub(r'(\d+)([a-z])', r'\1_\2', article_number.strip().lower())
+
+def article_number_from_id(element_id: str) -> str:
+    """
+    Convertit un identifiant d'ancre Fedlex en numéro d'article (ex. "art_266_g" -> "266g").
+
+    Args:
+        element_id (str): Valeur de l'attribut id de l'élément <article>.
+
+    Returns:
+        str: Numéro de l'article normalisé.
+    """
+    return element_id[len("art_"):].replace('_', '').lower()
+
+def parse_article_element(law_abbreviation: str, article_element, article_number: str) -> Dict[str, Any]:
+    """
+    Construit le dictionnaire d'un article à partir de son élément <article>.
+
+    Args:
+        law_abbreviation (str): Abréviation normalisée de la loi.
+        article_element (bs4.element.Tag): Élément <article id="art_..."> de la page Fedlex.
+        article_number (str): Numéro de l'article.
+
+    Returns:
+        Dict[str, Any]: Dictionnaire contenant les informations de l'article.
+    """
+    title = article_element.find('h5', class_='article-title')
+    title_text = title.get_text().strip() if title else f"Article {article_number}"
+
+    formatted_content = f"<h2>{FEDLEX_LINKS[law_abbreviation]['titre']} - {title_text}</h2>\n"
+    formatted_content += extract_content(article_element)
+
+    return {
+        "success": True,
+        "law_code": law_abbreviation,
+        "article_number": article_number,
+        "title": title_text,
+        "content": formatted_content
+    }
+
+def format_article(article: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Article au format envoyé aux clients (WebSocket, /api/process, /api/fetch-article).
+
+    Un article en échec garde success=False et son erreur, sans titre ni contenu de remplacement.
+
+    Args:
+        article (Dict[str, Any]): Article extrait, ou échec portant law_code, article_number et error.
+
+    Returns:
+        Dict[str, Any]: {law_code, article_number, success, title, content} ou {law_code, article_number, success, error}.
+    """
+    formatted = {
+        "law_code": article.get("law_code"),
+        "article_number": article.get("article_number"),
+        "success": bool(article.get("success")),
+    }
+    if formatted["success"]:
+        formatted["title"] = article.get("title", "Sans titre")
+        formatted["content"] = article.get("content", "Contenu non disponible")
+    else:
+        formatted["error"] = article.get("error", "Erreur inconnue")
+    return formatted
+
+def parse_act_articles(law_abbreviation: str, page_source: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Découpe une page d'acte Fedlex en l'ensemble de ses articles.
+
+    Args:
+        law_abbreviation (str): Abréviation normalisée de la loi.
+        page_source (str): HTML complet de la page de l'acte.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Articles indexés par numéro d'article normalisé.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(page_source, 'html.parser')
+    articles = {}
+    for article_element in soup.find_all('article', id=re.compile(r'^art_')):
+        article_number = article_number_from_id(article_element['id'])
+        articles[article_number] = parse_article_element(law_abbreviation, article_element, article_number)
+    return articles
+
+class ActArticleStore:
+    """
+    Stockage thread-safe des articles extraits, indexés par (code de loi, numéro d'article).
+
+    Les articles sont regroupés par loi dans un BoundedTTLCache : au-delà de
+    ``max_entries`` lois, celle utilisée le moins récemment est oubliée (acte
+    complet comme articles isolés) et sera rechargée à la demande.
+
+    Un verrou par loi garantit qu'une seule page d'acte est chargée à la fois
+    pour une loi donnée, les appelants concurrents attendant son résultat. Les
+    verrous ne sont créés que pour les lois du registre et restent donc en
+    nombre borné.
+    """
 
-@lru_cache(maxsize=100)
-def extract_fedlex_article(law_abbreviation: str, article_number: str) -> Dict[str, Any]:
+    def __init__(self, acts: Optional[BoundedTTLCache] = None):
+        """
+        Args:
+            acts (Optional[BoundedTTLCache]): Cache des lois, {code: {"articles": {...}, "complete": bool}}.
+        """
+        self._lock = threading.Lock()
+        self._acts = acts if acts is not None else BoundedTTLCache("fedlex_acts", max_entries=FEDLEX_EXTRACTION_SETTINGS['act_store_max_acts'])
+        self._act_locks: Dict[str, threading.Lock] = {}
+
+    def _law(self, law_abbreviation: str, create: bool = False) -> Optional[Dict[str, Any]]:
+        law = self._acts.get(law_abbreviation)
+        if law is None and create:
+            law = {"articles": {}, "complete": False}
+            self._acts.set(law_abbreviation, law)
+        return law
+
+    def get(self, law_abbreviation: str, article_number: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            law = self._law(law_abbreviation)
+            return law["articles"].get(canonical_article_number(article_number)) if law else None
+
+    def put(self, law_abbreviation: str, article_number: str, article: Dict[str, Any]) -> None:
+        with self._lock:
+            self._law(law_abbreviation, create=True)["articles"][canonical_article_number(article_number)] = article
+
+    def put_act(self, law_abbreviation: str, articles: Dict[str, Dict[str, Any]]) -> None:
+        with self._lock:
+            law = self._law(law_abbreviation, create=True)
+            law["articles"].update(articles)
+            law["complete"] = True
+
+    def is_act_loaded(self, law_abbreviation: str) -> bool:
+        with self._lock:
+            law = self._law(law_abbreviation)
+            return bool(law and law["complete"])
+
+    def act_articles(self, law_abbreviation: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Tous les articles de l'acte s'il a été chargé en entier (et pas encore oublié), sinon None.
+        """
+        with self._lock:
+            law = self._law(law_abbreviation)
+            return dict(law["articles"]) if law and law["complete"] else None
+
+    def act_lock(self, law_abbreviation: str) -> threading.Lock:
+        with self._lock:
+            return self._act_locks.setdefault(law_abbreviation, threading.Lock())
+
+    def article_numbers(self, law_abbreviation: str) -> List[str]:
+        with self._lock:
+            law = self._law(law_abbreviation)
+            return list(law["articles"]) if law else []
+
+    def act_article_numbers(self, law_abbreviation: str) -> List[str]:
+        """
+        Numéros de tous les articles de l'acte, seulement s'il a été chargé en entier.
+
+        Des articles isolés (mode "article", repli Selenium) ne décrivent pas l'acte :
+        une plage ne doit pas être réduite aux seuls articles déjà extraits.
+        """
+        return list(self.act_articles(law_abbreviation) or ())
+
+act_store = ActArticleStore(get_cache("fedlex_acts", max_entries=FEDLEX_EXTRACTION_SETTINGS['act_store_max_acts']))
+
+def get_cached_article(law_abbreviation: str, article_number: str) -> Optional[Dict[str, Any]]:
+    """
+    Retourne un article déjà extrait sans aucun accès au navigateur.
+
+    Args:
+        law_abbreviation (str): Abréviation de la loi.
+        article_number (str): Numéro de l'article.
+
+    Returns:
+        Optional[Dict[str, Any]]: L'article s'il est en mémoire, sinon None.
+    """
+    return act_store.get(normalize_law_code(law_abbreviation), article_number)
+
+def extract_fedlex_act(law_abbreviation: str, throttle: Throttle = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Charge une seule fois la page complète d'un acte Fedlex et en extrait tous les articles.
+
+    Args:
+        law_abbreviation (str): Abréviation de la loi.
+        throttle (Throttle): Régulation appliquée avant chaque chargement (voir apply_throttle).
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Articles de l'acte indexés par numéro d'article normalisé.
+
+    Raises:
+        ValueError: Si la loi n'est pas reconnue.
+        TimeoutException: Si la page n'a pas pu être chargée après toutes les tentatives.
+    """
+    from selenium.common.exceptions import NoSuchElementException, TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    law_abbreviation = normalize_law_code(law_abbreviation)
+    if law_abbreviation not in FEDLEX_LINKS:
+        raise ValueError(f"Loi non reconnue: {law_abbreviation}")
+
+    with act_store.act_lock(law_abbreviation):
+        loaded = act_store.act_articles(law_abbreviation)
+        if loaded is not None:
+            return loaded
+
+        base_url = FEDLEX_LINKS[law_abbreviation]["lien"]
+        for attempt in range(FEDLEX_EXTRACTION_SETTINGS['max_retries']):
+            try:
+                apply_throttle(throttle)
+                logger.info(f"Tentative {attempt + 1} - Chargement de l'acte complet : {base_url}")
+                acquire_started_at = time.perf_counter()
+                with get_driver_pool().driver() as driver:
+                    fedlex_extraction_seconds.observe(time.perf_counter() - acquire_started_at, backend="selenium", stage="driver_acquire")
+                    with fedlex_extraction_seconds.time(backend="selenium", stage="page_load"):
+                        driver.get(base_url)
+                    with fedlex_extraction_seconds.time(backend="selenium", stage="wait"):
+                        WebDriverWait(driver, FEDLEX_EXTRACTION_SETTINGS['timeout']).until(
+                            EC.presence_of_element_located((By.CSS_SELECTOR, "article[id^='art_']"))
+                        )
+
+                        wait_for_stable_content(driver, "article[id^='art_']")
+
+                        page_source = driver.page_source
+
+                with fedlex_extraction_seconds.time(backend="selenium", stage="parse"):
+                    articles = parse_act_articles(law_abbreviation, page_source)
+                if not articles:
+                    raise NoSuchElementException(f"Aucun article trouvé pour {law_abbreviation}")
+                act_store.put_act(law_abbreviation, articles)
+                logger.info(f"Acte {law_abbreviation} chargé : {len(articles)} articles")
+                return articles
+            except (UnicodeDecodeError, TimeoutException, NoSuchElementException) as e:
+                logger.error(f"Erreur lors du chargement de l'acte {law_abbreviation} (tentative {attempt + 1}): {e}")
+                if attempt < FEDLEX_EXTRACTION_SETTINGS['max_retries'] - 1:
+                    delay = backoff_delay(attempt)
+                    logger.info(f"Nouvelle tentative dans {delay:.1f} secondes...")
+                    time.sleep(delay)
+                else:
+                    raise
+
+    return {}
+
+@cached(
+    get_cache("fedlex_article", max_entries=2000, ttl=7 * 24 * 3600),
+    should_cache=lambda result: bool(result.get("success")),
+    key=lambda law_abbreviation, article_number, throttle=True: (normalize_law_code(law_abbreviation), canonical_article_number(article_number)),
+)
+def extract_fedlex_article(law_abbreviation: str, article_number: str, throttle: Throttle = True) -> Dict[str, Any]:
     """
     Extrait le contenu d'un article de loi depuis Fedlex.
 
+    En mode "act", la page complète de la loi est chargée une seule fois et tous
+    ses articles sont conservés ; les lectures suivantes n'utilisent plus le
+    navigateur. L'extraction article par article reste utilisée en secours.
+
+    Args:
+        law_abbreviation (str): Abréviation de la loi.
+        article_number (str): Numéro de l'article.
+        throttle (Throttle): Régulation appliquée avant chaque chargement (voir apply_throttle).
+
+    Returns:
+        Dict[str, Any]: Dictionnaire contenant les informations de l'article.
+    """
+    law_abbreviation = normalize_law_code(law_abbreviation)
+
+    cached = act_store.get(law_abbreviation, article_number)
+    if cached:
+        return cached
+
+    if FEDLEX_EXTRACTION_SETTINGS['mode'] == "act" and law_abbreviation in FEDLEX_LINKS:
+        from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+        try:
+            cached = extract_fedlex_act(law_abbreviation, throttle).get(canonical_article_number(article_number))
+            if cached:
+                return cached
+            logger.warning(f"Article {law_abbreviation} {article_number} absent de l'acte chargé, extraction individuelle")
+        except (UnicodeDecodeError, TimeoutException, NoSuchElementException) as e:
+            logger.error(f"Échec du chargement de l'acte {law_abbreviation}, extraction individuelle : {e}")
+
+    return extract_single_article(law_abbreviation, article_number, throttle)
+
+def extract_single_article(law_abbreviation: str, article_number: str, throttle: Throttle = True) -> Dict[str, Any]:
+    """
+    Extrait un seul article en chargeant la page Fedlex sur son ancre.
+
     Args:
         law_abbreviation (str): Abréviation de la loi.
         article_number (str): Numéro de l'article.
+        throttle (Throttle): Régulation appliquée avant chaque chargement (voir apply_throttle).
 
     Returns:
         Dict[str, Any]: Dictionnaire contenant les informations de l'article.
@@ -210,9 +555,15 @@ def extract_fedlex_article(law_abbreviation: str, article_number: str) -> Dict[s
     Raises:
         ValueError: Si la loi n'est pas reconnue.
     """
+    from bs4 import BeautifulSoup
+    from selenium.common.exceptions import NoSuchElementException, TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
     for attempt in range(FEDLEX_EXTRACTION_SETTINGS['max_retries']):
         try:
-            rate_limit()
+            apply_throttle(throttle)
             law_abbreviation = normalize_law_code(law_abbreviation)
             
             logger.info(f"Code de loi reçu: {law_abbreviation}")
@@ -222,47 +573,42 @@ def extract_fedlex_article(law_abbreviation: str, article_number: str) -> Dict[s
                 raise ValueError(f"Loi non reconnue: {law_abbreviation}")
 
             base_url = FEDLEX_LINKS[law_abbreviation]["lien"]
-            article_id = re.sub(r'(\d+)([a-z])', r'\1_\2', article_number.lower())
+            article_id = article_id_from_number(article_number)
             article_url = f"{base_url}#art_{article_id}"
             
             logger.info(f"Tentative {attempt + 1} - URL de l'article : {article_url}")
 
-            driver = setup_driver()
-            try:
-                driver.get(article_url)
-                WebDriverWait(driver, FEDLEX_EXTRACTION_SETTINGS['timeout']).until(
-                    EC.presence_of_element_located((By.ID, f"art_{article_id}"))
-                )
-                
-                time.sleep(2)
-                
-                page_source = driver.page_source
+            acquire_started_at = time.perf_counter()
+            with get_driver_pool().driver() as driver:
+                fedlex_extraction_seconds.observe(time.perf_counter() - acquire_started_at, backend="selenium", stage="driver_acquire")
+                with fedlex_extraction_seconds.time(backend="selenium", stage="page_load"):
+                    driver.get(article_url)
+                with fedlex_extraction_seconds.time(backend="selenium", stage="wait"):
+                    WebDriverWait(driver, FEDLEX_EXTRACTION_SETTINGS['timeout']).until(
+                        EC.presence_of_element_located((By.ID, f"art_{article_id}"))
+                    )
+
+                    wait_for_stable_content(driver, f"#art_{article_id}")
+
+                    page_source = driver.page_source
+
+            # La session est rendue au pool avant le parsing
+            with fedlex_extraction_seconds.time(backend="selenium", stage="parse"):
                 soup = BeautifulSoup(page_source, 'html.parser')
-                
+
                 article_content = soup.find('article', id=f"art_{article_id}")
                 if not article_content:
                     raise ValueError("Contenu de l'article non trouvé.")
 
-                title = article_content.find('h5', class_='article-title')
-                title_text = title.get_text().strip() if title else f"Article {article_number}"
-                
-                formatted_content = f"<h2>{FEDLEX_LINKS[law_abbreviation]['titre']} - {title_text}</h2>\n"
-                formatted_content += extract_content(article_content)
-
-                return {
-                    "success": True,
-                    "law_code": law_abbreviation,
-                    "article_number": article_number,
-                    "title": title_text,
-                    "content": formatted_content
-                }
-            finally:
-                driver.quit()
+                article = parse_article_element(law_abbreviation, article_content, article_number)
+            act_store.put(law_abbreviation, article_number, article)
+            return article
         except (UnicodeDecodeError, TimeoutException, NoSuchElementException) as e:
             logger.error(f"Erreur lors de l'extraction de l'article {law_abbreviation} {article_number} (tentative {attempt + 1}): {e}")
             if attempt < FEDLEX_EXTRACTION_SETTINGS['max_retries'] - 1:
-                logger.info(f"Nouvelle tentative dans {FEDLEX_EXTRACTION_SETTINGS['retry_delay']} secondes...")
-                time.sleep(FEDLEX_EXTRACTION_SETTINGS['retry_delay'])
+                delay = backoff_delay(attempt)
+                logger.info(f"Nouvelle tentative dans {delay:.1f} secondes...")
+                time.sleep(delay)
             else:
                 return {
                     "success": False,
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+Extraction Fedlex sans navigateur.
+
+Fedlex publie chaque version consolidée d'un acte sous forme de manifestations
+statiques (HTML et XML Akoma Ntoso) dans son filestore. Ce module résout l'URL
+de la manifestation en vigueur via le point SPARQL de fedlex.data.admin.ch,
+la télécharge avec un client httpx partagé, la découpe en articles et les range
+dans le même stockage que l'extraction Selenium (fedlex_extractor.act_store).
+"""
+import asyncio
+import logging
+import os
+import re
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, Optional
+
+import httpx
+
+from article_numbers import canonical_article_number
+from fedlex_extractor import FEDLEX_LINKS, act_store, article_number_from_id, normalize_law_code, parse_article_element
+from metrics import fedlex_extraction_seconds
+from rate_limiter import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+FEDLEX_HTTP_SETTINGS = {
+    "sparql_url": os.getenv("FEDLEX_SPARQL_URL", "https://fedlex.data.admin.ch/sparqlendpoint"),
+    "user_format": os.getenv("FEDLEX_HTTP_FORMAT", "html"),  # "html" ou "xml" (Akoma Ntoso)
+    "timeout": 30,
+    "max_connections": 10,
+    "max_keepalive_connections": 5,
+}
+
+AKN_NAMESPACE = "{http://docs.oasis-open.org/legaldocml/ns/akn/3.0}"
+
+MANIFESTATION_QUERY = """
+PREFIX jolux: <http://data.legilux.public.lu/resource/ontology/jolux#>
+SELECT ?url WHERE {{
+    ?consolidation jolux:isMemberOf <{eli}> ;
+                   jolux:dateApplicability ?date ;
+                   jolux:isRealizedBy ?expression .
+    ?expression jolux:language <http://publications.europa.eu/resource/authority/language/{language}> ;
+                jolux:isEmbodiedBy ?manifestation .
+    ?manifestation jolux:userFormat <https://fedlex.data.admin.ch/vocabulary/user-format/{user_format}> ;
+                   jolux:isExemplifiedBy ?url .
+    FILTER(?date <= NOW())
+}}
+ORDER BY DESC(?date)
+LIMIT 1
+"""
+
+LANGUAGES = {"fr": "FRA", "de": "DEU", "it": "ITA", "rm": "ROH", "en": "ENG"}
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+def eli_from_link(link: str) -> str:
+    """
+    Convertit un lien de la plateforme Fedlex en URI ELI du graphe de données.
+
+    Args:
+        link (str): Lien de FEDLEX_LINKS (ex. "https://www.fedlex.admin.ch/eli/cc/27/317_321_377/fr").
+
+    Returns:
+        str: URI ELI (ex. "https://fedlex.data.admin.ch/eli/cc/27/317_321_377").
+    """
+    match = re.search(r'/eli/(.+?)(?:/(?:fr|de|it|rm|en))?/?$', link)
+    if not match:
+        raise ValueError(f"Lien Fedlex sans ELI: {link}")
+    return f"https://fedlex.data.admin.ch/eli/{match.group(1)}"
+
+
+def parse_html_manifestation(law_abbreviation: str, html: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Découpe une manifestation HTML en articles ; seuls les éléments <article> sont analysés.
+
+    Args:
+        law_abbreviation (str): Abréviation normalisée de la loi.
+        html (str): Contenu de la manifestation HTML.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Articles indexés par numéro d'article normalisé.
+    """
+    # Import différé : BeautifulSoup n'est chargé qu'au premier acte téléchargé
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=SoupStrainer('article', id=re.compile(r'^art_')))
+    articles = {}
+    for article_element in soup.find_all('article', id=re.compile(r'^art_')):
+        article_number = article_number_from_id(article_element['id'])
+        articles[article_number] = parse_article_element(law_abbreviation, article_element, article_number)
+    return articles
+
+
+def _akn_text(element: ET.Element) -> str:
+    return re.sub(r'\s+', ' ', ''.join(element.itertext())).strip()
+
+
+def _render_akn(element: ET.Element, level: int = 0) -> str:
+    content = ""
+    for child in element:
+        tag = child.tag.replace(AKN_NAMESPACE, '')
+        if tag in ('num', 'heading'):
+            continue
+        if tag == 'p':
+            content += f"{'  ' * level}<p>{_akn_text(child)}</p>\n"
+        elif tag == 'paragraph':
+            number = child.find(f'{AKN_NAMESPACE}num')
+            paragraph = _render_akn(child, level)
+            if number is not None:
+                paragraph = paragraph.replace('<p>', f"<p>{_akn_text(number)} ", 1)
+            content += paragraph
+        elif tag == 'blockList':
+            content += f"{'  ' * level}<ul>\n"
+            for item in child.findall(f'{AKN_NAMESPACE}item'):
+                item_text = ' '.join(_akn_text(part) for part in item)
+                content += f"{'  ' * (level + 1)}<li>{item_text}</li>\n"
+            content += f"{'  ' * level}</ul>\n"
+        else:
+            content += _render_akn(child, level)
+    return content
+
+
+def parse_akn_manifestation(law_abbreviation: str, xml: bytes) -> Dict[str, Dict[str, Any]]:
+    """
+    Découpe une manifestation XML Akoma Ntoso en articles.
+
+    Args:
+        law_abbreviation (str): Abréviation normalisée de la loi.
+        xml (bytes): Contenu XML de la manifestation.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Articles indexés par numéro d'article normalisé.
+    """
+    root = ET.fromstring(xml)
+    articles = {}
+    for article_element in root.iter(f'{AKN_NAMESPACE}article'):
+        element_id = article_element.get('eId', '')
+        if not element_id.startswith('art_'):
+            continue
+        article_number = article_number_from_id(element_id)
+        parts = [article_element.find(f'{AKN_NAMESPACE}{tag}') for tag in ('num', 'heading')]
+        title_text = ' '.join(_akn_text(part) for part in parts if part is not None) or f"Article {article_number}"
+        formatted_content = f"<h2>{FEDLEX_LINKS[law_abbreviation]['titre']} - {title_text}</h2>\n"
+        formatted_content += _render_akn(article_element)
+        articles[article_number] = {
+            "success": True,
+            "law_code": law_abbreviation,
+            "article_number": article_number,
+            "title": title_text,
+            "content": formatted_content
+        }
+    return articles
+
+
+class FedlexHttpFetcher:
+    """
+    Récupère les actes Fedlex par simple requête HTTP sur un client httpx partagé.
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        sparql_url: Optional[str] = None,
+        user_format: Optional[str] = None,
+        manifestation_urls: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Args:
+            client (Optional[httpx.AsyncClient]): Client HTTP à utiliser (un client avec pool de connexions est créé sinon).
+            sparql_url (Optional[str]): Point SPARQL utilisé pour résoudre les manifestations.
+            user_format (Optional[str]): "html" ou "xml".
+            manifestation_urls (Optional[Dict[str, str]]): URLs connues par code de loi, qui évitent la requête SPARQL.
+        """
+        self._client = client or httpx.AsyncClient(
+            timeout=FEDLEX_HTTP_SETTINGS["timeout"],
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=FEDLEX_HTTP_SETTINGS["max_connections"],
+                max_keepalive_connections=FEDLEX_HTTP_SETTINGS["max_keepalive_connections"],
+            ),
+            headers={"User-Agent": "Lextutor/1.0"},
+        )
+        self._sparql_url = sparql_url or FEDLEX_HTTP_SETTINGS["sparql_url"]
+        self._user_format = user_format or FEDLEX_HTTP_SETTINGS["user_format"]
+        self._manifestation_urls: Dict[str, str] = dict(manifestation_urls or {})
+        self._act_locks: Dict[str, asyncio.Lock] = {}
+
+    async def resolve_manifestation_url(self, law_abbreviation: str) -> str:
+        """
+        Trouve l'URL de la manifestation de la version consolidée en vigueur.
+
+        Args:
+            law_abbreviation (str): Abréviation normalisée de la loi.
+
+        Returns:
+            str: URL du fichier HTML ou XML dans le filestore Fedlex.
+
+        Raises:
+            LookupError: Si aucune manifestation n'est publiée pour cet acte.
+        """
+        if law_abbreviation in self._manifestation_urls:
+            return self._manifestation_urls[law_abbreviation]
+
+        link = FEDLEX_LINKS[law_abbreviation]["lien"]
+        language = LANGUAGES.get(link.rstrip('/').rsplit('/', 1)[-1], "FRA")
+        query = MANIFESTATION_QUERY.format(eli=eli_from_link(link), language=language, user_format=self._user_format)
+        await rate_limiter.acquire(self._sparql_url)
+        response = await self._client.post(
+            self._sparql_url,
+            data={"query": query},
+            headers={"Accept": "application/sparql-results+json"},
+        )
+        response.raise_for_status()
+        bindings = response.json().get("results", {}).get("bindings", [])
+        if not bindings:
+            raise LookupError(f"Aucune manifestation {self._user_format} pour {law_abbreviation}")
+        url = bindings[0]["url"]["value"]
+        self._manifestation_urls[law_abbreviation] = url
+        return url
+
+    async def fetch_act(self, law_abbreviation: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Télécharge et découpe un acte complet, une seule fois par loi.
+
+        Args:
+            law_abbreviation (str): Abréviation de la loi.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Articles de l'acte indexés par numéro d'article normalisé.
+        """
+        law_abbreviation = normalize_law_code(law_abbreviation)
+        if law_abbreviation not in FEDLEX_LINKS:
+            raise ValueError(f"Loi non reconnue: {law_abbreviation}")
+
+        lock = self._act_locks.setdefault(law_abbreviation, asyncio.Lock())
+        async with lock:
+            loaded = act_store.act_articles(law_abbreviation)
+            if loaded is not None:
+                return loaded
+
+            with fedlex_extraction_seconds.time(backend="http", stage="download"):
+                url = await self.resolve_manifestation_url(law_abbreviation)
+                logger.info(f"Téléchargement de l'acte {law_abbreviation} : {url}")
+                await rate_limiter.acquire(url)
+                response = await self._client.get(url)
+                response.raise_for_status()
+
+            with fedlex_extraction_seconds.time(backend="http", stage="parse"):
+                if self._user_format == "xml":
+                    articles = await asyncio.to_thread(parse_akn_manifestation, law_abbreviation, response.content)
+                else:
+                    articles = await asyncio.to_thread(parse_html_manifestation, law_abbreviation, response.text)
+            if not articles:
+                raise LookupError(f"Aucun article trouvé dans la manifestation de {law_abbreviation}")
+
+            act_store.put_act(law_abbreviation, articles)
+            logger.info(f"Acte {law_abbreviation} chargé par HTTP : {len(articles)} articles")
+            return articles
+
+    async def fetch_article(self, law_abbreviation: str, article_number: str) -> Optional[Dict[str, Any]]:
+        """
+        Retourne un article, en chargeant l'acte par HTTP si nécessaire.
+
+        Args:
+            law_abbreviation (str): Abréviation de la loi.
+            article_number (str): Numéro de l'article.
+
+        Returns:
+            Optional[Dict[str, Any]]: L'article, ou None s'il est absent de l'acte.
+        """
+        law_abbreviation = normalize_law_code(law_abbreviation)
+        article = act_store.get(law_abbreviation, article_number)
+        if article is None and not act_store.is_act_loaded(law_abbreviation):
+            # Lu dans l'acte renvoyé : il a pu être oublié du stockage entre-temps
+            articles = await self.fetch_act(law_abbreviation)
+            article = articles.get(canonical_article_number(article_number))
+        return article
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Index plein texte local des décisions de jurisprudence déjà récupérées.
+
+Les décisions renvoyées par les recherches en ligne sont ajoutées au fil de
+l'eau ; les recherches suivantes sur les mêmes thèmes sont servies par un
+classement BM25 sur un index inversé, sans navigateur ni réseau.
+"""
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from beta_entscheidsuche_extractor import normalize_text
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+INDEXED_FIELDS = ("title", "summary", "content")
+
+
+def load_stopwords(language: str) -> List[str]:
+    """
+    Lit les mots vides NLTK installés localement, sans jamais les télécharger.
+
+    Les données sont cherchées dans les répertoires NLTK habituels et dans NLTK_DATA
+    (installation : ``python -m nltk.downloader -d <répertoire> stopwords``).
+
+    Args:
+        language (str): Langue des mots vides (ex. "french").
+
+    Returns:
+        List[str]: Mots vides, ou liste vide (avec une erreur journalisée) si les données sont absentes.
+    """
+    from nltk.corpus import stopwords
+
+    try:
+        return stopwords.words(language)
+    except LookupError:
+        logger.error(
+            f"Mots vides NLTK « {language} » introuvables : l'index de jurisprudence fonctionne sans mots vides. "
+            f"Installez-les avec « python -m nltk.downloader -d <répertoire> stopwords » et définissez NLTK_DATA."
+        )
+        return []
+
+
+class JurisprudenceIndex:
+    """
+    Index inversé BM25 avec normalisation française (minuscules, accents, mots vides, racinisation).
+    """
+
+    def __init__(self, path: Optional[str] = None, stopwords: Iterable[str] = (), k1: float = 1.5, b: float = 0.75, stopwords_language: Optional[str] = None):
+        """
+        Le racinisateur NLTK, les mots vides de ``stopwords_language`` et le fichier de
+        persistance ne sont chargés qu'à la première utilisation de l'index.
+
+        Args:
+            path (Optional[str]): Fichier JSON Lines de persistance (aucune persistance si None).
+            stopwords (Iterable[str]): Mots vides à ignorer.
+            k1 (float): Paramètre de saturation de la fréquence des termes.
+            b (float): Paramètre de normalisation par la longueur des documents.
+            stopwords_language (Optional[str]): Langue des mots vides NLTK à ajouter (voir load_stopwords).
+        """
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.stopwords_language = stopwords_language
+        self._stemmer = None
+        self._stopwords = {normalize_text(word.lower()) for word in stopwords}
+        self._lock = threading.RLock()
+        self._ready = False
+        self._documents: List[Dict[str, Any]] = []
+        self._keys: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._lengths: List[int] = []
+        self._total_length = 0
+        # Dernière recherche en ligne par requête normalisée (horodatage time.time())
+        self._fetched_at: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        self.ensure_ready()
+        return len(self._documents)
+
+    def ensure_ready(self) -> None:
+        """
+        Charge le racinisateur, les mots vides et les décisions persistées, une seule fois.
+        """
+        if self._ready:
+            return
+        with self._lock:
+            if self._ready:
+                return
+            from nltk.stem.snowball import FrenchStemmer
+
+            if self.stopwords_language:
+                self._stopwords |= {normalize_text(word.lower()) for word in load_stopwords(self.stopwords_language)}
+            # Le racinisateur en dernier : tokenize peut servir dès qu'il est défini (chargement du fichier)
+            self._stemmer = FrenchStemmer()
+            if self.path and os.path.exists(self.path):
+                self._load()
+            self._ready = True
+
+    def tokenize(self, text: str) -> List[str]:
+        """
+        Découpe un texte en termes normalisés.
+
+        Args:
+            text (str): Texte brut.
+
+        Returns:
+            List[str]: Termes sans accents, sans mots vides, racinisés.
+        """
+        if self._stemmer is None:
+            self.ensure_ready()
+        tokens = TOKEN_PATTERN.findall(normalize_text(text.lower()))
+        return [self._stemmer.stem(token) for token in tokens if len(token) > 1 and token not in self._stopwords]
+
+    @staticmethod
+    def _key(document: Dict[str, Any]) -> str:
+        link = document.get("link")
+        return link if link and link != "No Link" else document.get("title", "")
+
+    def _index(self, document: Dict[str, Any]) -> bool:
+        key = self._key(document)
+        if not key or key in self._keys:
+            return False
+        doc_id = len(self._documents)
+        terms = self.tokenize(" ".join(str(document.get(field, "")) for field in INDEXED_FIELDS))
+        for term, frequency in Counter(terms).items():
+            self._postings[term][doc_id] = frequency
+        self._documents.append(document)
+        self._keys[key] = doc_id
+        self._lengths.append(len(terms))
+        self._total_length += len(terms)
+        return True
+
+    def _load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    self._index(json.loads(line))
+        logger.info(f"Index de jurisprudence chargé : {len(self._documents)} décisions")
+
+    def add(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """
+        Ajoute des décisions à l'index (les doublons, par lien, sont ignorés).
+
+        Args:
+            documents (Iterable[Dict[str, Any]]): Décisions au format {title, link, summary[, content]}.
+
+        Returns:
+            int: Nombre de nouvelles décisions indexées.
+        """
+        self.ensure_ready()
+        with self._lock:
+            added = [document for document in documents if self._index(document)]
+            if added and self.path:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    for document in added:
+                        f.write(json.dumps(document, ensure_ascii=False) + "\n")
+        return len(added)
+
+    def search(self, query: str, limit: int = 20, match_all: bool = False, min_score: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Recherche les décisions les plus pertinentes (BM25).
+
+        Args:
+            query (str): Mots-clés recherchés.
+            limit (int): Nombre maximal de résultats.
+            match_all (bool): Ne retenir que les décisions contenant tous les termes de la requête.
+            min_score (float): Score BM25 minimal d'une décision retenue.
+
+        Returns:
+            List[Dict[str, Any]]: Décisions classées par pertinence décroissante.
+        """
+        self.ensure_ready()
+        with self._lock:
+            count = len(self._documents)
+            terms = set(self.tokenize(query))
+            if not count or not terms:
+                return []
+            average_length = self._total_length / count
+            scores: Dict[int, float] = defaultdict(float)
+            matched_terms: Dict[int, int] = defaultdict(int)
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    if match_all:
+                        return []
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                    scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+                    matched_terms[doc_id] += 1
+            ranked = sorted(
+                (
+                    (doc_id, score) for doc_id, score in scores.items()
+                    if score >= min_score and (not match_all or matched_terms[doc_id] == len(terms))
+                ),
+                key=lambda item: item[1],
+                reverse=True,
+            )[:limit]
+            return [self._documents[doc_id] for doc_id, _ in ranked]
+
+    def _query_key(self, query: str) -> str:
+        return " ".join(sorted(set(self.tokenize(query))))
+
+    def mark_fetched(self, query: str, fetched_at: Optional[float] = None) -> None:
+        """
+        Enregistre qu'une recherche en ligne vient d'alimenter l'index pour cette requête.
+        """
+        key = self._query_key(query)
+        with self._lock:
+            self._fetched_at[key] = time.time() if fetched_at is None else fetched_at
+
+    def is_fresh(self, query: str, ttl: float) -> bool:
+        """
+        Indique si la requête a été recherchée en ligne il y a moins de ``ttl`` secondes.
+
+        Une requête jamais recherchée en ligne (ou dont la dernière recherche est trop
+        ancienne) doit l'être à nouveau : l'index seul ne suffit pas à y répondre.
+        """
+        key = self._query_key(query)
+        with self._lock:
+            fetched_at = self._fetched_at.get(key)
+        return fetched_at is not None and time.time() - fetched_at < ttl
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Registre unique des lois fédérales (fedlex_references.json).
+
+Le fichier est lu et validé une seule fois, au chargement du module, puis
+compilé en un index d'alias : abréviation, titre et variantes usuelles
+(« Cst. », « CO suisse », « Code des obligations »), sans accents ni casse.
+Un trie résout un code de loi cité en un seul parcours de la chaîne.
+"""
+import json
+import logging
+import os
+import re
+import unicodedata
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LAW_REFERENCES_FILE = os.path.join(os.path.dirname(__file__), "fedlex_references.json")
+FEDLEX_ELI_PREFIX = "https://www.fedlex.admin.ch/eli/"
+
+# Marque de fin d'alias dans le trie (aucun caractère replié n'est vide)
+_END = ""
+
+
+def fold_law_name(text: str) -> str:
+    """
+    Replie un nom de loi pour la comparaison : sans accents, en minuscules, sans points ni ponctuation.
+
+    Ex. "Cst. féd." -> "cst fed", "Loi sur l'assurance-chômage" -> "loi sur l assurance chomage".
+    """
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = text.casefold().replace(".", "")
+    return re.sub(r"[\W_]+", " ", text).strip()
+
+
+def _reject_duplicate_keys(pairs: List[Tuple[str, Any]]) -> Dict[str, Any]:
+    result: Dict[str, Any] = {}
+    for key, value in pairs:
+        if key in result:
+            raise ValueError(f"Clé en double dans le registre des lois : {key}")
+        result[key] = value
+    return result
+
+
+class LawRegistry:
+    """
+    Lois connues (lien Fedlex et titre) et résolution des codes de loi cités.
+    """
+
+    def __init__(self, references: Dict[str, Dict[str, Any]]):
+        """
+        Args:
+            references (Dict[str, Dict[str, Any]]): {code: {"lien", "titre", "alias" (optionnel)}}.
+
+        Raises:
+            ValueError: Si une entrée est incomplète, ou si un lien ou un alias est attribué à deux lois.
+        """
+        self.links: Dict[str, Dict[str, str]] = {}
+        self._aliases: Dict[str, str] = {}
+        self._trie: Dict[str, Any] = {}
+        problems = []
+        owners_by_link: Dict[str, str] = {}
+
+        for code, entry in references.items():
+            link, title = (entry.get("lien"), entry.get("titre")) if isinstance(entry, dict) else (None, None)
+            if not isinstance(link, str) or not isinstance(title, str):
+                problems.append(f"{code} : lien et titre requis")
+                continue
+            if not link.startswith(FEDLEX_ELI_PREFIX):
+                problems.append(f"{code} : lien hors de Fedlex ({link})")
+            if link in owners_by_link:
+                problems.append(f"{code} : même lien que {owners_by_link[link]} ({link})")
+            owners_by_link.setdefault(link, code)
+            for alias in [code, title, *entry.get("alias", [])]:
+                folded = fold_law_name(alias)
+                owner = self._aliases.setdefault(folded, code)
+                if owner != code:
+                    problems.append(f"{code} : l'alias « {alias} » désigne déjà {owner}")
+            self.links[code] = {"lien": link, "titre": title}
+
+        if problems:
+            raise ValueError("Registre des lois invalide :\n" + "\n".join(problems))
+
+        for folded, code in self._aliases.items():
+            node = self._trie
+            for char in folded:
+                node = node.setdefault(char, {})
+            node[_END] = code
+
+    @classmethod
+    def from_file(cls, path: str = LAW_REFERENCES_FILE) -> "LawRegistry":
+        """
+        Charge et valide le registre depuis un fichier JSON (les clés en double sont refusées).
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            references = json.load(f, object_pairs_hook=_reject_duplicate_keys)
+        registry = cls(references)
+        logger.info(f"Registre des lois chargé : {len(registry)} lois, {len(registry._aliases)} alias")
+        return registry
+
+    def __len__(self) -> int:
+        return len(self.links)
+
+    def __contains__(self, code: object) -> bool:
+        return code in self.links
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.links)
+
+    def _longest_match(self, folded: str, start: int) -> Optional[str]:
+        node, match = self._trie, None
+        for position in range(start, len(folded)):
+            node = node.get(folded[position])
+            if node is None:
+                break
+            # Un alias ne compte que s'il se termine sur une fin de mot ("co" ne reconnaît pas "code")
+            if _END in node and (position + 1 == len(folded) or folded[position + 1] == " "):
+                match = node[_END]
+        return match
+
+    def resolve(self, text: str) -> Optional[str]:
+        """
+        Résout un code de loi cité ("CO", "CO suisse", "Cst.", "Code des obligations", "al. 2 LAMal").
+
+        L'alias le plus long est recherché à partir du premier mot, puis des mots suivants
+        (précisions comme « al. 2 » placées avant la loi).
+
+        Returns:
+            Optional[str]: Code de la loi dans le registre, ou None si aucune loi n'est reconnue.
+        """
+        folded = fold_law_name(text)
+        start = 0
+        while start < len(folded):
+            match = self._longest_match(folded, start)
+            if match is not None:
+                return match
+            next_word = folded.find(" ", start)
+            if next_word < 0:
+                break
+            start = next_word + 1
+        return None
+
+
+law_registry = LawRegistry.from_file()
@@ -1,35 +1,54 @@
 # -*- coding: utf-8 -*-
 import sys
-import json
 import os
 import logging
 from logging.handlers import RotatingFileHandler
 import asyncio
+import math
+import time
 import traceback
-from typing import List, Dict, Any, Optional, Union
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Awaitable, Callable, Optional, Tuple, Union
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request, HTTPException, WebSocket, WebSocketDisconnect, Depends
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.websockets import WebSocketState
-import re
 from pprint import pformat
-import nltk
-from nltk.corpus import stopwords
-import uvicorn
-from functools import lru_cache
-from openai import AsyncOpenAI
-from tenacity import retry, stop_after_attempt, wait_exponential
+from cache import get_cache, cache_stats
+from shared_cache import TwoLevelCache, create_backend
+from singleflight import get_singleflight, singleflight_stats
+from semantic_cache import SemanticCache
+from openai_admission import AdmissionRejected, estimate_tokens, openai_admission
+from ws_outbox import OutboxClosed, WebSocketOutbox, outbox_totals
+from connection_manager import connection_manager
+from stream_listeners import StreamListeners
+from article_citations import IncrementalArticleParser, parse_articles as parse_article_section
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 
 # Import functionality directly instead of using subprocess
-from beta_entscheidsuche_extractor import main as beta_entscheidsuche_main
-from fedlex_extractor import extract_fedlex_article as fedlex_extract_article
+from beta_entscheidsuche_extractor import search_with_manager as beta_entscheidsuche_search
+from fedlex_extractor import extract_fedlex_article as fedlex_extract_article, act_store, format_article, get_cached_article
+from law_registry import law_registry
+from article_numbers import article_sort_key, canonical_article_number, expand_article_range, split_article_range
+from fedlex_corpus import FedlexCorpus
+from rate_limiter import rate_limiter
+from app_resources import AppResources, ServiceDraining, create_server
+from metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    fedlex_extraction_seconds,
+    gpt_call_seconds,
+    gpt_parse_seconds,
+    http_request_seconds,
+    jurisprudence_search_seconds,
+    metrics,
+    upstream_call,
+)
+from jurisprudence_index import JurisprudenceIndex
 
 # Configuration initiale
 load_dotenv()
-nltk.download('punkt', quiet=True)
-nltk.download('stopwords', quiet=True)
 
 # Configuration du logging
 log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -52,16 +71,31 @@ sys.stderr.reconfigure(encoding='utf-8', errors='replace')
 # Constantes et configuration
 MAX_RETRIES = 3
 RETRY_DELAY = 2
+FEDLEX_BACKEND = os.getenv("FEDLEX_BACKEND", "http")  # "http" : manifestations statiques, "selenium" : navigateur
+FEDLEX_FETCH_CONCURRENCY = int(os.getenv("FEDLEX_FETCH_CONCURRENCY", "8"))  # Articles extraits simultanément (plages d'articles)
+JURISPRUDENCE_BACKEND = os.getenv("JURISPRUDENCE_BACKEND", "api")  # "api" : index de recherche, "browser" : Playwright
+JURISPRUDENCE_INDEX_MIN_RESULTS = int(os.getenv("JURISPRUDENCE_INDEX_MIN_RESULTS", "5"))  # Résultats locaux suffisants pour éviter une recherche en ligne
+JURISPRUDENCE_INDEX_MIN_SCORE = float(os.getenv("JURISPRUDENCE_INDEX_MIN_SCORE", "0"))  # Score BM25 minimal d'un résultat local
+JURISPRUDENCE_INDEX_TTL = float(os.getenv("JURISPRUDENCE_INDEX_TTL", str(24 * 3600)))  # Durée pendant laquelle l'index sert un mot-clé recherché en ligne
+GPT4_STREAMING = os.getenv("GPT4_STREAMING", "true").lower() == "true"  # Transmission des fragments de réponse GPT-4o au fil de l'eau (WebSocket)
+WS_MAX_CONCURRENT_QUESTIONS = int(os.getenv("WS_MAX_CONCURRENT_QUESTIONS", "3"))  # Questions traitées simultanément par connexion WebSocket
+WS_MAX_PENDING_QUESTIONS = int(os.getenv("WS_MAX_PENDING_QUESTIONS", "10"))  # Questions acceptées (en cours ou en attente) par connexion
 API_KEY = os.getenv("OPENAI_API_KEY")
 if not API_KEY:
     logger.error("OPENAI_API_KEY n'est pas défini dans le fichier .env")
     sys.exit(1)
 
-# Initialisation du client OpenAI avec GPT-4o
-client = AsyncOpenAI(api_key=API_KEY)
+# Clients OpenAI et HTTP, pools de navigateurs : construits et fermés par le lifespan (voir app_resources.py)
+resources = AppResources(API_KEY, fedlex_backend=FEDLEX_BACKEND, jurisprudence_backend=JURISPRUDENCE_BACKEND)
+
+def is_rate_limit_error(exception: BaseException) -> bool:
+    from openai import RateLimitError
+
+    return isinstance(exception, RateLimitError)
+
+GPT4_COMPLETION_SETTINGS = {"model": "gpt-4o", "max_tokens": 4000, "temperature": 0.7}
 
 # Variables globales
-websocket_clients = []
 SYSTEM_PROMPT = """
 Vous êtes un expert en droit suisse, spécialisé dans l'analyse et l'interprétation des lois suisses. Votre tâche est de fournir des analyses juridiques détaillées et précises pour chaque question posée. Assurez-vous que votre réponse soit structurée, professionnelle et orientée vers l'application universitaire.
 
@@ -82,8 +116,48 @@ Structure de la réponse :
 **Remarque :** Limitez vos réponses aux éléments directement pertinents à la question. Évitez toute information superflue ou hors sujet.
 """
 
+async def watch_fedlex_corpus() -> None:
+    """
+    Recharge le corpus Fedlex lorsqu'une nouvelle version est publiée et en informe les clients connectés.
+    """
+    version = fedlex_corpus.version
+    while True:
+        await asyncio.sleep(fedlex_corpus.refresh_interval)
+        try:
+            # Seul rechargement du corpus : les lectures (FedlexCorpus.get) ne touchent pas au disque
+            await asyncio.to_thread(fedlex_corpus.refresh)
+            if fedlex_corpus.version != version:
+                version = fedlex_corpus.version
+                # Chaque worker détecte lui-même la nouvelle version : diffusion locale uniquement
+                await connection_manager.broadcast({"type": "notice", "data": f"Corpus Fedlex mis à jour (version {version})"}, local=True)
+        except Exception as e:
+            logger.error(f"Erreur lors du rechargement du corpus Fedlex : {e}")
+
+# Cycle de vie de l'application : construction, préchauffage et fermeture des ressources
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await resources.start()
+    # NLTK et l'index persisté sont chargés ici, hors de l'import du module
+    await asyncio.to_thread(jurisprudence_index.ensure_ready)
+    await connection_manager.start()
+    corpus_watcher = asyncio.create_task(watch_fedlex_corpus())
+    resources.start_prewarm(fetch_fedlex_article)
+    try:
+        yield
+    finally:
+        # Déjà vidé au signal d'arrêt avec create_server ; sinon, attend les traitements restants
+        await resources.drain()
+        corpus_watcher.cancel()
+        fedlex_corpus.close()
+        await connection_manager.stop()
+        await resources.aclose()
+        if shared_cache_backend is not None:
+            await shared_cache_backend.aclose()
+        if semantic_cache is not None:
+            await asyncio.to_thread(semantic_cache.save)
+
 # Initialisation de l'application FastAPI
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Configuration des CORS
 app.add_middleware(
@@ -94,73 +168,166 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Durée de traitement de chaque requête HTTP : en-tête X-Process-Time et histogramme par route
+@app.middleware("http")
+async def add_process_time_header(request: Request, call_next):
+    started_at = time.perf_counter()
+    response = await call_next(request)
+    process_time = time.perf_counter() - started_at
+    # Le chemin déclaré de la route (et non l'URL) borne le nombre de séries
+    route = request.scope.get("route")
+    http_request_seconds.observe(process_time, method=request.method, route=getattr(route, "path", "unmatched"))
+    response.headers["X-Process-Time"] = str(round(process_time, 4))
+    return response
+
 # Montage des fichiers statiques
 static_dir = os.path.join(os.path.dirname(__file__), '../static')
 app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
-# Fonctions utilitaires
-def load_fedlex_links() -> Dict[str, Dict[str, str]]:
-    fedlex_references_file = os.path.join(static_dir, 'fedlex_references.json')
-    try:
-        with open(fedlex_references_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        logger.error(f"Erreur lors du chargement des références Fedlex: {str(e)}")
-    return {}
+# Registre unique des lois (voir law_registry.py)
+FEDLEX_LINKS = law_registry.links
+
+# Instantané hors ligne du corpus Fedlex (voir fedlex_corpus.py), consulté avant tout scraping
+corpus_dir = os.getenv("FEDLEX_CORPUS_DIR", os.path.join(os.path.dirname(__file__), '../corpus'))
+fedlex_corpus = FedlexCorpus(corpus_dir)
 
-FEDLEX_LINKS = load_fedlex_links()
+# Index local des décisions déjà récupérées, alimenté par chaque recherche en ligne
+jurisprudence_index = JurisprudenceIndex(
+    os.getenv("JURISPRUDENCE_INDEX_PATH", os.path.join(os.path.dirname(__file__), '../data/jurisprudence_index.jsonl')),
+    stopwords_language='french',
+)
 
-@lru_cache(maxsize=100)
 def normalize_law_code(code: str) -> Optional[str]:
-    code = code.upper().strip()
-    code_mapping = {
-        "CODE DES OBLIGATIONS": "CO",
-        "CODE CIVIL": "CC",
-        "CODE PÉNAL": "CP",
-        "CODE DE PROCÉDURE CIVILE": "CPC",
-        "CODE DE PROCÉDURE PÉNALE": "CPP",
-        "CONSTITUTION FÉDÉRALE": "Cst",
-        "CST": "Cst",
-        "CONSTITUTION": "Cst",
-    }
-    for key, value in code_mapping.items():
-        if code.startswith(key):
-            return value
-    return code if code in FEDLEX_LINKS else None
-
-# Caches for optimization
-gpt4_cache = {}
-article_cache = {}
-jurisprudence_cache = {}
+    return law_registry.resolve(code)
+
+# Caches à deux niveaux : L1 borné par processus (limites surchargeables via CACHE_<NOM>_*)
+# et L2 partagé entre workers (SHARED_CACHE_URL : redis://... ou sqlite:///...)
+shared_cache_backend = create_backend(os.getenv("SHARED_CACHE_URL"))
+gpt4_cache = TwoLevelCache("gpt4", get_cache("gpt4", max_entries=1000, ttl=24 * 3600), shared_cache_backend)
+article_cache = TwoLevelCache("article", get_cache("article", max_entries=5000, max_bytes=64 * 1024 * 1024, ttl=7 * 24 * 3600), shared_cache_backend)
+jurisprudence_cache = TwoLevelCache("jurisprudence", get_cache("jurisprudence", max_entries=1000, ttl=6 * 3600), shared_cache_backend)
+
+# Cache sémantique : les questions proches (similarité cosinus des embeddings) partagent la même réponse
+SEMANTIC_CACHE_SETTINGS = {
+    "enabled": os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true",
+    "embedding_model": os.getenv("EMBEDDING_MODEL", "text-embedding-3-small"),
+    "dim": int(os.getenv("EMBEDDING_DIM", "1536")),
+    "threshold": float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.93")),
+    "max_entries": int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "2000")),
+    "path": os.getenv("SEMANTIC_CACHE_PATH", os.path.join(os.path.dirname(__file__), '../data/semantic_cache.npz')),
+}
+
+async def embed_question(question: str) -> List[float]:
+    response = await resources.openai.embeddings.create(model=SEMANTIC_CACHE_SETTINGS["embedding_model"], input=question)
+    return response.data[0].embedding
+
+semantic_cache = SemanticCache(
+    embed_question,
+    dim=SEMANTIC_CACHE_SETTINGS["dim"],
+    threshold=SEMANTIC_CACHE_SETTINGS["threshold"],
+    max_entries=SEMANTIC_CACHE_SETTINGS["max_entries"],
+    ttl=gpt4_cache.ttl,
+    path=SEMANTIC_CACHE_SETTINGS["path"],
+    model=SEMANTIC_CACHE_SETTINGS["embedding_model"],
+) if SEMANTIC_CACHE_SETTINGS["enabled"] else None
+
+# Regroupement des recherches identiques concurrentes (un seul appel amont par clé)
+gpt4_flight = get_singleflight("gpt4")
+article_flight = get_singleflight("article")
+fedlex_fetch_slots = asyncio.Semaphore(FEDLEX_FETCH_CONCURRENCY)
+jurisprudence_flight = get_singleflight("jurisprudence")
+
+# Abonnés aux fragments de réponse GPT-4o, par question, en attente du premier fragment
+gpt4_stream_listeners = StreamListeners()
 
 # Fonctions principales
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-async def analyser_contenu_gpt4(question: str) -> Dict[str, Any]:
+@retry(retry=retry_if_exception(is_rate_limit_error), stop=stop_after_attempt(MAX_RETRIES), wait=wait_random_exponential(multiplier=RETRY_DELAY, max=30), reraise=True)
+async def create_gpt4_completion(messages: List[Dict[str, str]], stream: bool = False):
+    """
+    Appelle GPT-4o ; seules les erreurs de limite de débit (429) sont réessayées.
+    """
+    return await resources.openai.chat.completions.create(messages=messages, stream=stream, **GPT4_COMPLETION_SETTINGS)
+
+async def analyser_contenu_gpt4(question: str, on_delta: Optional[Callable[[str], Awaitable[None]]] = None, client_id: str = "anonymous") -> Dict[str, Any]:
+    """
+    Analyse une question avec GPT-4o.
+
+    Args:
+        question (str): Question de l'utilisateur.
+        on_delta (Optional[Callable[[str], Awaitable[None]]]): Si fourni, la réponse est demandée en
+            streaming et chaque fragment de texte est transmis à cette coroutine dès sa réception.
+        client_id (str): Client à l'origine de la question (file d'attente équitable des appels OpenAI).
+
+    Returns:
+        Dict[str, Any]: {"assistantResponse": texte complet}, ou {"error": message[, "retryAfter": secondes]}.
+    """
     cache_key = question.strip().lower()
-    if cache_key in gpt4_cache:
-        return gpt4_cache[cache_key]
+    cached_result = await gpt4_cache.get(cache_key)
+    if cached_result is not None:
+        return cached_result
+    if on_delta is None:
+        # Les questions identiques posées simultanément ne donnent lieu qu'à un seul appel OpenAI
+        return await gpt4_flight.do(cache_key, lambda: _analyser_contenu_gpt4(question, cache_key, client_id))
+
+    # Une question annulée ou déconnectée se désabonne : plus aucun fragment ne lui est transmis
+    with gpt4_stream_listeners.subscribe(cache_key, on_delta):
+        return await gpt4_flight.do(cache_key, lambda: _analyser_contenu_gpt4(question, cache_key, client_id, stream=True))
+
+async def _stream_gpt4_completion(messages: List[Dict[str, str]], cache_key: str) -> Optional[str]:
+    """
+    Reçoit la réponse GPT-4o en streaming et diffuse les fragments aux abonnés de la question.
+
+    Returns:
+        Optional[str]: Texte complet de la réponse, ou None si aucun fragment n'a été reçu.
+    """
+    stream = await create_gpt4_completion(messages, stream=True)
+    parts: List[str] = []
+    listeners = None
+    async for chunk in stream:
+        if not chunk.choices or not chunk.choices[0].delta or not chunk.choices[0].delta.content:
+            continue
+        delta = chunk.choices[0].delta.content
+        if listeners is None:
+            # Les abonnés arrivés après le premier fragment recevront seulement la réponse complète
+            listeners = gpt4_stream_listeners.take(cache_key)
+            logger.info("Premier fragment reçu de OpenAI")
+        parts.append(delta)
+        await gpt4_stream_listeners.publish(listeners, delta)
+    return "".join(parts) if parts else None
+
+async def _analyser_contenu_gpt4(question: str, cache_key: str, client_id: str, stream: bool = False) -> Dict[str, Any]:
+    if semantic_cache is not None:
+        similar_result = await semantic_cache.get(question)
+        if similar_result is not None:
+            await gpt4_cache.set(cache_key, similar_result)
+            return similar_result
 
     messages = [
         {"role": "system", "content": SYSTEM_PROMPT},
         {"role": "user", "content": question}
     ]
-    logger.info("Envoi de la requête à OpenAI")
     try:
-        response = await client.chat.completions.create(
-            model="gpt-4o",
-            messages=messages,
-            max_tokens=4000,
-            temperature=0.7
-        )
+        async with openai_admission.admit(client_id, estimate_tokens(messages, GPT4_COMPLETION_SETTINGS["max_tokens"])):
+            logger.info("Envoi de la requête à OpenAI")
+            with upstream_call("openai"), gpt_call_seconds.time(mode="stream" if stream else "complete"):
+                if stream:
+                    content = await _stream_gpt4_completion(messages, cache_key)
+                else:
+                    response = await create_gpt4_completion(messages)
+                    content = response.choices[0].message.content if response.choices and response.choices[0].message else None
         logger.info("Réponse reçue de OpenAI")
         
-        if response.choices and len(response.choices) > 0 and response.choices[0].message:
-            result = {"assistantResponse": response.choices[0].message.content}
-            gpt4_cache[cache_key] = result
+        if content:
+            result = {"assistantResponse": content}
+            await gpt4_cache.set(cache_key, result)
+            if semantic_cache is not None:
+                await semantic_cache.set(question, result)
             return result
         else:
             logger.error("La structure de la réponse de l'API est inattendue")
             return {"error": "Structure de réponse inattendue de l'API"}
+    except AdmissionRejected as e:
+        return {"error": str(e), "retryAfter": e.retry_after}
     except Exception as e:
         logger.error(f"Une erreur s'est produite lors de l'analyse GPT-4o : {e}")
         logger.error(traceback.format_exc())
@@ -179,78 +346,155 @@ def parse_gpt4_response(response: str) -> Dict[str, Any]:
     return result
 
 def parse_articles(section: str) -> List[Dict[str, str]]:
-    articles = []
-    for line in section.split('\n')[1:]:
-        match = re.match(r'\s*-\s*\*\*(?:art\.|article)\s*(\d+[a-z]?(?:-\d+[a-z]?)?)\s*([^*]+)\*\*\s*:\s*(.+)', line.strip(), re.IGNORECASE)
-        if match:
-            article_number, law_code, description = match.groups()
-            law_code = normalize_law_code(law_code.strip())
-            if law_code:
-                articles.append({
-                    "article_number": article_number.strip(),
-                    "law_code": law_code,
-                    "description": description.strip()
-                })
-            else:
-                articles.append({"error": f"Code de loi non reconnu: {law_code}"})
-        else:
-            articles.append({"error": f"Format d'article non reconnu: {line.strip()}"})
-    return articles
+    return parse_article_section(section, normalize_law_code)
 
 async def extract_fedlex_article(law_code: str, article_number: str) -> Dict[str, Union[bool, List[Dict[str, str]]]]:
+    """
+    Extrait un article ou une plage d'articles ("266-266g", "319-362").
+
+    Chaque article de la plage est mis en cache séparément ; seuls les articles
+    absents du cache sont extraits, en parallèle et sous la limite de débit Fedlex.
+
+    Args:
+        law_code (str): Code de loi cité.
+        article_number (str): Numéro d'article ou plage d'articles.
+
+    Returns:
+        Dict[str, Union[bool, List[Dict[str, str]]]]: {"success": True, "articles": [...]} dans l'ordre de la plage,
+        chaque article portant law_code, article_number et success (title/content ou error) ;
+        {"success": False, "error": ...} si la loi ou le numéro n'est pas reconnu.
+    """
+    normalized_law_code = normalize_law_code(law_code)
+    if normalized_law_code is None:
+        return {"success": False, "error": f"Code de loi non reconnu: {law_code}"}
+    try:
+        article_numbers = await resolve_article_numbers(normalized_law_code, article_number)
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+    articles = await asyncio.gather(*(fetch_fedlex_article(normalized_law_code, number) for number in article_numbers))
+    return {"success": True, "articles": list(articles)}
+
+async def resolve_article_numbers(law_code: str, article_number: str) -> List[str]:
+    """
+    Développe un numéro ou une plage d'articles en numéros individuels, d'après les articles connus de l'acte.
+
+    Raises:
+        ValueError: Si un numéro n'est pas valide.
+    """
+    bounds = split_article_range(article_number)
+    if bounds is None:
+        article_sort_key(article_number)
+        return [canonical_article_number(article_number)]
+    known_numbers = fedlex_corpus.article_numbers(law_code) or act_store.act_article_numbers(law_code)
+    if not known_numbers and FEDLEX_BACKEND == "http":
+        # Une seule requête charge l'acte entier : la plage est développée sur ses articles réels
+        try:
+            await resources.fedlex_http.fetch_act(law_code)
+            known_numbers = act_store.act_article_numbers(law_code)
+        except Exception as e:
+            logger.warning(f"Acte {law_code} indisponible, plage {article_number} déduite de la numérotation : {e}")
+    return expand_article_range(*bounds, known_numbers=known_numbers)
+
+async def fetch_fedlex_article(law_code: str, article_number: str) -> Dict[str, Any]:
+    """
+    Extrait un article individuel (cache par article, extractions identiques regroupées).
+    """
     cache_key = f"{law_code}-{article_number}"
-    if cache_key in article_cache:
-        return article_cache[cache_key]
+    cached_result = await article_cache.get(cache_key)
+    if cached_result is not None:
+        return cached_result
+    return await article_flight.do(cache_key, lambda: _fetch_fedlex_article(law_code, article_number, cache_key))
 
+async def _fetch_fedlex_article(law_code: str, article_number: str, cache_key: str) -> Dict[str, Any]:
+    logger.info(f"Extraction de l'article {law_code} {article_number}")
     try:
-        normalized_law_code = normalize_law_code(law_code)
-        if normalized_law_code is None:
-            return {"success": False, "error": f"Code de loi non reconnu: {law_code}"}
-
-        article_numbers = range(int(article_number.split('-')[0]), int(article_number.split('-')[-1]) + 1) if '-' in article_number else [article_number]
-        articles_extracted = []
-
-        for number in article_numbers:
-            number_str = str(number).replace('art.', '').strip()
-            logger.info(f"Extraction de l'article {normalized_law_code} {number_str}")
-
-            # Use asyncio.to_thread to run the synchronous function in a separate thread
-            result = await asyncio.to_thread(fedlex_extract_article, normalized_law_code, number_str)
-            
-            if result.get("success"):
-                articles_extracted.append(result)
-                article_cache[cache_key] = result
-            else:
-                articles_extracted.append({"error": result.get('error', 'Erreur inconnue')})
-
-        return {"success": True, "articles": articles_extracted}
+        # Les articles du corpus ou d'un acte déjà chargé sont servis sans passer par un thread
+        result = fedlex_corpus.get(law_code, article_number) or get_cached_article(law_code, article_number)
+        if result is None:
+            async with fedlex_fetch_slots:
+                if FEDLEX_BACKEND == "http":
+                    try:
+                        with upstream_call("fedlex_http"), fedlex_extraction_seconds.time(backend="http", stage="total"):
+                            result = await resources.fedlex_http.fetch_article(law_code, article_number)
+                    except Exception as e:
+                        logger.warning(f"Échec de l'extraction HTTP de {law_code} {article_number}, repli sur Selenium : {e}")
+                if result is None:
+                    # Chaque chargement de page (tentatives et replis compris) attend un jeton du limiteur de l'hôte
+                    throttle = rate_limiter.blocking_acquirer(FEDLEX_LINKS.get(law_code, {}).get("lien", "https://www.fedlex.admin.ch"), asyncio.get_running_loop())
+                    with upstream_call("fedlex_selenium"), fedlex_extraction_seconds.time(backend="selenium", stage="total"):
+                        result = await asyncio.to_thread(fedlex_extract_article, law_code, article_number, throttle)
     except Exception as e:
         logger.error(f"Erreur lors de l'extraction de l'article {law_code} {article_number} : {str(e)}")
         logger.error(traceback.format_exc())
-        return {"success": False, "error": f"Erreur lors de l'extraction: {str(e)}"}
+        result = {"success": False, "error": f"Erreur lors de l'extraction: {str(e)}"}
+
+    if result.get("success"):
+        await article_cache.set(cache_key, result)
+        return result
+    return {"success": False, "law_code": law_code, "article_number": article_number, "error": result.get("error", "Erreur inconnue")}
+
+async def extract_jurisprudence(keywords: List[str], on_results: Optional[Callable[[List[Dict[str, Any]]], Awaitable[None]]] = None) -> List[Dict[str, Any]]:
+    """
+    Recherche la jurisprudence pour chaque mot-clé, en parallèle.
 
-async def extract_jurisprudence(keywords: List[str]) -> List[Dict[str, Any]]:
+    Args:
+        keywords (List[str]): Mots-clés recherchés.
+        on_results (Optional[Callable]): Si fourni, appelée avec les résultats de chaque mot-clé dès qu'ils sont disponibles.
+
+    Returns:
+        List[Dict[str, Any]]: Résultats de tous les mots-clés, dans l'ordre d'arrivée.
+    """
     tasks = [asyncio.create_task(fetch_jurisprudence(keyword)) for keyword in keywords]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
     jurisprudence_results = []
-    for result in results:
-        if isinstance(result, Exception):
-            logger.error(f"Erreur lors de l'extraction de la jurisprudence : {str(result)}")
-        elif isinstance(result, list):
+    for next_result in asyncio.as_completed(tasks):
+        try:
+            result = await next_result
+        except Exception as e:
+            logger.error(f"Erreur lors de l'extraction de la jurisprudence : {str(e)}")
+            continue
+        if isinstance(result, list):
             jurisprudence_results.extend(result)
+            if on_results:
+                await on_results(result)
     return jurisprudence_results
 
 async def fetch_jurisprudence(keyword: str) -> List[Dict[str, Any]]:
-    if keyword in jurisprudence_cache:
-        return jurisprudence_cache[keyword]
+    cached_result = await jurisprudence_cache.get(keyword)
+    if cached_result is not None:
+        return cached_result
+    return await jurisprudence_flight.do(keyword, lambda: _fetch_jurisprudence(keyword))
 
+async def _fetch_jurisprudence(keyword: str) -> List[Dict[str, Any]]:
     try:
+        # L'index ne répond qu'aux mots-clés recherchés en ligne récemment, avec des décisions contenant tous leurs termes
+        if jurisprudence_index.is_fresh(keyword, JURISPRUDENCE_INDEX_TTL):
+            with jurisprudence_search_seconds.time(source="index"):
+                indexed = jurisprudence_index.search(keyword, match_all=True, min_score=JURISPRUDENCE_INDEX_MIN_SCORE)
+            if len(indexed) >= JURISPRUDENCE_INDEX_MIN_RESULTS:
+                logger.info(f"Jurisprudence servie par l'index local pour le mot-clé: {keyword}")
+                await jurisprudence_cache.set(keyword, indexed)
+                return indexed
+
         logger.info(f"Extraction pour le mot-clé: {keyword}")
-        # Use asyncio.to_thread to run the synchronous function in a separate thread
-        result = await asyncio.to_thread(beta_entscheidsuche_main, keyword)
+        result = None
+        if JURISPRUDENCE_BACKEND == "api":
+            try:
+                with upstream_call("entscheidsuche_api"), jurisprudence_search_seconds.time(source="api"):
+                    result = await resources.entscheidsuche.search(keyword)
+            except Exception as e:
+                logger.warning(f"Échec de l'API entscheidsuche pour {keyword}, repli sur le navigateur : {e}")
+        if result is None:
+            await rate_limiter.acquire("https://beta.entscheidsuche.ch/")
+            # Le navigateur partagé est utilisé directement sur la boucle d'événements de l'application
+            with upstream_call("entscheidsuche_browser"), jurisprudence_search_seconds.time(source="browser"):
+                result = await beta_entscheidsuche_search(resources.playwright, keyword)
         
         if result:
-            jurisprudence_cache[keyword] = result
+            added = jurisprudence_index.add(result)
+            jurisprudence_index.mark_fetched(keyword)
+            if added:
+                logger.info(f"{added} nouvelles décisions ajoutées à l'index local")
+            await jurisprudence_cache.set(keyword, result)
             return result
         else:
             logger.error(f"Aucun résultat trouvé pour le mot-clé: {keyword}")
@@ -260,72 +504,143 @@ async def fetch_jurisprudence(keyword: str) -> List[Dict[str, Any]]:
         logger.error(traceback.format_exc())
         return []
 
-async def process_question(question: str, keywords: List[str], websocket: Optional[WebSocket] = None) -> Dict[str, Any]:
+async def process_question(question: str, keywords: List[str], websocket: Optional[WebSocket] = None, client_id: str = "anonymous") -> Dict[str, Any]:
+    """
+    Traite une question : analyse GPT-4o, extraction des articles cités et recherche de jurisprudence.
+
+    Les étapes indépendantes s'exécutent en parallèle : la jurisprudence, qui ne dépend que des
+    mots-clés, démarre dès la réception de la question ; les articles démarrent dès que leur
+    citation est connue. Les résultats sont envoyés au WebSocket dans leur ordre d'arrivée, avec
+    la durée de chaque étape.
+
+    Args:
+        question (str): Question de l'utilisateur.
+        keywords (List[str]): Mots-clés de la recherche de jurisprudence.
+        websocket (Optional[WebSocket]): Client (ou RequestChannel) auquel transmettre les résultats au fil de l'eau.
+        client_id (str): Identifiant du client (file d'attente équitable des appels OpenAI).
+
+    Returns:
+        Dict[str, Any]: {assistantResponse, analysis, articles, jurisprudence, timings} ou {"error": message}.
+    """
+    started_at = time.perf_counter()
+    timings: Dict[str, float] = {}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if websocket:
+            await websocket.send_json(message)
+
+    async def stage_done(stage: str, stage_started_at: float, progress: str) -> None:
+        timings[stage] = round(time.perf_counter() - stage_started_at, 3)
+        logger.info(f"Étape {stage} terminée en {timings[stage]} s")
+        await send({"type": "progress", "data": progress})
+        await send({"type": "timing", "data": {"stage": stage, "seconds": timings[stage]}})
+
+    async def run_jurisprudence() -> List[Dict[str, Any]]:
+        stage_started_at = time.perf_counter()
+        async def send_results(results: List[Dict[str, Any]]) -> None:
+            for jurisprudence_item in results:
+                await send({"type": "jurisprudence", "data": jurisprudence_item})
+        jurisprudence = await extract_jurisprudence(keywords, on_results=send_results)
+        await stage_done("jurisprudence", stage_started_at, "Extraction de la jurisprudence terminée")
+        return jurisprudence
+
+    # La jurisprudence ne dépend pas de la réponse GPT-4o : elle démarre immédiatement
+    jurisprudence_task = asyncio.create_task(run_jurisprudence())
+    prefetched_articles: Dict[Tuple[str, str], asyncio.Task] = {}
     try:
         logger.info(f"Traitement de la question : {question}")
 
-        analysis_result = await analyser_contenu_gpt4(question)
-        if websocket:
-            await websocket.send_json({"type": "progress", "data": "Analyse GPT-4o terminée"})
+        # Les articles cités sont extraits dès que leur ligne est reçue, pendant la génération
+        articles_started_at = None
+        def prefetch_article(law_code: str, article_number: str) -> None:
+            nonlocal articles_started_at
+            articles_started_at = articles_started_at or time.perf_counter()
+            logger.info(f"Extraction anticipée de l'article {law_code} {article_number}")
+            prefetched_articles[(law_code, article_number)] = asyncio.create_task(extract_fedlex_article(law_code, article_number))
+        citation_parser = IncrementalArticleParser(normalize_law_code, prefetch_article)
+
+        on_delta = None
+        if GPT4_STREAMING:
+            async def on_delta(delta: str) -> None:
+                citation_parser.feed(delta)
+                if websocket:
+                    await websocket.send_json({"type": "assistantDelta", "data": delta})
+
+        gpt4_started_at = time.perf_counter()
+        analysis_result = await analyser_contenu_gpt4(question, on_delta=on_delta, client_id=client_id)
+        citation_parser.close()
+        await stage_done("gpt4", gpt4_started_at, "Analyse GPT-4o terminée")
 
         if "error" in analysis_result:
-            return {"error": analysis_result["error"]}
+            error_message = {"type": "error", "data": analysis_result["error"]}
+            if "retryAfter" in analysis_result:
+                error_message["retryAfter"] = analysis_result["retryAfter"]
+            await send(error_message)
+            return analysis_result
 
         if not analysis_result or "assistantResponse" not in analysis_result:
-            return {"error": "Erreur lors de l'analyse GPT-4o"}
+            error_message = "Erreur lors de l'analyse GPT-4o"
+            await send({"type": "error", "data": error_message})
+            return {"error": error_message}
 
-        parsed_result = parse_gpt4_response(analysis_result["assistantResponse"])
+        with gpt_parse_seconds.time():
+            parsed_result = parse_gpt4_response(analysis_result["assistantResponse"])
         logger.info(f"Résultat parsé: {pformat(parsed_result)}")
-        if websocket:
-            await websocket.send_json({"type": "progress", "data": "Analyse de la réponse terminée"})
-            await websocket.send_json({"type": "assistantResponse", "data": analysis_result["assistantResponse"]})
-            await websocket.send_json({"type": "analysis", "data": parsed_result})
+        await send({"type": "progress", "data": "Analyse de la réponse terminée"})
+        await send({"type": "assistantResponse", "data": analysis_result["assistantResponse"]})
+        await send({"type": "analysis", "data": parsed_result})
 
         articles_to_extract = [(article['law_code'], article['article_number']) for article in parsed_result.get('Articles de Loi', []) if 'error' not in article]
-        articles_tasks = [extract_fedlex_article(law_code, article_number) for law_code, article_number in articles_to_extract]
-        articles = await asyncio.gather(*articles_tasks, return_exceptions=True)
+        articles_started_at = articles_started_at or time.perf_counter()
 
+        async def run_article(law_code: str, article_number: str) -> List[Dict[str, Any]]:
+            article = await (prefetched_articles.get((law_code, article_number)) or extract_fedlex_article(law_code, article_number))
+            if article.get("success"):
+                members = article.get("articles", [])
+            else:
+                # Loi ou numéro non reconnu : la citation est signalée comme un article en échec
+                members = [{"law_code": law_code, "article_number": article_number, "success": False, "error": article.get("error", "Erreur inconnue")}]
+            formatted = [format_article(member) for member in members]
+            # Les articles en échec sont envoyés avec success=False et leur erreur, le client les signale sans les afficher
+            for formatted_article in formatted:
+                await send({"type": "article", "data": formatted_article})
+            return formatted
+
+        # Chaque article est envoyé dès son extraction ; la liste finale conserve l'ordre des citations
+        articles = await asyncio.gather(*(run_article(law_code, article_number) for law_code, article_number in articles_to_extract), return_exceptions=True)
         formatted_articles = []
         for article in articles:
-            if not isinstance(article, Exception) and 'articles' in article:
-                for art in article['articles']:
-                    formatted_article = {
-                        "law_code": art.get("law_code"),
-                        "article_number": art.get("article_number"),
-                        "title": art.get("title", "Sans titre"),
-                        "content": art.get("content", "Contenu non disponible")
-                    }
-                    formatted_articles.append(formatted_article)
-                    if websocket:
-                        await websocket.send_json({"type": "article", "data": formatted_article})
-
-        if websocket:
-            await websocket.send_json({"type": "progress", "data": "Extraction des articles terminée"})
+            if isinstance(article, Exception):
+                logger.error(f"Erreur lors de l'extraction d'un article : {str(article)}")
+            else:
+                formatted_articles.extend(article)
+        await stage_done("articles", articles_started_at, "Extraction des articles terminée")
 
-        jurisprudence = await extract_jurisprudence(keywords)
-        if websocket:
-            for jurisprudence_item in jurisprudence:
-                await websocket.send_json({"type": "jurisprudence", "data": jurisprudence_item})
-            await websocket.send_json({"type": "progress", "data": "Extraction de la jurisprudence terminée"})
+        jurisprudence = await jurisprudence_task
+        timings["total"] = round(time.perf_counter() - started_at, 3)
 
         result = {
             "assistantResponse": analysis_result["assistantResponse"],
             "analysis": parsed_result,
             "articles": formatted_articles,
-            "jurisprudence": jurisprudence
+            "jurisprudence": jurisprudence,
+            "timings": timings
         }
 
-        if websocket:
-            await websocket.send_json({"type": "complete", "data": "Traitement terminé"})
+        await send({"type": "complete", "data": "Traitement terminé"})
 
         return result
     except Exception as e:
         logger.error(f"Erreur inattendue lors du traitement de la question : {str(e)}")
         logger.error(traceback.format_exc())
         error_message = f"Erreur interne du serveur: {str(e)}"
-        if websocket:
-            await websocket.send_json({"type": "error", "data": error_message})
+        await send({"type": "error", "data": error_message})
         return {"error": error_message}
+    finally:
+        # En cas d'erreur ou d'annulation, les étapes encore en cours sont abandonnées
+        for task in (jurisprudence_task, *prefetched_articles.values()):
+            if not task.done():
+                task.cancel()
 
 # Routes FastAPI
 @app.post("/api/process")
@@ -341,12 +656,17 @@ async def process_request(request: Request) -> JSONResponse:
         if not keywords:
             raise HTTPException(status_code=400, detail="Mots-clés non fournis")
 
-        result = await process_question(question, keywords)
+        async with resources.in_flight():
+            result = await process_question(question, keywords, client_id=request.client.host if request.client else "anonymous")
 
+        if "retryAfter" in result:
+            raise HTTPException(status_code=429, detail=result["error"], headers={"Retry-After": str(math.ceil(result["retryAfter"]))})
         if "error" in result:
             raise HTTPException(status_code=500, detail=result["error"])
 
         return JSONResponse(content=result)
+    except ServiceDraining as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except HTTPException as he:
         raise he
     except Exception as e:
@@ -369,15 +689,10 @@ async def fetch_article(request: Request) -> JSONResponse:
         if not article_result["success"]:
             return JSONResponse(content={"error": article_result["error"]}, status_code=404)
 
-        formatted_articles = [
-            {
-                "law_code": art.get("law_code"),
-                "article_number": art.get("article_number"),
-                "title": art.get("title", "Sans titre"),
-                "content": art.get("content", "Contenu non disponible")
-            }
-            for art in article_result["articles"]
-        ]
+        formatted_articles = [format_article(art) for art in article_result["articles"]]
+        if not any(art["success"] for art in formatted_articles):
+            # Aucun article de la demande n'a pu être extrait
+            return JSONResponse(content={"error": formatted_articles[0]["error"] if formatted_articles else "Article introuvable", "articles": formatted_articles}, status_code=404)
 
         return JSONResponse(content={"success": True, "articles": formatted_articles})
     except Exception as e:
@@ -403,6 +718,89 @@ async def get_extracted_data() -> JSONResponse:
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/ready")
+async def readiness_check() -> JSONResponse:
+    # Le répartiteur de charge n'envoie du trafic qu'aux workers dont les pools sont chauds
+    readiness = resources.readiness()
+    return JSONResponse(content=readiness, status_code=200 if readiness["ready"] else 503)
+
+@app.get("/api/fedlex-references")
+async def get_fedlex_references() -> JSONResponse:
+    return JSONResponse(content=law_registry.links)
+
+@app.get("/api/cache-stats")
+async def get_cache_stats() -> JSONResponse:
+    stats = cache_stats()
+    for cache in (gpt4_cache, article_cache, jurisprudence_cache):
+        stats[cache.namespace] = cache.stats()
+    if semantic_cache is not None:
+        stats["semantic"] = semantic_cache.stats()
+    return JSONResponse(content=stats)
+
+def cache_request_samples() -> List[Tuple[Dict[str, str], float]]:
+    samples = []
+    for name, stats in cache_stats().items():
+        samples += [({"cache": name, "level": "l1", "result": "hit"}, stats["hits"]), ({"cache": name, "level": "l1", "result": "miss"}, stats["misses"])]
+    for cache in (gpt4_cache, article_cache, jurisprudence_cache):
+        stats = cache.stats()
+        samples += [({"cache": cache.namespace, "level": "l2", "result": "hit"}, stats["l2_hits"]), ({"cache": cache.namespace, "level": "l2", "result": "miss"}, stats["l2_misses"])]
+    if semantic_cache is not None:
+        stats = semantic_cache.stats()
+        samples += [({"cache": "semantic", "level": "semantic", "result": "hit"}, stats["hits"]), ({"cache": "semantic", "level": "semantic", "result": "miss"}, stats["misses"])]
+    return samples
+
+# Statistiques déjà tenues par les modules, lues à chaque export /metrics :
+# une famille par grandeur, compteurs cumulés en *_total, jauges avec leur unité
+STATS_METRICS = [
+    # (nom, type, description, source, clé, label)
+    ("lextutor_singleflight_executed_total", "counter", "Appels amont exécutés par singleflight, par groupe.", singleflight_stats, "executed", "group"),
+    ("lextutor_singleflight_coalesced_total", "counter", "Appels regroupés sur un appel déjà en cours, par groupe.", singleflight_stats, "coalesced", "group"),
+    ("lextutor_singleflight_failed_total", "counter", "Appels amont regroupés terminés en erreur, par groupe.", singleflight_stats, "failed", "group"),
+    ("lextutor_singleflight_abandoned_total", "counter", "Attentes abandonnées par leur appelant, par groupe.", singleflight_stats, "abandoned", "group"),
+    ("lextutor_singleflight_inflight", "gauge", "Appels amont en cours, par groupe.", singleflight_stats, "inflight", "group"),
+    ("lextutor_openai_admission_admitted_total", "counter", "Appels OpenAI admis.", openai_admission.stats, "admitted", None),
+    ("lextutor_openai_admission_rejected_total", "counter", "Appels OpenAI refusés par le contrôle d'admission.", openai_admission.stats, "rejected", None),
+    ("lextutor_openai_admission_in_flight", "gauge", "Appels OpenAI en cours.", openai_admission.stats, "in_flight", None),
+    ("lextutor_openai_admission_max_concurrency", "gauge", "Appels OpenAI simultanés autorisés.", openai_admission.stats, "max_concurrency", None),
+    ("lextutor_openai_admission_queue_depth", "gauge", "Appels OpenAI en attente d'admission.", openai_admission.stats, "queue_depth", None),
+    ("lextutor_openai_admission_max_queue", "gauge", "Appels OpenAI en attente autorisés.", openai_admission.stats, "max_queue", None),
+    ("lextutor_openai_admission_tokens_available", "gauge", "Jetons OpenAI disponibles dans le budget par minute.", openai_admission.stats, "tokens_available", None),
+    ("lextutor_openai_admission_tokens_per_minute", "gauge", "Budget de jetons OpenAI par minute.", openai_admission.stats, "tokens_per_minute", None),
+    ("lextutor_openai_admission_avg_wait_seconds", "gauge", "Attente moyenne avant admission, en secondes.", openai_admission.stats, "avg_wait", None),
+    ("lextutor_openai_admission_max_wait_seconds", "gauge", "Attente maximale avant admission, en secondes.", openai_admission.stats, "max_wait", None),
+    ("lextutor_openai_admission_avg_duration_seconds", "gauge", "Durée moyenne d'un appel OpenAI admis, en secondes.", openai_admission.stats, "avg_duration", None),
+    ("lextutor_websocket_outbox_messages_total", "counter", "Messages WebSocket mis en file.", outbox_totals, "messages", None),
+    ("lextutor_websocket_outbox_deduplicated_total", "counter", "Messages WebSocket écartés comme doublons.", outbox_totals, "deduplicated", None),
+    ("lextutor_websocket_outbox_frames_total", "counter", "Trames WebSocket envoyées.", outbox_totals, "frames", None),
+    ("lextutor_websocket_outbox_bytes_total", "counter", "Octets envoyés sur les WebSocket.", outbox_totals, "bytes", None),
+    ("lextutor_connections_broadcasts_total", "counter", "Diffusions du gestionnaire de connexions.", connection_manager.stats, "broadcasts", None),
+    ("lextutor_connections_delivered_total", "counter", "Messages diffusés remis aux clients.", connection_manager.stats, "delivered", None),
+    ("lextutor_connections_dropped_total", "counter", "Messages diffusés écartés (client trop lent).", connection_manager.stats, "dropped", None),
+    ("lextutor_connections_disconnected_total", "counter", "Clients trop lents déconnectés.", connection_manager.stats, "disconnected", None),
+    ("lextutor_connections_clients", "gauge", "Clients WebSocket connectés.", connection_manager.stats, "clients", None),
+    ("lextutor_connections_queued", "gauge", "Messages diffusés en attente d'envoi.", connection_manager.stats, "queued", None),
+]
+metrics.register_collector("lextutor_cache_requests_total", "counter", "Lectures de cache, par cache, niveau et résultat (hit/miss).", cache_request_samples)
+for name, kind, documentation, collect, key, label in STATS_METRICS:
+    metrics.register_stat(name, kind, documentation, collect, key, label)
+metrics.register_collector("lextutor_in_flight", "gauge", "Questions en cours de traitement.", lambda: [({}, resources.readiness()["in_flight"])])
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    return Response(content=metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+@app.get("/api/singleflight-stats")
+async def get_singleflight_stats() -> JSONResponse:
+    return JSONResponse(content=singleflight_stats())
+
+@app.get("/api/connections")
+async def get_connections() -> JSONResponse:
+    return JSONResponse(content=connection_manager.stats())
+
+@app.get("/api/rate-limits")
+async def get_rate_limits() -> JSONResponse:
+    return JSONResponse(content={**rate_limiter.stats(), "openai": openai_admission.stats()})
+
 @app.get("/")
 async def read_index():
     index_path = os.path.join(static_dir, 'index.html')
@@ -413,43 +811,103 @@ async def favicon():
     favicon_path = os.path.join(static_dir, 'favicon.ico')
     return FileResponse(favicon_path)
 
+class RequestChannel:
+    """
+    Canal d'envoi d'une question sur un WebSocket partagé : chaque message porte le requestId de la question
+    et passe par la file d'envoi (WebSocketOutbox) de la connexion.
+    """
+
+    def __init__(self, outbox: WebSocketOutbox, request_id: str):
+        self.outbox = outbox
+        self.request_id = request_id
+
+    async def send_json(self, message: Dict[str, Any]) -> None:
+        await self.outbox.send({**message, "requestId": self.request_id})
+
+async def run_websocket_question(channel: RequestChannel, question: str, keywords: List[str], client_id: str, slots: asyncio.Semaphore) -> None:
+    try:
+        async with resources.in_flight(), slots:
+            # process_question envoie lui-même chaque résultat, l'erreur éventuelle et « complete »
+            await process_question(question, keywords, websocket=channel, client_id=client_id)
+    except asyncio.CancelledError:
+        logger.info(f"Question {channel.request_id} annulée")
+        if channel.outbox.websocket.client_state == WebSocketState.CONNECTED:
+            try:
+                await channel.send_json({"type": "cancelled", "data": "Question annulée"})
+            except Exception as e:
+                logger.debug(f"Notification d'annulation non envoyée : {e}")
+        raise
+    except OutboxClosed:
+        # Le client est parti : il n'y a plus personne à qui signaler l'erreur
+        logger.info(f"Question {channel.request_id} abandonnée : connexion WebSocket fermée")
+    except Exception as e:
+        logger.error(f"Erreur lors du traitement de la question {channel.request_id}: {str(e)}")
+        try:
+            await channel.send_json({"type": "error", "data": str(e)})
+        except OutboxClosed:
+            logger.info(f"Erreur de la question {channel.request_id} non transmise : connexion WebSocket fermée")
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
+    """
+    Protocole multiplexé : chaque message client porte un requestId.
+
+    {"type": "question", "requestId", "question", "keywords"} lance une question dans sa propre tâche
+    (au plus WS_MAX_CONCURRENT_QUESTIONS simultanées par connexion) ; {"type": "cancel", "requestId"}
+    l'abandonne. Tous les messages envoyés pour une question portent son requestId.
+    """
     await websocket.accept()
-    websocket_clients.append(websocket)
+    client_id = f"ws-{id(websocket)}"
+    outbox = WebSocketOutbox(websocket)
+    connection_manager.register(client_id, outbox)
+    slots = asyncio.Semaphore(WS_MAX_CONCURRENT_QUESTIONS)
+    questions: Dict[str, asyncio.Task] = {}
     try:
         async for data in websocket.iter_json():
+            request_id = str(data.get("requestId") or f"{client_id}-{len(questions)}-{time.monotonic_ns()}")
+            channel = RequestChannel(outbox, request_id)
+
+            if data.get("type") == "cancel":
+                task = questions.get(request_id)
+                if task:
+                    task.cancel()
+                continue
+
             question = data.get("question", "")
             keywords = data.get("keywords", [])
             if not question:
-                await websocket.send_json({"type": "error", "data": "Question non fournie"})
+                await channel.send_json({"type": "error", "data": "Question non fournie"})
                 continue
 
             if not keywords:
-                await websocket.send_json({"type": "error", "data": "Mots-clés non fournis"})
+                await channel.send_json({"type": "error", "data": "Mots-clés non fournis"})
                 continue
 
-            try:
-                result = await process_question(question, keywords, websocket=websocket)
-                await websocket.send_json({"type": "assistantResponse", "data": result["assistantResponse"]})
-                await websocket.send_json({"type": "analysis", "data": result["analysis"]})
-                
-                for jurisprudence in result["jurisprudence"]:
-                    await websocket.send_json({"type": "jurisprudence", "data": jurisprudence})
-                
-                await websocket.send_json({"type": "complete", "data": "Traitement terminé"})
-            except Exception as e:
-                logger.error(f"Erreur lors du traitement de la question: {str(e)}")
-                await websocket.send_json({"type": "error", "data": str(e)})
+            if request_id in questions:
+                await channel.send_json({"type": "error", "data": "requestId déjà utilisé par une question en cours"})
+                continue
+
+            if len(questions) >= WS_MAX_PENDING_QUESTIONS:
+                await channel.send_json({"type": "error", "data": "Trop de questions en cours sur cette connexion"})
+                continue
+
+            task = asyncio.create_task(run_websocket_question(channel, question, keywords, client_id, slots))
+            questions[request_id] = task
+            task.add_done_callback(lambda _, request_id=request_id: questions.pop(request_id, None))
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected")
     except Exception as e:
         logger.error(f"Erreur WebSocket: {str(e)}")
         logger.error(traceback.format_exc())
     finally:
-        websocket_clients.remove(websocket)
+        # Les questions d'un client déconnecté ne sont plus traitées
+        for task in list(questions.values()):
+            task.cancel()
+        connection_manager.unregister(client_id)
+        await outbox.close()
 
 # Point d'entrée principal
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    # Vidange des questions en cours au signal d'arrêt, avant la fermeture des WebSocket
+    create_server(app, resources, host="0.0.0.0", port=8080).run()
 
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+Métriques de latence et compteurs du chemin critique, exportés au format texte Prometheus.
+
+Les histogrammes et compteurs sont thread-safe : l'extraction Selenium les
+alimente depuis les threads de ``asyncio.to_thread``. Les statistiques déjà
+tenues par les autres modules (caches, singleflight, admission OpenAI,
+connexions) sont lues au moment de l'export par des collecteurs enregistrés.
+"""
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+METRICS_SETTINGS = {
+    # Bornes des histogrammes, en secondes (de l'envoi WebSocket au chargement d'un acte Fedlex)
+    "buckets": tuple(float(bound) for bound in os.getenv(
+        "METRICS_BUCKETS", "0.001,0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10,30,60"
+    ).split(",")),
+}
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[Dict[str, str], float]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape_label_value(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels.items()) + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Labels attendus pour {self.name} : {self.labelnames}, reçus : {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """
+    Compteur monotone, par combinaison de labels.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        lines = self._header()
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(dict(zip(self.labelnames, key)))} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """
+    Histogramme de durées (secondes) à bornes fixes, par combinaison de labels.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Optional[Sequence[float]] = None):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets or METRICS_SETTINGS["buckets"]))
+        # Par combinaison de labels : effectifs par borne (non cumulés), somme, nombre
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            counts, totals = self._series.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0, 0.0]))
+            index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+            counts[index] += 1
+            totals[0] += value
+            totals[1] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """
+        Mesure la durée du bloc, y compris lorsqu'il lève une exception.
+        """
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started_at, **labels)
+
+    def count(self, **labels: Any) -> int:
+        with self._lock:
+            series = self._series.get(self._label_values(labels))
+            return int(series[1][1]) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = {key: (list(counts), list(totals)) for key, (counts, totals) in self._series.items()}
+        lines = self._header()
+        for key, (counts, (total, count)) in sorted(series.items()):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {int(count)}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Registre des métriques de l'application et des collecteurs lus à l'export.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Tuple[str, str, str, Callable[[], List[Sample]]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Métrique déjà enregistrée : {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Optional[Sequence[float]] = None) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, name: str, kind: str, documentation: str, collect: Callable[[], List[Sample]]) -> None:
+        """
+        Enregistre une métrique calculée à l'export à partir de statistiques existantes.
+
+        Args:
+            name (str): Nom de la métrique.
+            kind (str): "counter" ou "gauge".
+            documentation (str): Description (ligne HELP).
+            collect (Callable[[], List[Sample]]): Retourne les échantillons (labels, valeur).
+        """
+        with self._lock:
+            self._collectors.append((name, kind, documentation, collect))
+
+    def register_stat(self, name: str, kind: str, documentation: str, collect: Callable[[], Dict[str, Any]], key: str, label: Optional[str] = None) -> None:
+        """
+        Exporte une seule grandeur d'un dictionnaire de statistiques existant, dans sa propre famille.
+
+        Args:
+            name (str): Nom de la métrique (suffixe _total pour un compteur, unité dans le nom pour une jauge).
+            kind (str): "counter" ou "gauge".
+            documentation (str): Description (ligne HELP).
+            collect (Callable[[], Dict[str, Any]]): Retourne {clé: valeur}, ou {valeur du label: {clé: valeur}} si label est donné.
+            key (str): Clé de la grandeur exportée.
+            label (Optional[str]): Nom du label qui distingue les dictionnaires (ex. "group").
+        """
+        def samples() -> List[Sample]:
+            stats = collect()
+            if label is None:
+                return [({}, stats[key])]
+            return [({label: value}, group_stats[key]) for value, group_stats in stats.items()]
+
+        self.register_collector(name, kind, documentation, samples)
+
+    def render(self) -> str:
+        """
+        Export de toutes les métriques au format texte Prometheus (version 0.0.4).
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for name, kind, documentation, collect in collectors:
+            lines.extend([f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"])
+            for labels, value in collect():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+# Étapes du chemin critique d'une question
+gpt_call_seconds = metrics.histogram(
+    "lextutor_gpt_call_seconds", "Durée d'un appel GPT-4o, jusqu'au dernier fragment en streaming.", ["mode"]
+)
+gpt_parse_seconds = metrics.histogram(
+    "lextutor_gpt_parse_seconds", "Durée du découpage de la réponse GPT-4o en sections et articles cités."
+)
+fedlex_extraction_seconds = metrics.histogram(
+    "lextutor_fedlex_extraction_seconds",
+    "Durée d'une extraction Fedlex, au total et par étape (driver_acquire, page_load, wait, parse ; download et parse en HTTP).",
+    ["backend", "stage"],
+)
+jurisprudence_search_seconds = metrics.histogram(
+    "lextutor_jurisprudence_search_seconds", "Durée d'une recherche de jurisprudence pour un mot-clé.", ["source"]
+)
+websocket_send_seconds = metrics.histogram(
+    "lextutor_websocket_send_seconds", "Durée de l'envoi d'une trame WebSocket."
+)
+http_request_seconds = metrics.histogram(
+    "lextutor_http_request_seconds", "Durée de traitement d'une requête HTTP.", ["method", "route"]
+)
+upstream_errors_total = metrics.counter(
+    "lextutor_upstream_errors_total", "Erreurs des services amont (OpenAI, Fedlex, entscheidsuche).", ["upstream"]
+)
+
+
+@contextmanager
+def upstream_call(upstream: str) -> Iterator[None]:
+    """
+    Compte les exceptions levées par un appel à un service amont, puis les propage.
+    """
+    try:
+        yield
+    except Exception:
+        upstream_errors_total.inc(upstream=upstream)
+        raise
+
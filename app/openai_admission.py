@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+Contrôle d'admission des appels OpenAI.
+
+Limite le nombre d'appels simultanés et le débit de tokens par minute, avec une
+file d'attente équitable entre clients (tourniquet) et un rejet immédiat, avec
+délai de nouvel essai, lorsque la file est trop longue.
+"""
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+OPENAI_ADMISSION_SETTINGS = {
+    "max_concurrency": int(os.getenv("OPENAI_MAX_CONCURRENCY", "4")),
+    "tokens_per_minute": int(os.getenv("OPENAI_TOKENS_PER_MINUTE", "30000")),
+    "max_queue": int(os.getenv("OPENAI_MAX_QUEUE", "50")),
+    "chars_per_token": 4,  # Estimation grossière de la taille du prompt, sans tokenizer
+}
+
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    """
+    Estime le coût en tokens d'un appel : taille du prompt plus la réponse maximale.
+    """
+    prompt_chars = sum(len(message.get("content") or "") for message in messages)
+    return math.ceil(prompt_chars / OPENAI_ADMISSION_SETTINGS["chars_per_token"]) + max_tokens
+
+
+class AdmissionRejected(Exception):
+    """
+    Levée lorsque la file d'attente est pleine ; ``retry_after`` indique quand réessayer, en secondes.
+    """
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("tokens", "future", "enqueued_at")
+
+    def __init__(self, tokens: int, future: asyncio.Future):
+        self.tokens = tokens
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class AdmissionController:
+    """
+    Sémaphore de concurrence + budget de tokens par minute, avec files par client servies en tourniquet.
+
+    À utiliser depuis une seule boucle d'événements.
+    """
+
+    def __init__(self, max_concurrency: int, tokens_per_minute: int, max_queue: int):
+        """
+        Args:
+            max_concurrency (int): Nombre maximal d'appels simultanés.
+            tokens_per_minute (int): Budget de tokens (prompt + max_tokens) par minute.
+            max_queue (int): Nombre maximal d'appels en attente avant rejet.
+        """
+        self.max_concurrency = max_concurrency
+        self.tokens_per_minute = tokens_per_minute
+        self.max_queue = max_queue
+        self._tokens = float(tokens_per_minute)
+        self._refilled_at = time.monotonic()
+        self._in_flight = 0
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._queued = 0
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self._average_duration = 10.0
+        self._stats = {"admitted": 0, "rejected": 0, "total_wait": 0.0, "max_wait": 0.0}
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.tokens_per_minute, self._tokens + (now - self._refilled_at) * self.tokens_per_minute / 60)
+        self._refilled_at = now
+
+    def retry_after(self) -> float:
+        """
+        Estime le délai avant qu'un nouvel appel puisse être admis, en secondes.
+        """
+        rounds = (self._queued + self._in_flight) / self.max_concurrency
+        return max(1.0, round(rounds * self._average_duration, 1))
+
+    @asynccontextmanager
+    async def admit(self, client_id: str, tokens: int) -> AsyncIterator[None]:
+        """
+        Attend une place (concurrence et budget de tokens) pour un appel.
+
+        Args:
+            client_id (str): Identifiant du client (une file par client, servies à tour de rôle).
+            tokens (int): Coût estimé de l'appel (voir estimate_tokens).
+
+        Raises:
+            AdmissionRejected: Si la file d'attente est pleine.
+        """
+        tokens = min(tokens, self.tokens_per_minute)
+        waited = await self._acquire(client_id, tokens)
+        self._stats["admitted"] += 1
+        self._stats["total_wait"] += waited
+        self._stats["max_wait"] = max(self._stats["max_wait"], waited)
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self._average_duration = 0.8 * self._average_duration + 0.2 * (time.monotonic() - started_at)
+            self._release()
+
+    async def _acquire(self, client_id: str, tokens: int) -> float:
+        self._refill()
+        if not self._queued and self._in_flight < self.max_concurrency and self._tokens >= tokens:
+            self._tokens -= tokens
+            self._in_flight += 1
+            return 0.0
+        if self._queued >= self.max_queue:
+            self._stats["rejected"] += 1
+            retry_after = self.retry_after()
+            logger.warning(f"Appel OpenAI rejeté pour {client_id} : {self._queued} appels en attente")
+            raise AdmissionRejected(f"Service surchargé, veuillez réessayer dans {retry_after:.0f} s", retry_after)
+
+        waiter = _Waiter(tokens, asyncio.get_running_loop().create_future())
+        self._queues.setdefault(client_id, deque()).append(waiter)
+        self._queued += 1
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # La place a été attribuée au moment de l'annulation : elle est rendue
+                self._release()
+            else:
+                self._discard(client_id, waiter)
+            raise
+        return time.monotonic() - waiter.enqueued_at
+
+    def _discard(self, client_id: str, waiter: _Waiter) -> None:
+        queue = self._queues.get(client_id)
+        if queue and waiter in queue:
+            queue.remove(waiter)
+            self._queued -= 1
+            if not queue:
+                del self._queues[client_id]
+        self._dispatch()
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._queues and self._in_flight < self.max_concurrency:
+            client_id, queue = next(iter(self._queues.items()))
+            waiter = queue[0]
+            if waiter.future.done():
+                # Appelant annulé, pas encore retiré de sa file
+                queue.popleft()
+                self._queued -= 1
+                if not queue:
+                    del self._queues[client_id]
+                continue
+            self._refill()
+            if self._tokens < waiter.tokens:
+                self._schedule_wakeup((waiter.tokens - self._tokens) * 60 / self.tokens_per_minute)
+                return
+            queue.popleft()
+            self._queued -= 1
+            # Tourniquet : le client servi passe en fin de rotation
+            if queue:
+                self._queues.move_to_end(client_id)
+            else:
+                del self._queues[client_id]
+            self._tokens -= waiter.tokens
+            self._in_flight += 1
+            waiter.future.set_result(None)
+
+    def _schedule_wakeup(self, delay: float) -> None:
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def stats(self) -> Dict[str, Any]:
+        self._refill()
+        return {
+            "in_flight": self._in_flight,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self._queued,
+            "max_queue": self.max_queue,
+            "queue_depth_by_client": {client_id: len(queue) for client_id, queue in self._queues.items()},
+            "tokens_available": int(self._tokens),
+            "tokens_per_minute": self.tokens_per_minute,
+            "admitted": self._stats["admitted"],
+            "rejected": self._stats["rejected"],
+            "avg_wait": round(self._stats["total_wait"] / self._stats["admitted"], 3) if self._stats["admitted"] else 0.0,
+            "max_wait": round(self._stats["max_wait"], 3),
+            "avg_duration": round(self._average_duration, 3),
+        }
+
+
+openai_admission = AdmissionController(
+    OPENAI_ADMISSION_SETTINGS["max_concurrency"],
+    OPENAI_ADMISSION_SETTINGS["tokens_per_minute"],
+    OPENAI_ADMISSION_SETTINGS["max_queue"],
+)
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PLAYWRIGHT_SETTINGS = {
+    "pool_size": int(os.getenv("PLAYWRIGHT_CONTEXT_POOL_SIZE", "3")),
+    "context_max_uses": int(os.getenv("PLAYWRIGHT_CONTEXT_MAX_USES", "50")),
+    "acquire_timeout": float(os.getenv("PLAYWRIGHT_ACQUIRE_TIMEOUT", "60")),  # Attente maximale d'une page libre en secondes
+    "headless": True,
+    "locale": "fr-FR",
+}
+
+# Masquer les indicateurs d'automatisation
+STEALTH_INIT_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+"""
+
+
+class PlaywrightManager:
+    """
+    Navigateur Chromium unique pour tout le processus, avec un pool de contextes/pages.
+
+    Démarré une fois (idéalement dans le lifespan FastAPI) sur la boucle
+    d'événements de l'application ; chaque recherche emprunte une page
+    déjà ouverte au lieu de lancer Chromium.
+    """
+
+    def __init__(self, pool_size: Optional[int] = None, context_max_uses: Optional[int] = None, acquire_timeout: Optional[float] = None):
+        self._pool_size = pool_size or PLAYWRIGHT_SETTINGS["pool_size"]
+        self._context_max_uses = context_max_uses or PLAYWRIGHT_SETTINGS["context_max_uses"]
+        self._acquire_timeout = acquire_timeout or PLAYWRIGHT_SETTINGS["acquire_timeout"]
+        self._playwright = None
+        self._browser = None
+        self._pages: Optional[asyncio.Queue] = None
+        self._start_lock = asyncio.Lock()
+        self._stats = {"launches": 0, "contexts_created": 0, "contexts_recycled": 0, "checkouts": 0, "creation_failures": 0}
+
+    @property
+    def started(self) -> bool:
+        return self._browser is not None
+
+    async def start(self) -> None:
+        """
+        Lance Playwright et Chromium, puis prépare les contextes du pool.
+        """
+        async with self._start_lock:
+            if self._browser is not None:
+                return
+            # Import différé : Playwright n'est chargé qu'au démarrage du navigateur
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+            await self._launch_browser()
+            self._pages = asyncio.Queue()
+            for _ in range(self._pool_size):
+                self._pages.put_nowait(await self._new_entry())
+            logger.info(f"Playwright démarré : {self._pool_size} contextes prêts")
+
+    async def _launch_browser(self) -> None:
+        self._browser = await self._playwright.chromium.launch(headless=PLAYWRIGHT_SETTINGS["headless"])
+        self._stats["launches"] += 1
+
+    async def _new_entry(self) -> Tuple[Any, Any, int]:
+        if not self._browser.is_connected():
+            logger.warning("Chromium déconnecté, relance du navigateur")
+            await self._launch_browser()
+        context = await self._browser.new_context(locale=PLAYWRIGHT_SETTINGS["locale"])
+        try:
+            await context.add_init_script(STEALTH_INIT_SCRIPT)
+            page = await context.new_page()
+        except BaseException:
+            await self._close_context(context)
+            raise
+        self._stats["contexts_created"] += 1
+        return context, page, 0
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        """
+        Prête une page Playwright le temps du bloc ``async with``.
+
+        Le contexte est recyclé après ``context_max_uses`` utilisations ou si
+        une erreur laisse la page ou le navigateur hors service. Chaque emprunt
+        rend une place au pool, quelle que soit l'issue : si un contexte ne peut
+        pas être recréé, la place est rendue vide (None) et le prochain emprunt
+        retente la création.
+
+        Raises:
+            asyncio.TimeoutError: Si aucune page ne se libère dans le délai ``acquire_timeout``.
+        """
+        if self._browser is None:
+            await self.start()
+        entry = await asyncio.wait_for(self._pages.get(), timeout=self._acquire_timeout)
+        try:
+            if entry is None or entry[1].is_closed() or not self._browser.is_connected():
+                if entry is not None:
+                    await self._close_context(entry[0])
+                entry = await self._new_entry()
+        except BaseException:
+            # La place est rendue vide : le prochain emprunt retentera la création
+            self._stats["creation_failures"] += 1
+            self._pages.put_nowait(None)
+            raise
+        context, page, uses = entry
+        self._stats["checkouts"] += 1
+        failed = False
+        try:
+            yield page
+        except Exception:
+            failed = True
+            raise
+        finally:
+            uses += 1
+            if failed or uses >= self._context_max_uses or page.is_closed():
+                self._stats["contexts_recycled"] += 1
+                replacement = None
+                try:
+                    await self._close_context(context)
+                    replacement = await self._new_entry()
+                except Exception as e:
+                    logger.error(f"Impossible de recréer un contexte Playwright: {e}")
+                    self._stats["creation_failures"] += 1
+                finally:
+                    # Un contexte fermé n'est jamais rendu au pool
+                    self._pages.put_nowait(replacement)
+            else:
+                self._pages.put_nowait((context, page, uses))
+
+    @staticmethod
+    async def _close_context(context: Any) -> None:
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning(f"Erreur lors de la fermeture d'un contexte Playwright: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "started": self.started,
+            "pool_size": self._pool_size,
+            "idle": self._pages.qsize() if self._pages is not None else 0,
+        }
+
+    async def stop(self) -> None:
+        """
+        Ferme tous les contextes, le navigateur et Playwright.
+        """
+        async with self._start_lock:
+            if self._pages is not None:
+                while not self._pages.empty():
+                    entry = self._pages.get_nowait()
+                    if entry is not None:
+                        await self._close_context(entry[0])
+            if self._browser is not None:
+                await self._browser.close()
+            if self._playwright is not None:
+                await self._playwright.stop()
+            self._browser = None
+            self._playwright = None
+            self._pages = None
+
+
+playwright_manager = PlaywrightManager()
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Débit (requêtes/seconde) et rafale tolérés par chaque service amont
+UPSTREAM_RATE_LIMITS = {
+    "www.fedlex.admin.ch": {
+        "rate": float(os.getenv("FEDLEX_RATE_LIMIT", "1")),
+        "burst": int(os.getenv("FEDLEX_RATE_BURST", "2")),
+    },
+    "beta.entscheidsuche.ch": {
+        "rate": float(os.getenv("ENTSCHEIDSUCHE_RATE_LIMIT", "0.5")),
+        "burst": int(os.getenv("ENTSCHEIDSUCHE_RATE_BURST", "2")),
+    },
+    "entscheidsuche.ch": {
+        "rate": float(os.getenv("ENTSCHEIDSUCHE_API_RATE_LIMIT", "2")),
+        "burst": int(os.getenv("ENTSCHEIDSUCHE_API_RATE_BURST", "4")),
+    },
+}
+DEFAULT_RATE_LIMIT = {"rate": 1.0, "burst": 1}
+
+
+class AsyncTokenBucket:
+    """
+    Seau à jetons asynchrone : les appelants attendent sans bloquer de thread,
+    dans l'ordre d'arrivée.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate (float): Jetons régénérés par seconde.
+            burst (int): Nombre maximal de jetons accumulés.
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("Le débit doit être positif et la rafale au moins 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._waiting = 0
+        self._acquired = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """
+        Attend qu'un jeton soit disponible et le consomme.
+
+        Returns:
+            float: Temps d'attente en secondes.
+        """
+        start = time.monotonic()
+        self._waiting += 1
+        try:
+            # asyncio.Lock sert les attentes dans l'ordre d'arrivée
+            async with self._lock:
+                self._refill()
+                while self._tokens < 1:
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+                    self._refill()
+                self._tokens -= 1
+        finally:
+            self._waiting -= 1
+        waited = time.monotonic() - start
+        self._acquired += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        return waited
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "queue_depth": self._waiting,
+            "acquired": self._acquired,
+            "total_wait_seconds": round(self._total_wait, 3),
+            "avg_wait_seconds": round(self._total_wait / self._acquired, 3) if self._acquired else 0.0,
+            "max_wait_seconds": round(self._max_wait, 3),
+        }
+
+
+class HostRateLimiter:
+    """
+    Registre de seaux à jetons, un par hôte amont.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, Any]]] = None, default: Optional[Dict[str, Any]] = None):
+        self._limits = limits if limits is not None else UPSTREAM_RATE_LIMITS
+        self._default = default or DEFAULT_RATE_LIMIT
+        self._buckets: Dict[str, AsyncTokenBucket] = {}
+
+    @staticmethod
+    def host_of(url_or_host: str) -> str:
+        if "://" in url_or_host:
+            return urlparse(url_or_host).hostname or url_or_host
+        return url_or_host
+
+    def bucket(self, url_or_host: str) -> AsyncTokenBucket:
+        host = self.host_of(url_or_host)
+        if host not in self._buckets:
+            limit = self._limits.get(host, self._default)
+            self._buckets[host] = AsyncTokenBucket(limit["rate"], limit["burst"])
+        return self._buckets[host]
+
+    async def acquire(self, url_or_host: str) -> float:
+        """
+        Attend l'autorisation d'émettre une requête vers l'hôte donné.
+
+        Args:
+            url_or_host (str): URL complète ou nom d'hôte.
+
+        Returns:
+            float: Temps d'attente en secondes.
+        """
+        waited = await self.bucket(url_or_host).acquire()
+        if waited > 0.01:
+            logger.info(f"Limitation de débit pour {self.host_of(url_or_host)} : {waited:.2f}s d'attente")
+        return waited
+
+    def blocking_acquirer(self, url_or_host: str, loop: asyncio.AbstractEventLoop) -> Callable[[], float]:
+        """
+        Fonction bloquante, à appeler depuis un thread, qui attend un jeton sur la boucle d'événements donnée.
+
+        Les extractions Selenium tournent dans des threads (asyncio.to_thread) : chaque
+        chargement de page y appelle cette fonction et partage ainsi le seau de l'hôte
+        avec les requêtes asynchrones.
+
+        Args:
+            url_or_host (str): URL complète ou nom d'hôte.
+            loop (asyncio.AbstractEventLoop): Boucle de l'application, qui exécute self.acquire.
+        """
+        def acquire_blocking() -> float:
+            return asyncio.run_coroutine_threadsafe(self.acquire(url_or_host), loop).result()
+
+        return acquire_blocking
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {host: bucket.stats() for host, bucket in self._buckets.items()}
+
+
+rate_limiter = HostRateLimiter()
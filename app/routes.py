@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 import logging
-import time
 import asyncio
 from typing import Any, Dict, List, Optional
 
@@ -54,14 +53,7 @@ class JurisprudenceResponse(BaseModel):
     title: str
     content: str
 
-# Middleware pour ajouter le temps de traitement aux en-têtes de réponse
-@router.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+# L'en-tête X-Process-Time est ajouté par le middleware de l'application (main.py)
 
 # Instance de sécurité OAuth2 pour l'authentification
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
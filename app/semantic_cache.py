@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+Cache sémantique des réponses GPT-4o.
+
+Chaque question est représentée par un vecteur d'embedding normalisé, stocké
+dans une matrice NumPy contiguë. Une question dont la similarité cosinus avec
+une question déjà traitée dépasse le seuil configuré est servie depuis le cache.
+"""
+import inspect
+import json
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+EmbedFunction = Callable[[str], Union[Sequence[float], Awaitable[Sequence[float]]]]
+
+
+class SemanticCache:
+    """
+    Cache par similarité de questions, avec éviction LRU, expiration TTL et persistance sur disque.
+    """
+
+    def __init__(
+        self,
+        embed: EmbedFunction,
+        dim: int,
+        threshold: float = 0.93,
+        max_entries: int = 1000,
+        ttl: Optional[float] = None,
+        path: Optional[str] = None,
+        model: str = "",
+    ):
+        """
+        Args:
+            embed (EmbedFunction): Fonction (synchrone ou coroutine) qui renvoie le vecteur d'une question.
+            dim (int): Dimension des vecteurs renvoyés par ``embed``.
+            threshold (float): Similarité cosinus minimale pour servir une réponse du cache.
+            max_entries (int): Nombre maximal de questions conservées.
+            ttl (Optional[float]): Durée de vie des entrées en secondes (pas d'expiration si None).
+            path (Optional[str]): Fichier .npz de persistance (aucune persistance si None).
+            model (str): Modèle d'embedding, qui distingue les vecteurs dans le cache nommé "embeddings".
+        """
+        self._embed = embed
+        self.dim = dim
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.model = model
+        self._vectors = np.zeros((max_entries, dim), dtype=np.float32)
+        self._valid = np.zeros(max_entries, dtype=bool)
+        self._created = np.zeros(max_entries, dtype=np.float64)
+        self._last_used = np.zeros(max_entries, dtype=np.float64)
+        self._questions: List[Optional[str]] = [None] * max_entries
+        self._values: List[Any] = [None] * max_entries
+        self._slots: Dict[str, int] = {}
+        # Cache nommé : limites surchargeables (CACHE_EMBEDDINGS_*) et statistiques dans cache_stats()
+        self._embeddings = get_cache("embeddings", max_entries=max_entries, ttl=ttl)
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "embedding_errors": 0}
+        if path and os.path.exists(path):
+            self.load()
+
+    async def embed(self, question: str) -> np.ndarray:
+        """
+        Calcule (ou relit) le vecteur normalisé d'une question.
+
+        Raises:
+            ValueError: Si le vecteur n'a pas la dimension attendue.
+        """
+        # Le cache nommé est partagé : le modèle et la dimension distinguent les vecteurs
+        key = (self.model, self.dim, question.strip().lower())
+        vector = self._embeddings.get(key)
+        if vector is not None:
+            return vector
+        raw = self._embed(question)
+        if inspect.isawaitable(raw):
+            raw = await raw
+        vector = np.asarray(raw, dtype=np.float32)
+        if vector.shape != (self.dim,):
+            raise ValueError(f"Vecteur de dimension {vector.shape} au lieu de ({self.dim},)")
+        norm = np.linalg.norm(vector)
+        vector = vector / norm if norm else vector
+        self._embeddings.set(key, vector)
+        return vector
+
+    def search(self, vector: np.ndarray) -> Optional[Tuple[int, float]]:
+        """
+        Recherche l'entrée valide la plus proche d'un vecteur normalisé.
+
+        Returns:
+            Optional[Tuple[int, float]]: (emplacement, similarité) si le seuil est atteint, sinon None.
+        """
+        if self.ttl:
+            expired = self._valid & (self._created + self.ttl <= time.time())
+            if expired.any():
+                for slot in np.flatnonzero(expired):
+                    self._remove(int(slot))
+                    self._stats["expirations"] += 1
+        # Produit limité aux emplacements occupés : la recherche s'exécute sur la boucle d'événements
+        slots = np.flatnonzero(self._valid)
+        if not slots.size:
+            return None
+        similarities = self._vectors[slots] @ vector
+        best = int(np.argmax(similarities))
+        similarity = float(similarities[best])
+        return (int(slots[best]), similarity) if similarity >= self.threshold else None
+
+    async def get(self, question: str) -> Any:
+        """
+        Retourne la réponse d'une question suffisamment proche, ou None.
+        """
+        try:
+            vector = await self.embed(question)
+        except Exception as e:
+            self._stats["embedding_errors"] += 1
+            logger.warning(f"Embedding indisponible, cache sémantique ignoré : {e}")
+            return None
+        match = self.search(vector)
+        if match is None:
+            self._stats["misses"] += 1
+            return None
+        slot, similarity = match
+        self._stats["hits"] += 1
+        self._last_used[slot] = time.time()
+        logger.info(f"Cache sémantique : question servie par « {self._questions[slot]} » (similarité {similarity:.3f})")
+        return self._values[slot]
+
+    async def set(self, question: str, value: Any) -> None:
+        """
+        Enregistre la réponse d'une question (remplace l'entrée de la même question).
+        """
+        try:
+            vector = await self.embed(question)
+        except Exception as e:
+            self._stats["embedding_errors"] += 1
+            logger.warning(f"Embedding indisponible, réponse non ajoutée au cache sémantique : {e}")
+            return
+        self._store(question.strip().lower(), vector, value, time.time())
+
+    def _store(self, question: str, vector: np.ndarray, value: Any, created: float) -> None:
+        slot = self._slots.get(question)
+        if slot is None:
+            free = np.flatnonzero(~self._valid)
+            if free.size:
+                slot = int(free[0])
+            else:
+                # Éviction de la question utilisée le moins récemment
+                slot = int(np.argmin(self._last_used))
+                self._remove(slot)
+                self._stats["evictions"] += 1
+        self._vectors[slot] = vector
+        self._valid[slot] = True
+        self._created[slot] = created
+        self._last_used[slot] = time.time()
+        self._questions[slot] = question
+        self._values[slot] = value
+        self._slots[question] = slot
+
+    def _remove(self, slot: int) -> None:
+        self._slots.pop(self._questions[slot], None)
+        self._valid[slot] = False
+        self._questions[slot] = None
+        self._values[slot] = None
+
+    def __len__(self) -> int:
+        return int(self._valid.sum())
+
+    def save(self) -> None:
+        """
+        Écrit les entrées valides dans le fichier de persistance (remplacement atomique).
+        """
+        if not self.path:
+            return
+        slots = np.flatnonzero(self._valid)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                vectors=self._vectors[slots],
+                model=np.array(self.model),
+                created=self._created[slots],
+                questions=np.array(json.dumps([self._questions[slot] for slot in slots], ensure_ascii=False)),
+                values=np.array(json.dumps([self._values[slot] for slot in slots], ensure_ascii=False)),
+            )
+        os.replace(tmp_path, self.path)
+        logger.info(f"Cache sémantique sauvegardé : {len(slots)} questions")
+
+    def load(self) -> None:
+        """
+        Recharge les entrées du fichier de persistance.
+
+        Le fichier est ignoré si ses vecteurs viennent d'un autre modèle d'embedding (ou d'un
+        modèle inconnu) ou ont une autre dimension : leurs similarités n'auraient aucun sens.
+        """
+        with np.load(self.path, allow_pickle=False) as data:
+            saved_model = str(data["model"]) if "model" in data.files else None
+            if saved_model != self.model:
+                logger.warning(f"Cache sémantique {self.path} ignoré : modèle {saved_model!r} au lieu de {self.model!r}")
+                return
+            vectors = data["vectors"]
+            if vectors.size and vectors.shape[1] != self.dim:
+                logger.warning(f"Cache sémantique {self.path} ignoré : dimension {vectors.shape[1]} au lieu de {self.dim}")
+                return
+            questions = json.loads(str(data["questions"]))
+            values = json.loads(str(data["values"]))
+            created = data["created"]
+        # Les entrées les plus récentes sont conservées si le fichier dépasse la capacité
+        order = np.argsort(created)[-self.max_entries:]
+        for index in order:
+            self._store(questions[index], vectors[index], values[index], float(created[index]))
+        logger.info(f"Cache sémantique chargé : {len(self)} questions")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "dim": self.dim,
+            "threshold": self.threshold,
+            "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Cache à deux niveaux partagé entre workers.
+
+L1 : BoundedTTLCache en mémoire du processus (cache.py).
+L2 : backend partagé interchangeable (Redis, ou SQLite sur disque pour un
+     hôte unique et pour les tests), sérialisé avec orjson, TTL par espace de noms.
+"""
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+import orjson
+
+from cache import BoundedTTLCache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "lextutor"
+
+
+class SharedCacheBackend(ABC):
+    """
+    Interface d'un backend de cache partagé (niveau L2).
+    """
+
+    name = "abstract"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+
+class RedisCacheBackend(SharedCacheBackend):
+    """
+    Backend Redis (redis.asyncio), partagé par tous les workers du cluster.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        from redis import asyncio as redis_asyncio
+
+        self._client = redis_asyncio.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        await self._client.set(key, value, px=int(ttl * 1000) if ttl else None)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(key)
+
+    async def aclose(self) -> None:
+        await self._client.close()
+
+
+class SQLiteCacheBackend(SharedCacheBackend):
+    """
+    Backend SQLite sur disque (mode WAL), partagé par les workers d'un même hôte.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+        )
+
+    def _get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._connection.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                self._connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+            return value
+
+    def _set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl if ttl else None),
+            )
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    async def aclose(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def create_backend(url: Optional[str]) -> Optional[SharedCacheBackend]:
+    """
+    Construit le backend L2 à partir de son URL.
+
+    Args:
+        url (Optional[str]): "redis://hôte:port/db", "sqlite:///chemin/vers/cache.db", ou vide pour aucun L2.
+
+    Returns:
+        Optional[SharedCacheBackend]: Le backend, ou None si aucun n'est configuré.
+    """
+    if not url:
+        return None
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisCacheBackend(url)
+    if url.startswith("sqlite:///"):
+        return SQLiteCacheBackend(url[len("sqlite:///"):])
+    raise ValueError(f"Backend de cache partagé non supporté: {url}")
+
+
+class TwoLevelCache:
+    """
+    Cache L1 (processus) + L2 (partagé) pour un espace de noms.
+
+    Une erreur du backend L2 n'interrompt jamais le traitement : le cache
+    se replie sur le seul niveau L1.
+    """
+
+    def __init__(self, namespace: str, l1: BoundedTTLCache, backend: Optional[SharedCacheBackend] = None, ttl: Optional[float] = None):
+        """
+        Args:
+            namespace (str): Espace de noms des clés (ex. "gpt4", "article").
+            l1 (BoundedTTLCache): Cache local du processus.
+            backend (Optional[SharedCacheBackend]): Backend partagé (aucun L2 si None).
+            ttl (Optional[float]): Durée de vie des entrées L2, en secondes (par défaut, celle du L1).
+        """
+        self.namespace = namespace
+        self.l1 = l1
+        self.backend = backend
+        self.ttl = ttl if ttl is not None else l1.ttl
+        self._stats = {"l2_hits": 0, "l2_misses": 0, "l2_errors": 0}
+
+    def _l2_key(self, key: str) -> str:
+        return f"{KEY_PREFIX}:{self.namespace}:{hashlib.sha256(key.encode('utf-8')).hexdigest()}"
+
+    async def get(self, key: str) -> Any:
+        value = self.l1.get(key)
+        if value is not None or self.backend is None:
+            return value
+        try:
+            payload = await self.backend.get(self._l2_key(key))
+        except Exception as e:
+            self._stats["l2_errors"] += 1
+            logger.warning(f"Cache partagé {self.namespace} indisponible en lecture: {e}")
+            return None
+        if payload is None:
+            self._stats["l2_misses"] += 1
+            return None
+        self._stats["l2_hits"] += 1
+        value = orjson.loads(payload)
+        self.l1.set(key, value)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        self.l1.set(key, value)
+        if self.backend is None:
+            return
+        try:
+            await self.backend.set(self._l2_key(key), orjson.dumps(value), self.ttl)
+        except Exception as e:
+            self._stats["l2_errors"] += 1
+            logger.warning(f"Cache partagé {self.namespace} indisponible en écriture: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.l1.stats(),
+            **self._stats,
+            "backend": self.backend.name if self.backend else None,
+        }
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Regroupe les appels concurrents portant sur la même clé.
+
+    Le premier appelant lance le travail ; les appelants suivants attendent
+    le même résultat. Le travail s'exécute dans sa propre tâche : l'annulation
+    d'un appelant n'interrompt pas les autres, mais le travail est annulé
+    lorsque tous ses appelants l'ont été. Rien n'est conservé une fois la
+    tâche terminée, les échecs sont donc propagés sans être mis en cache.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self._stats = {"executed": 0, "coalesced": 0, "failed": 0, "abandoned": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Exécute ``fn`` pour ``key``, ou attend l'exécution déjà en cours.
+
+        Args:
+            key (Hashable): Clé identifiant le travail.
+            fn (Callable[[], Awaitable[T]]): Fabrique de la coroutine à exécuter.
+
+        Returns:
+            T: Résultat de ``fn``.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+            self._stats["executed"] += 1
+        else:
+            self._stats["coalesced"] += 1
+            logger.info(f"Appel {self.name} regroupé avec l'exécution en cours pour {key!r}")
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[key] == 1 and not task.done():
+                # Plus aucun appelant n'attend ce résultat
+                task.cancel()
+                self._stats["abandoned"] += 1
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self._stats["failed"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "inflight": len(self._inflight)}
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def get_singleflight(name: str) -> SingleFlight:
+    """
+    Retourne le groupe single-flight nommé, créé au premier appel.
+    """
+    if name not in _groups:
+        _groups[name] = SingleFlight(name)
+    return _groups[name]
+
+
+def singleflight_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: group.stats() for name, group in _groups.items()}
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import logging
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Hashable, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+DeltaListener = Callable[[str], Awaitable[None]]
+
+
+class StreamListeners:
+    """
+    Abonnés aux fragments d'une réponse en streaming, par clé de question.
+
+    Le flux prend la liste des abonnés au premier fragment (les abonnés arrivés
+    ensuite ne reçoivent que la réponse complète) ; un abonné qui se désabonne,
+    y compris par annulation, est retiré de cette même liste et ne reçoit plus
+    aucun fragment.
+    """
+
+    def __init__(self):
+        self._listeners: Dict[Hashable, List[DeltaListener]] = {}
+
+    @contextmanager
+    def subscribe(self, key: Hashable, listener: DeltaListener) -> Iterator[None]:
+        """
+        Abonne ``listener`` aux fragments de ``key`` le temps du bloc ``with``.
+        """
+        listeners = self._listeners.setdefault(key, [])
+        listeners.append(listener)
+        try:
+            yield
+        finally:
+            # La liste capturée, éventuellement déjà prise par le flux
+            if listener in listeners:
+                listeners.remove(listener)
+            if not listeners and self._listeners.get(key) is listeners:
+                del self._listeners[key]
+
+    def take(self, key: Hashable) -> List[DeltaListener]:
+        """
+        Retire et retourne la liste des abonnés de ``key`` (la liste reste partagée avec subscribe).
+        """
+        return self._listeners.pop(key, [])
+
+    @staticmethod
+    async def publish(listeners: List[DeltaListener], delta: str) -> None:
+        """
+        Transmet un fragment à chaque abonné encore présent ; un abonné en erreur est retiré.
+        """
+        for listener in list(listeners):
+            if listener not in listeners:
+                continue
+            try:
+                await listener(delta)
+            except Exception as e:
+                logger.warning(f"Abonné au flux GPT-4o retiré après une erreur d'envoi : {e}")
+                if listener in listeners:
+                    listeners.remove(listener)
+
+    def __len__(self) -> int:
+        return len(self._listeners)
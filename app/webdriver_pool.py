@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class WebDriverPool:
+    """
+    Pool borné de sessions WebDriver réutilisables.
+
+    Les sessions sont créées à la demande (ou à l'avance via ``warm``), prêtées
+    à un seul appelant à la fois, vérifiées avant chaque prêt et recyclées
+    après ``max_uses`` utilisations ou dès qu'elles ne répondent plus.
+    Le pool est thread-safe : il est utilisé depuis les threads de
+    ``asyncio.to_thread``.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        size: int = 2,
+        max_uses: int = 50,
+        acquire_timeout: float = 120,
+    ):
+        """
+        Args:
+            factory (Callable[[], Any]): Fonction créant une nouvelle session WebDriver.
+            size (int): Nombre maximal de sessions ouvertes simultanément.
+            max_uses (int): Nombre de prêts après lequel une session est recyclée.
+            acquire_timeout (float): Délai maximal d'attente d'une session libre, en secondes.
+        """
+        if size < 1:
+            raise ValueError("La taille du pool doit être au moins 1")
+        self._factory = factory
+        self._size = size
+        self._max_uses = max_uses
+        self._acquire_timeout = acquire_timeout
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle: List[Tuple[Any, int]] = []
+        # Emprunts en cours (depuis l'obtention d'une place) et sessions en cours de préchauffage
+        self._borrowed = 0
+        self._warming = 0
+        self._closed = False
+        self._stats = {"created": 0, "recycled": 0, "discarded": 0, "checkouts": 0}
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def warm(self, count: Optional[int] = None) -> int:
+        """
+        Ouvre des sessions à l'avance pour éviter le démarrage à froid de Chrome.
+
+        Les sessions prêtées comptent dans l'objectif : chaque session est créée sur une
+        place réservée du pool, qui n'ouvre jamais plus de ``size`` sessions.
+
+        Args:
+            count (Optional[int]): Nombre de sessions à préparer (par défaut, la taille du pool).
+
+        Returns:
+            int: Nombre de sessions inactives prêtes.
+        """
+        target = min(count or self._size, self._size)
+        for _ in range(target):
+            if not self._slots.acquire(blocking=False):
+                break
+            try:
+                with self._lock:
+                    if self._closed or len(self._idle) + self._borrowed + self._warming >= target:
+                        break
+                    self._warming += 1
+                try:
+                    driver = self._create()
+                except Exception as e:
+                    with self._lock:
+                        self._warming -= 1
+                    logger.error(f"Impossible de préchauffer une session WebDriver: {e}")
+                    break
+                with self._lock:
+                    self._warming -= 1
+                    self._idle.append((driver, 0))
+            finally:
+                self._slots.release()
+        with self._lock:
+            return len(self._idle)
+
+    @contextmanager
+    def driver(self) -> Iterator[Any]:
+        """
+        Prête une session WebDriver le temps du bloc ``with``.
+
+        Yields:
+            Any: Session WebDriver saine et prête à l'emploi.
+
+        Raises:
+            TimeoutError: Si aucune session ne se libère dans le délai imparti.
+            RuntimeError: Si le pool a été fermé.
+        """
+        if self._closed:
+            raise RuntimeError("Le pool WebDriver est fermé")
+        if not self._slots.acquire(timeout=self._acquire_timeout):
+            raise TimeoutError("Aucune session WebDriver disponible dans le délai imparti")
+        with self._lock:
+            self._borrowed += 1
+        driver = None
+        uses = 0
+        failed = False
+        try:
+            driver, uses = self._checkout()
+            yield driver
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if driver is not None:
+                self._checkin(driver, uses + 1, failed)
+            with self._lock:
+                self._borrowed -= 1
+            self._slots.release()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._stats,
+                "size": self._size,
+                "idle": len(self._idle),
+                "borrowed": self._borrowed,
+            }
+
+    def close(self) -> None:
+        """Ferme toutes les sessions inactives ; les sessions prêtées sont fermées à leur retour."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for driver, _ in idle:
+            self._quit(driver)
+
+    def _create(self) -> Any:
+        start = time.perf_counter()
+        driver = self._factory()
+        with self._lock:
+            self._stats["created"] += 1
+        logger.info(f"Nouvelle session WebDriver créée en {time.perf_counter() - start:.2f}s")
+        return driver
+
+    def _checkout(self) -> Tuple[Any, int]:
+        while True:
+            with self._lock:
+                entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                driver = self._create()
+                with self._lock:
+                    self._stats["checkouts"] += 1
+                return driver, 0
+            driver, uses = entry
+            if self._is_healthy(driver):
+                with self._lock:
+                    self._stats["checkouts"] += 1
+                return driver, uses
+            logger.warning("Session WebDriver inactive hors service, remplacement")
+            self._discard(driver)
+
+    def _checkin(self, driver: Any, uses: int, failed: bool) -> None:
+        if failed and not self._is_healthy(driver):
+            logger.warning("Session WebDriver défaillante après usage, remplacement")
+            self._discard(driver)
+            return
+        if uses >= self._max_uses:
+            with self._lock:
+                self._stats["recycled"] += 1
+            self._quit(driver)
+            return
+        with self._lock:
+            if not self._closed:
+                self._idle.append((driver, uses))
+                return
+        self._quit(driver)
+
+    def _discard(self, driver: Any) -> None:
+        with self._lock:
+            self._stats["discarded"] += 1
+        self._quit(driver)
+
+    @staticmethod
+    def _is_healthy(driver: Any) -> bool:
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(driver: Any) -> None:
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Erreur lors de la fermeture d'une session WebDriver: {e}")
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+File d'envoi par connexion WebSocket.
+
+Les messages sont sérialisés avec orjson, dédupliqués par identité (même
+question, même type, même contenu) et regroupés dans des trames
+{"type": "batch", "data": [...]} pendant une courte fenêtre d'envoi.
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional, Set
+
+import orjson
+from fastapi import WebSocket
+
+from metrics import websocket_send_seconds
+
+logger = logging.getLogger(__name__)
+
+WS_OUTBOX_SETTINGS = {
+    "flush_interval": float(os.getenv("WS_FLUSH_INTERVAL_MS", "20")) / 1000,
+    "max_batch_messages": int(os.getenv("WS_MAX_BATCH_MESSAGES", "100")),
+    "max_batch_bytes": int(os.getenv("WS_MAX_BATCH_BYTES", str(64 * 1024))),
+}
+
+# Types de messages envoyés une seule fois par question ; les fragments et la progression ne sont pas dédupliqués
+DEDUPLICATED_TYPES = {"assistantResponse", "analysis", "article", "jurisprudence"}
+# Types qui terminent une question : ses identités de messages sont oubliées (le client ignore les messages
+# d'une question terminée)
+TERMINAL_TYPES = {"complete", "error", "cancelled"}
+
+_totals = {"messages": 0, "deduplicated": 0, "frames": 0, "bytes": 0}
+
+
+class OutboxClosed(Exception):
+    """
+    Levée lors d'un envoi sur une connexion fermée.
+    """
+
+
+class WebSocketOutbox:
+    """
+    File d'envoi d'une connexion : déduplication, regroupement et sérialisation orjson.
+    """
+
+    def __init__(self, websocket: WebSocket, flush_interval: Optional[float] = None, max_batch_messages: Optional[int] = None, max_batch_bytes: Optional[int] = None):
+        """
+        Args:
+            websocket (WebSocket): Connexion acceptée.
+            flush_interval (Optional[float]): Fenêtre de regroupement, en secondes.
+            max_batch_messages (Optional[int]): Nombre de messages qui déclenche un envoi immédiat.
+            max_batch_bytes (Optional[int]): Taille cumulée qui déclenche un envoi immédiat.
+        """
+        self.websocket = websocket
+        self.flush_interval = WS_OUTBOX_SETTINGS["flush_interval"] if flush_interval is None else flush_interval
+        self.max_batch_messages = max_batch_messages or WS_OUTBOX_SETTINGS["max_batch_messages"]
+        self.max_batch_bytes = max_batch_bytes or WS_OUTBOX_SETTINGS["max_batch_bytes"]
+        self._pending: List[bytes] = []
+        self._pending_bytes = 0
+        self._seen: Dict[Any, Set[int]] = {}
+        self._lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        self._closed = False
+        self._stats = {"messages": 0, "deduplicated": 0, "frames": 0, "bytes": 0}
+
+    def _count(self, name: str, value: int = 1) -> None:
+        self._stats[name] += value
+        _totals[name] += value
+
+    def _is_duplicate(self, message: Dict[str, Any]) -> bool:
+        message_type = message.get("type")
+        request_id = message.get("requestId")
+        if message_type not in DEDUPLICATED_TYPES:
+            if message_type in TERMINAL_TYPES:
+                self._seen.pop(request_id, None)
+            return False
+        identity = hash((message_type, orjson.dumps(message.get("data"), option=orjson.OPT_SORT_KEYS)))
+        seen = self._seen.setdefault(request_id, set())
+        if identity in seen:
+            return True
+        seen.add(identity)
+        return False
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        """
+        Ajoute un message à la file ; il est envoyé au plus tard après la fenêtre de regroupement.
+
+        Raises:
+            OutboxClosed: Si la connexion est fermée.
+        """
+        if self._closed:
+            raise OutboxClosed("Connexion WebSocket fermée")
+        if self._is_duplicate(message):
+            self._count("deduplicated")
+            return
+        payload = orjson.dumps(message)
+        self._pending.append(payload)
+        self._pending_bytes += len(payload)
+        self._count("messages")
+        if len(self._pending) >= self.max_batch_messages or self._pending_bytes >= self.max_batch_bytes or not self.flush_interval:
+            await self.flush()
+        elif self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        self._flusher = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.info(f"Envoi WebSocket interrompu, connexion fermée : {e}")
+            self._closed = True
+
+    async def flush(self) -> None:
+        """
+        Envoie immédiatement les messages en attente, en une seule trame.
+        """
+        async with self._lock:
+            if not self._pending:
+                return
+            payloads, self._pending, self._pending_bytes = self._pending, [], 0
+            frame = payloads[0] if len(payloads) == 1 else b'{"type":"batch","data":[' + b",".join(payloads) + b"]}"
+            self._count("frames")
+            self._count("bytes", len(frame))
+            with websocket_send_seconds.time():
+                await self.websocket.send_text(frame.decode("utf-8"))
+
+    async def close(self) -> None:
+        """
+        Envoie les messages restants (si la connexion le permet) et ferme la file.
+        """
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        if not self._closed:
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.debug(f"Messages WebSocket non envoyés à la fermeture : {e}")
+        self._closed = True
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats)
+
+
+def outbox_totals() -> Dict[str, int]:
+    """
+    Compteurs cumulés de toutes les connexions (messages, dédupliqués, trames, octets).
+    """
+    return dict(_totals)
@@ -39,11 +39,17 @@ const appState = {
     isLoading: false,
 };
 
-let dataProcessed = {
-    assistantResponse: false,
-    articles: false,
-    jurisprudence: false
-};
+// Parties déjà affichées, par requestId : une question ne modifie jamais l'état d'une autre
+const dataProcessed = new Map();
+
+function processedState(requestId) {
+    let state = dataProcessed.get(requestId);
+    if (!state) {
+        state = { assistantResponse: false, articles: false, jurisprudence: false };
+        dataProcessed.set(requestId, state);
+    }
+    return state;
+}
 
 window.addEventListener('error', function (event) {
     console.error('Erreur JavaScript capturée:', event.error);
@@ -102,6 +108,10 @@ function setLoadingIndicator(isLoading) {
 
 function appendMessageAndSave(role, content) {
     appendMessage(role, content);
+    saveMessage(role, content);
+}
+
+function saveMessage(role, content) {
     const conversation = loadSavedConversation();
     conversation.push({ role, content });
     saveConversationLocally(conversation);
@@ -204,25 +214,26 @@ function formatList(content) {
         .join("");
 }
 
-function displayRealTimeData(data) {
-    if (data.assistantResponse && !dataProcessed.assistantResponse) {
+function displayRealTimeData(data, requestId) {
+    const processed = processedState(requestId);
+    if (data.assistantResponse && !processed.assistantResponse) {
         console.log("Affichage de la réponse de l'assistant");
         appendMessage("assistant", data.assistantResponse);
-        dataProcessed.assistantResponse = true;
+        processed.assistantResponse = true;
     }
 
-    if (data.articles && Array.isArray(data.articles) && !dataProcessed.articles) {
+    if (data.articles && Array.isArray(data.articles) && !processed.articles) {
         console.log("Extraction des articles en arrière-plan");
         appendMessage("system", "Extraction des articles en cours...");
-        data.articles.forEach(article => setTimeout(() => displayArticle(article), 0));
-        dataProcessed.articles = true;
+        data.articles.forEach(article => setTimeout(() => displayArticleOrFailure(article), 0));
+        processed.articles = true;
     }
 
-    if (data.jurisprudence && Array.isArray(data.jurisprudence) && !dataProcessed.jurisprudence) {
+    if (data.jurisprudence && Array.isArray(data.jurisprudence) && !processed.jurisprudence) {
         console.log("Extraction de la jurisprudence en arrière-plan");
         appendMessage("system", "Extraction de la jurisprudence en cours...");
         setTimeout(() => displayJurisprudence(data.jurisprudence), 0);
-        dataProcessed.jurisprudence = true;
+        processed.jurisprudence = true;
     }
 }
 
@@ -231,6 +242,18 @@ function cacheArticle(article) {
     articleCache.set(cacheKey, article);
 }
 
+function reportArticleFailure(article) {
+    appendMessageAndSave("system", `Article ${sanitizeAndNormalizeText(article.law_code || "")} ${sanitizeAndNormalizeText(article.article_number || "")} indisponible : ${sanitizeAndNormalizeText(article.error || "Erreur inconnue")}`);
+}
+
+async function displayArticleOrFailure(article) {
+    if (article.success === false) {
+        reportArticleFailure(article);
+    } else {
+        await displayArticle(article);
+    }
+}
+
 async function displayArticle(article) {
     if (!elements.articlesContainer) {
         console.error("L'élément articles-content est introuvable dans le DOM.");
@@ -383,6 +406,9 @@ class LegalAnalyzer {
         this.socket = null;
         this.reconnectAttempts = 0;
         this.shouldReconnect = true;
+        this.streamingMessages = new Map();
+        this.pendingRequests = new Set();
+        this.nextRequestId = 1;
         this.connectWebSocket();
     }
 
@@ -411,6 +437,10 @@ class LegalAnalyzer {
 
             this.socket.onclose = (event) => {
                 console.warn("Connexion WebSocket fermée:", event);
+                // Le serveur abandonne les questions en cours à la déconnexion
+                this.pendingRequests.clear();
+                this.streamingMessages.clear();
+                dataProcessed.clear();
                 if (elements.statusText) {
                     elements.statusText.textContent = "Déconnecté du serveur";
                 }
@@ -452,8 +482,21 @@ class LegalAnalyzer {
     }
 
     async handleWebSocketMessage(data) {
-        console.log("Traitement du message WebSocket:", JSON.stringify(data, null, 2));
-        displayDebugInfo(data);
+        if (data.type === "batch" && Array.isArray(data.data)) {
+            // Trame regroupant plusieurs messages, traités dans leur ordre d'envoi
+            for (const message of data.data) {
+                await this.handleWebSocketMessage(message);
+            }
+            return;
+        }
+        if (data.requestId && !this.pendingRequests.has(data.requestId)) {
+            // Message d'une question annulée ou déjà terminée
+            return;
+        }
+        if (data.type !== "assistantDelta") {
+            console.log("Traitement du message WebSocket:", JSON.stringify(data, null, 2));
+            displayDebugInfo(data);
+        }
         switch (data.type) {
             case "progress":
                 console.log("Progression:", data.data);
@@ -464,7 +507,7 @@ class LegalAnalyzer {
                     console.error("Erreur reçue du serveur:", data.data.error);
                     appendMessageAndSave("system", `Erreur: ${sanitizeAndNormalizeText(data.data.error)}`);
                 } else if (data.data) {
-                    displayRealTimeData(data.data);
+                    displayRealTimeData(data.data, data.requestId);
                 }
                 break;
             case "article":
@@ -477,9 +520,14 @@ class LegalAnalyzer {
                     await displayJurisprudence([data.data]);
                 }
                 break;
+            case "assistantDelta":
+                if (typeof data.data === 'string') {
+                    this.appendAssistantDelta(data.requestId, data.data);
+                }
+                break;
             case "assistantResponse":
                 if (typeof data.data === 'string') {
-                    appendMessageAndSave("assistant", data.data);
+                    this.finishAssistantResponse(data.requestId, data.data);
                 } else {
                     console.error('Réponse inattendue de l\'assistant:', data);
                     appendMessageAndSave("assistant", "Erreur: Réponse inattendue du serveur");
@@ -496,17 +544,29 @@ class LegalAnalyzer {
             case "complete":
                 console.log("Traitement terminé");
                 stopTimer();
-                dataProcessed = {
-                    assistantResponse: false,
-                    articles: false,
-                    jurisprudence: false
-                };
+                dataProcessed.delete(data.requestId);
                 appendMessageAndSave("system", "Traitement terminé");
+                this.pendingRequests.delete(data.requestId);
                 break;
             case "error":
                 console.error("Erreur reçue du serveur:", data.data);
+                this.streamingMessages.delete(data.requestId);
+                this.pendingRequests.delete(data.requestId);
+                dataProcessed.delete(data.requestId);
                 appendMessageAndSave("system", `Erreur: ${sanitizeAndNormalizeText(data.data)}`);
                 break;
+            case "cancelled":
+                console.log("Question annulée:", data.requestId);
+                dataProcessed.delete(data.requestId);
+                break;
+            case "notice":
+                appendMessage("system", data.data);
+                break;
+            case "timing":
+                if (data.data) {
+                    console.log(`Durée de l'étape ${data.data.stage} : ${data.data.seconds} s`);
+                }
+                break;
             case "log":
                 console.log("Log du serveur:", data.message);
                 break;
@@ -515,6 +575,54 @@ class LegalAnalyzer {
         }
     }
 
+    appendAssistantDelta(requestId, delta) {
+        let streaming = this.streamingMessages.get(requestId);
+        if (!streaming) {
+            streaming = { element: document.createElement("div"), text: "", renderPending: false };
+            streaming.element.className = "message assistant-message streaming";
+            this.streamingMessages.set(requestId, streaming);
+            if (elements.messagesContainer) {
+                elements.messagesContainer.appendChild(streaming.element);
+            }
+        }
+        streaming.text += delta;
+        // Un seul rendu par image, quel que soit le nombre de fragments reçus
+        if (!streaming.renderPending) {
+            streaming.renderPending = true;
+            requestAnimationFrame(() => {
+                streaming.renderPending = false;
+                streaming.element.textContent = streaming.text;
+                if (elements.messagesContainer) {
+                    elements.messagesContainer.scrollTop = elements.messagesContainer.scrollHeight;
+                }
+            });
+        }
+    }
+
+    finishAssistantResponse(requestId, response) {
+        const streaming = this.streamingMessages.get(requestId);
+        if (!streaming) {
+            appendMessageAndSave("assistant", response);
+            return;
+        }
+        // La réponse complète remplace le texte reçu en streaming, avec la mise en forme habituelle
+        this.streamingMessages.delete(requestId);
+        streaming.element.classList.remove("streaming");
+        streaming.element.innerHTML = formatAssistantResponse(response);
+        saveMessage("assistant", response);
+    }
+
+    cancelPendingRequests() {
+        for (const requestId of this.pendingRequests) {
+            if (this.socket && this.socket.readyState === WebSocket.OPEN) {
+                this.socket.send(JSON.stringify({ type: "cancel", requestId }));
+            }
+        }
+        this.pendingRequests.clear();
+        this.streamingMessages.clear();
+        dataProcessed.clear();
+    }
+
     displayAnalysisData(analysisData) {
         if (analysisData['Domaines juridiques']) {
             appendMessageAndSave("system", `Domaines juridiques : ${analysisData['Domaines juridiques']}`);
@@ -535,6 +643,10 @@ class LegalAnalyzer {
             console.error("Format d'article invalide:", article);
             return;
         }
+        if (article.success === false) {
+            reportArticleFailure(article);
+            return;
+        }
         cacheArticle(article);
         await displayArticle(article);
     }
@@ -590,13 +702,17 @@ class LegalAnalyzer {
         setLoadingIndicator(true);
 
         const requestData = {
+            type: "question",
+            requestId: `q-${Date.now()}-${this.nextRequestId++}`,
             question,
             keywords: keywords.filter(Boolean),
         };
+        this.pendingRequests.add(requestData.requestId);
 
         try {
             await this.sendQuestionViaWebSocket(requestData);
         } catch (error) {
+            this.pendingRequests.delete(requestData.requestId);
             console.error("Erreur lors du traitement de la question:", error);
             if (elements.statusText) {
                 elements.statusText.textContent = "Une erreur est survenue";
@@ -697,14 +813,14 @@ function getFedlexLink(lawCode, articleNumber) {
 
 let fedlexReferences;
 
-fetch('/static/fedlex_references.json')
+fetch('/api/fedlex-references')
     .then(response => response.json())
     .then(data => {
         fedlexReferences = data;
         populateLawSelect();
     })
     .catch(error => {
-        console.error('Erreur lors du chargement de fedlex_references.json:', error);
+        console.error('Erreur lors du chargement des références Fedlex:', error);
     });
 
 function populateLawSelect() {
@@ -768,6 +884,9 @@ if (elements.messageForm) {
 if (elements.clearButton) {
     elements.clearButton.addEventListener("click", function () {
         console.log("Bouton d'effacement de l'historique cliqué");
+        if (legalAnalyzer) {
+            legalAnalyzer.cancelPendingRequests();
+        }
         clearQuestionHistory();
     });
 } else {
@@ -791,7 +910,10 @@ if (elements.fetchArticleButton) {
             const article = await fetchArticleWithRetry(lawCode, artNumber);
             if (article.success) {
                 if (elements.articleResult) {
-                    elements.articleResult.innerHTML = formatArticleContent(article);
+                    // Un article ou une plage : les membres en échec sont signalés avec leur erreur
+                    elements.articleResult.innerHTML = article.articles.map(member => member.success === false
+                        ? `<div class="article-error">Article ${sanitizeAndNormalizeText(member.law_code || "")} ${sanitizeAndNormalizeText(member.article_number || "")} indisponible : ${sanitizeAndNormalizeText(member.error || "Erreur inconnue")}</div>`
+                        : formatArticleContent(member)).join("");
                 }
             } else if (article.error) {
                 if (elements.articleResult) {
@@ -0,0 +1,101 @@
+import asyncio
+import os
+import signal
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+import pytest
+
+from app_resources import AppResources, ServiceDraining, create_server, load_prewarm_list
+
+
+def test_load_prewarm_list_keeps_most_requested(tmp_path):
+    path = tmp_path / "prewarm.txt"
+    path.write_text("# commentaire\nCO 41\n\nCC 8  # article cité\nCO 335c\n", encoding="utf-8")
+
+    assert load_prewarm_list(str(path), 2) == [("CO", "41"), ("CC", "8")]
+    assert load_prewarm_list(str(path), 0) == []
+    assert load_prewarm_list(str(tmp_path / "absent.txt"), 5) == []
+
+
+@pytest.mark.asyncio
+async def test_drain_waits_for_in_flight_work_and_refuses_new_work():
+    resources = AppResources("test")
+    finished = []
+
+    async def handle():
+        async with resources.in_flight():
+            await asyncio.sleep(0.05)
+            finished.append(True)
+
+    task = asyncio.create_task(handle())
+    await asyncio.sleep(0)
+    assert resources.readiness()["in_flight"] == 1
+
+    await resources.drain(timeout=1)
+    assert task.done() and finished == [True]
+    assert not resources.readiness()["ready"]
+    with pytest.raises(ServiceDraining):
+        async with resources.in_flight():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_drain_cancels_work_past_timeout():
+    resources = AppResources("test")
+
+    async def handle():
+        async with resources.in_flight():
+            await asyncio.sleep(10)
+
+    task = asyncio.create_task(handle())
+    await asyncio.sleep(0)
+    await resources.drain(timeout=0.01)
+    assert task.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_server_drains_before_handling_the_exit_signal():
+    resources = AppResources("test")
+    server = create_server(lambda scope, receive, send: None, resources)
+    finished = []
+
+    async def handle():
+        async with resources.in_flight():
+            await asyncio.sleep(0.05)
+            finished.append(True)
+
+    task = asyncio.create_task(handle())
+    await asyncio.sleep(0)
+    server.handle_exit(signal.SIGTERM, None)
+    await asyncio.sleep(0.01)
+    # Le serveur ne s'arrête pas encore, mais les nouvelles questions sont refusées
+    assert resources.draining and not server.should_exit
+    with pytest.raises(ServiceDraining):
+        async with resources.in_flight():
+            pass
+
+    await task
+    await asyncio.sleep(0.01)
+    assert finished == [True] and server.should_exit
+
+
+@pytest.mark.asyncio
+async def test_second_signal_stops_the_server_during_drain():
+    resources = AppResources("test")
+    server = create_server(lambda scope, receive, send: None, resources)
+
+    async def handle():
+        async with resources.in_flight():
+            await asyncio.sleep(10)
+
+    task = asyncio.create_task(handle())
+    await asyncio.sleep(0)
+    server.handle_exit(signal.SIGTERM, None)
+    await asyncio.sleep(0.01)
+    server.handle_exit(signal.SIGTERM, None)
+    await asyncio.sleep(0.01)
+    assert server.should_exit
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
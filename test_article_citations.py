@@ -0,0 +1,44 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from article_citations import IncrementalArticleParser, parse_article_line, parse_articles
+
+LAW_CODES = {"CO": "CO", "CC": "CC", "CODE CIVIL": "CC"}
+
+RESPONSE = (
+    "Domaine(s) juridique(s) : Droit des obligations\n\n"
+    "Articles de Loi :\n"
+    "- **art. 41 CO** : Responsabilité délictuelle\n"
+    "- **article 8 Code civil** : Fardeau de la preuve\n"
+    "- **art. 12 LXYZ** : Loi inconnue\n"
+    "- **art. 41 CO** : Citation répétée\n\n"
+    "Résumé : - **art. 99 CO** : hors section"
+)
+
+
+def normalize(code):
+    return LAW_CODES.get(code.upper().strip())
+
+
+def test_incremental_parser_matches_batch_parse_for_any_chunking():
+    section = RESPONSE.split("\n\n")[1]
+    expected = [
+        (article["law_code"], article["article_number"])
+        for article in parse_articles(section, normalize)
+        if "error" not in article
+    ]
+    assert expected == [("CO", "41"), ("CC", "8"), ("CO", "41")]
+
+    for chunk_size in (1, 3, 7, len(RESPONSE)):
+        found = []
+        parser = IncrementalArticleParser(normalize, lambda law, number: found.append((law, number)))
+        for start in range(0, len(RESPONSE), chunk_size):
+            parser.feed(RESPONSE[start:start + chunk_size])
+        parser.close()
+        assert found == [("CO", "41"), ("CC", "8")]
+
+
+def test_unknown_law_code_is_reported_as_cited():
+    assert parse_article_line("- **art. 12 LXYZ** : Loi inconnue", normalize) == {"error": "Code de loi non reconnu: LXYZ"}
@@ -0,0 +1,33 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+import pytest
+
+from article_numbers import article_sort_key, expand_article_range, split_article_range
+
+
+def test_sort_key_follows_fedlex_numbering():
+    numbers = ["7", "6ter", "6a", "6", "6bis", "266_g"]
+    assert sorted(numbers, key=article_sort_key) == ["6", "6a", "6bis", "6ter", "7", "266_g"]
+    with pytest.raises(ValueError):
+        article_sort_key("al. 2")
+
+
+def test_split_article_range():
+    assert split_article_range("266-266g") == ("266", "266g")
+    assert split_article_range("art. 6bis – 6quater") == ("6bis", "6quater")
+    assert split_article_range("41") is None
+
+
+def test_expand_from_numbering():
+    assert expand_article_range("266", "266g") == ["266", "266a", "266b", "266c", "266d", "266e", "266f", "266g"]
+    assert expand_article_range("6bis", "6quater") == ["6bis", "6ter", "6quater"]
+    assert expand_article_range("362", "319") == [str(number) for number in range(319, 363)]
+    assert expand_article_range("1", "1000", limit=5) == ["1", "2", "3", "4", "5"]
+
+
+def test_expand_from_known_articles():
+    known = ["318", "319", "320", "321", "321a", "321b", "322", "333a", "362", "363", "intro"]
+    assert expand_article_range("319", "322", known_numbers=known) == ["319", "320", "321", "321a", "321b", "322"]
@@ -0,0 +1,74 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from cache import BoundedTTLCache, cached, estimate_size, get_cache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = BoundedTTLCache("lru", max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_dropped():
+    cache = BoundedTTLCache("ttl", ttl=60)
+    cache.set("court", "valeur", ttl=0.01)
+    cache.set("long", "valeur")
+    time.sleep(0.02)
+
+    assert cache.get("court") is None
+    assert cache.get("long") == "valeur"
+    stats = cache.stats()
+    assert stats["expirations"] == 1 and stats["entries"] == 1
+
+
+def test_max_bytes_is_accounted_and_enforced():
+    size = estimate_size("x" * 10)
+    cache = BoundedTTLCache("bytes", max_entries=100, max_bytes=2 * size)
+    cache.set("a", "x" * 10)
+    cache.set("b", "x" * 10)
+    assert cache.stats()["bytes"] == 2 * size
+
+    cache.set("a", "x" * 10)  # Remplacement : la taille de l'ancienne valeur est rendue
+    assert cache.stats()["bytes"] == 2 * size
+    cache.set("c", "x" * 10)
+    assert cache.get("b") is None and cache.stats()["bytes"] == 2 * size
+
+    cache.set("trop", "x" * 100)  # Plus grand que le cache entier : ignoré
+    assert cache.get("trop") is None and len(cache) == 2
+    cache.delete("a")
+    assert cache.stats()["bytes"] == size
+
+
+def test_named_cache_limits_can_be_overridden_by_environment(monkeypatch):
+    monkeypatch.setenv("CACHE_TEST_ENV_MAX_ENTRIES", "3")
+    monkeypatch.setenv("CACHE_TEST_ENV_MAX_BYTES", "4096")
+    monkeypatch.setenv("CACHE_TEST_ENV_TTL", "5")
+    cache = get_cache("test_env", max_entries=100, ttl=60)
+
+    assert (cache.max_entries, cache.max_bytes, cache.ttl) == (3, 4096, 5.0)
+    assert get_cache("test_env") is cache
+
+
+def test_cached_keeps_only_accepted_results():
+    calls = []
+
+    @cached(BoundedTTLCache("decorated"), should_cache=lambda result: result.get("success"))
+    def fetch(law_code, article_number):
+        calls.append((law_code, article_number))
+        return {"success": article_number != "0"}
+
+    assert fetch("CO", "1") == {"success": True}
+    assert fetch("CO", "1") == {"success": True}
+    assert fetch("CO", "0") == {"success": False}
+    assert fetch("CO", "0") == {"success": False}
+    assert calls == [("CO", "1"), ("CO", "0"), ("CO", "0")]
@@ -0,0 +1,59 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from connection_manager import ConnectionManager, InMemoryPubSub
+from ws_outbox import WebSocketOutbox
+
+
+class RecordingWebSocket:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.texts = []
+        self.closed = False
+
+    async def send_text(self, text):
+        await asyncio.sleep(self.delay)
+        self.texts.append(text)
+
+    async def close(self, code=1000):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_dropped_without_stalling_others():
+    manager = ConnectionManager(max_queue=2, slow_consumer_policy="disconnect")
+    fast, slow = RecordingWebSocket(), RecordingWebSocket(delay=10)
+    manager.register("fast", WebSocketOutbox(fast, flush_interval=0))
+    manager.register("slow", WebSocketOutbox(slow, flush_interval=0))
+
+    for number in range(5):
+        await manager.broadcast({"type": "notice", "data": number})
+        await asyncio.sleep(0.01)
+
+    assert len(fast.texts) == 5
+    assert slow.closed
+    assert len(manager) == 1
+    assert manager.stats()["disconnected"] == 1
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_broadcasts_reach_clients_of_every_worker_through_pubsub():
+    pubsub = InMemoryPubSub()
+    workers = [ConnectionManager(pubsub=pubsub), ConnectionManager(pubsub=pubsub)]
+    websockets = [RecordingWebSocket(), RecordingWebSocket()]
+    for number, (manager, websocket) in enumerate(zip(workers, websockets)):
+        await manager.start()
+        manager.register(f"client-{number}", WebSocketOutbox(websocket, flush_interval=0))
+
+    await workers[0].broadcast({"type": "notice", "data": "corpus"})
+    await asyncio.sleep(0.05)
+
+    assert [websocket.texts for websocket in websockets] == [['{"type":"notice","data":"corpus"}']] * 2
+    for manager in workers:
+        await manager.stop()
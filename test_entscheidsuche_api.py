@@ -0,0 +1,61 @@
+import json
+import os
+import sys
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from entscheidsuche_api import ENTSCHEIDSUCHE_API_SETTINGS, EntscheidsucheApiClient
+
+DECISIONS = [
+    {
+        "_id": f"CH_BGer_{i}",
+        "_source": {
+            "title": {"de": f"Urteil {i}", "fr": f"Arrêt {i}"},
+            "reference": [f"4A_{i}/2023"],
+            "abstract": {"fr": f"Résiliation du bail {i}"},
+            "attachment": {"content_url": f"https://entscheidsuche.ch/docs/CH_BGer/{i}.html"},
+        },
+    }
+    for i in range(5)
+]
+
+
+class StubSearchHandler(BaseHTTPRequestHandler):
+    bodies = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        StubSearchHandler.bodies.append(body)
+        page = DECISIONS[body["from"]:body["from"] + body["size"]]
+        payload = json.dumps({"hits": {"total": {"value": len(DECISIONS)}, "hits": page}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.mark.asyncio
+async def test_search_paginates_server_side(stub_server, monkeypatch):
+    monkeypatch.setitem(ENTSCHEIDSUCHE_API_SETTINGS, "page_size", 3)
+    StubSearchHandler.bodies = []
+    client = EntscheidsucheApiClient(search_url=f"{stub_server(StubSearchHandler)}/_search")
+    try:
+        results = await client.search("résiliation bail", max_results=10)
+    finally:
+        await client.aclose()
+
+    assert len(results) == 5
+    assert results[0] == {
+        "title": "4A_0/2023 - Arrêt 0",
+        "link": "https://entscheidsuche.ch/docs/CH_BGer/0.html",
+        "summary": "Résiliation du bail 0",
+    }
+    assert [body["from"] for body in StubSearchHandler.bodies] == [0, 3]
+    assert StubSearchHandler.bodies[0]["query"]["simple_query_string"]["query"] == "resiliation bail"
@@ -0,0 +1,96 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+import pytest
+
+from fedlex_corpus import FedlexCorpus, VERSIONS_DIR, build_corpus, publish_version, write_snapshot
+
+
+def _article(title):
+    return {"title": title, "content": f"<h2>{title}</h2>\n"}
+
+
+def test_snapshot_lookup(tmp_path):
+    root = str(tmp_path)
+    write_snapshot(os.path.join(root, VERSIONS_DIR, "v1"), [
+        ("CO", "266g", _article("Art. 266g")),
+        ("CC", "1", _article("Art. 1")),
+        ("CO", "1", _article("Art. 1 CO")),
+        ("LGéo", "3", _article("Art. 3")),
+    ])
+    publish_version(root, "v1")
+
+    corpus = FedlexCorpus(root)
+    assert corpus.version == "v1"
+    assert corpus.get("CO", "266g")["title"] == "Art. 266g"
+    assert corpus.get("CO", "266_G")["title"] == "Art. 266g"
+    assert corpus.get("CO", "1")["title"] == "Art. 1 CO"
+    assert corpus.get("LGéo", "3")["content"] == "<h2>Art. 3</h2>\n"
+    assert corpus.get("CC", "2") is None
+    assert corpus.get("CP", "1") is None
+    assert sorted(corpus.article_numbers("CO")) == ["1", "266g"]
+    assert corpus.article_numbers("CP") == []
+
+
+def test_new_version_is_swapped_in(tmp_path):
+    root = str(tmp_path)
+    assert FedlexCorpus(root).get("CO", "1") is None
+
+    write_snapshot(os.path.join(root, VERSIONS_DIR, "v1"), [("CO", "1", _article("ancien"))])
+    publish_version(root, "v1")
+    corpus = FedlexCorpus(root)
+
+    write_snapshot(os.path.join(root, VERSIONS_DIR, "v2"), [("CO", "1", _article("nouveau"))])
+    publish_version(root, "v2")
+    assert corpus.refresh()
+    assert corpus.version == "v2"
+    assert corpus.get("CO", "1")["title"] == "nouveau"
+
+
+def test_get_does_not_reload_and_retired_snapshots_are_closed(tmp_path):
+    root = str(tmp_path)
+    write_snapshot(os.path.join(root, VERSIONS_DIR, "v1"), [("CO", "1", _article("v1"))])
+    publish_version(root, "v1")
+    corpus = FedlexCorpus(root, refresh_interval=0)
+    first = corpus._snapshot
+
+    write_snapshot(os.path.join(root, VERSIONS_DIR, "v2"), [("CO", "1", _article("v2"))])
+    publish_version(root, "v2")
+    # Les lectures servent la version chargée : seul refresh (le watcher) recharge
+    assert corpus.get("CO", "1")["title"] == "v1"
+    assert corpus.refresh() and corpus.get("CO", "1")["title"] == "v2"
+    assert not first._index.closed
+
+    write_snapshot(os.path.join(root, VERSIONS_DIR, "v3"), [("CO", "1", _article("v3"))])
+    publish_version(root, "v3")
+    assert corpus.refresh()
+    assert first._index.closed
+    corpus.close()
+
+
+def test_build_corpus_carries_over_failed_acts(tmp_path, monkeypatch):
+    import fedlex_extractor
+
+    root = str(tmp_path)
+    write_snapshot(os.path.join(root, VERSIONS_DIR, "v1"), [("CO", "1", _article("CO ancien")), ("CC", "1", _article("CC ancien"))])
+    publish_version(root, "v1")
+
+    def extract(law_code):
+        if law_code in ("CC", "CP"):
+            raise RuntimeError("Fedlex indisponible")
+        return {"1": {"law_code": law_code, **_article(f"{law_code} nouveau")}}
+
+    monkeypatch.setattr(fedlex_extractor, "extract_fedlex_act", extract)
+    assert build_corpus(root, ["CO", "CC"], version="v2") == "v2"
+    corpus = FedlexCorpus(root)
+    assert corpus.version == "v2"
+    assert corpus.get("CO", "1")["title"] == "CO nouveau"
+    assert corpus.get("CC", "1")["title"] == "CC ancien"
+    corpus.close()
+
+    # Un acte en échec sans version antérieure empêche la publication
+    with pytest.raises(RuntimeError):
+        build_corpus(root, ["CO", "CP"], version="v3")
+    assert FedlexCorpus(root).version == "v2"
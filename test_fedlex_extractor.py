@@ -0,0 +1,94 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from fedlex_extractor import FEDLEX_EXTRACTION_SETTINGS, backoff_delay, format_article
+
+
+def test_format_article_keeps_failures_flagged():
+    failed = format_article({"success": False, "law_code": "CO", "article_number": "266h", "error": "Article absent de l'acte"})
+    assert failed == {"law_code": "CO", "article_number": "266h", "success": False, "error": "Article absent de l'acte"}
+
+    article = format_article({"success": True, "law_code": "CO", "article_number": "1", "title": "Art. 1", "content": "<p>Texte</p>"})
+    assert article == {"law_code": "CO", "article_number": "1", "success": True, "title": "Art. 1", "content": "<p>Texte</p>"}
+
+
+def test_backoff_delay_is_bounded():
+    random.seed(0)
+    base, cap = FEDLEX_EXTRACTION_SETTINGS["retry_delay"], FEDLEX_EXTRACTION_SETTINGS["retry_max_delay"]
+    for attempt in range(8):
+        ceiling = min(cap, base * 2 ** attempt)
+        delays = [backoff_delay(attempt) for _ in range(200)]
+        assert all(ceiling / 2 <= delay <= ceiling for delay in delays)
+    assert max(backoff_delay(20) for _ in range(200)) <= cap
+
+
+ACT_HTML = """
+<html><body><div id="lawcontent">
+  <article id="art_1"><h5 class="article-title">Art. 1 Conclusion du contrat</h5>
+    <div>Le contrat est parfait lorsque les parties ont manifesté leur volonté.</div>
+  </article>
+  <article id="art_6_bis"><h5 class="article-title">Art. 6bis Envoi de choses non commandées</h5>
+    <p>L'envoi d'une chose non commandée ne constitue pas une offre.</p>
+    <ul><li>a. premier cas</li><li>b. second cas</li></ul>
+  </article>
+  <article id="art_266_g"><h5 class="article-title">Art. 266g Justes motifs</h5>
+    <p>Les parties peuvent résilier le bail pour de justes motifs.</p>
+  </article>
+  <article id="art_40_a"><div>Sans titre.</div></article>
+</div></body></html>
+"""
+
+
+def test_parse_act_articles_and_store_lookup():
+    from fedlex_extractor import ActArticleStore, parse_act_articles
+
+    articles = parse_act_articles("CO", ACT_HTML)
+    assert sorted(articles) == ["1", "266g", "40a", "6bis"]
+    assert articles["6bis"]["title"] == "Art. 6bis Envoi de choses non commandées"
+    assert articles["6bis"]["content"] == (
+        "<h2>Code des obligations - Art. 6bis Envoi de choses non commandées</h2>\n"
+        "<p>L'envoi d'une chose non commandée ne constitue pas une offre.</p>\n"
+        "<ul>\n  <li>a. premier cas</li>\n  <li>b. second cas</li>\n</ul>\n"
+    )
+    assert articles["1"]["content"].endswith("<p>Le contrat est parfait lorsque les parties ont manifesté leur volonté.</p>\n")
+    assert articles["40a"]["title"] == "Article 40a"
+
+    store = ActArticleStore()
+    store.put_act("CO", articles)
+    assert store.is_act_loaded("CO") and not store.is_act_loaded("CC")
+    assert store.get("CO", "266_G")["title"] == "Art. 266g Justes motifs"
+    assert store.get("CO", "6 bis")["article_number"] == "6bis"
+    assert store.get("CO", "2") is None
+    assert sorted(store.article_numbers("CO")) == ["1", "266g", "40a", "6bis"]
+
+
+def test_single_stored_article_does_not_restrict_a_range():
+    from article_numbers import expand_article_range
+    from fedlex_extractor import ActArticleStore
+
+    store = ActArticleStore()
+    store.put("CO", "330", {"success": True, "law_code": "CO", "article_number": "330"})
+    assert store.act_article_numbers("CO") == []
+    numbers = expand_article_range("319", "362", known_numbers=store.act_article_numbers("CO"))
+    assert numbers[0] == "319" and numbers[-1] == "362" and "330" in numbers and len(numbers) > 1
+
+    store.put_act("CO", {"319": {}, "330": {}, "330a": {}, "362": {}})
+    assert expand_article_range("319", "362", known_numbers=store.act_article_numbers("CO")) == ["319", "330", "330a", "362"]
+
+
+def test_store_forgets_least_recently_used_acts():
+    from cache import BoundedTTLCache
+    from fedlex_extractor import ActArticleStore
+
+    store = ActArticleStore(BoundedTTLCache("acts", max_entries=2))
+    store.put_act("CO", {"1": {"title": "CO 1"}})
+    store.put_act("CC", {"1": {"title": "CC 1"}})
+    assert store.get("CO", "1")["title"] == "CO 1"
+    store.put("CP", "1", {"title": "CP 1"})
+
+    assert not store.is_act_loaded("CC") and store.get("CC", "1") is None
+    assert store.act_articles("CO") == {"1": {"title": "CO 1"}}
+    assert store.act_articles("CP") is None and store.get("CP", "1") == {"title": "CP 1"}
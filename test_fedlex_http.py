@@ -0,0 +1,66 @@
+import json
+import os
+import sys
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+import fedlex_http
+from fedlex_extractor import ActArticleStore
+from fedlex_http import FedlexHttpFetcher
+
+CO_MANIFESTATION = """<!DOCTYPE html>
+<html><head><title>RS 220</title></head><body>
+<div id="lawcontent">
+<article id="art_1"><h5 class="article-title">Art. 1</h5><div><p>Le contrat est parfait lorsque les parties ont, réciproquement et d'une manière concordante, manifesté leur volonté.</p></div></article>
+<article id="art_266_g"><h5 class="article-title">Art. 266g</h5><div><p>Justes motifs.</p></div><ul><li>a. premier</li></ul></article>
+</div></body></html>"""
+
+
+class StubFedlexHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, body: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        StubFedlexHandler.requests.append(("POST", self.path))
+        url = f"http://127.0.0.1:{self.server.server_port}/filestore/co.html"
+        self._reply(json.dumps({"results": {"bindings": [{"url": {"value": url}}]}}).encode(), "application/sparql-results+json")
+
+    def do_GET(self):
+        StubFedlexHandler.requests.append(("GET", self.path))
+        self._reply(CO_MANIFESTATION.encode("utf-8"), "text/html; charset=utf-8")
+
+
+@pytest.mark.asyncio
+async def test_fetch_article_from_static_manifestation(stub_server, monkeypatch):
+    monkeypatch.setattr(fedlex_http, "act_store", ActArticleStore())
+    StubFedlexHandler.requests = []
+    base_url = stub_server(StubFedlexHandler)
+    fetcher = FedlexHttpFetcher(sparql_url=f"{base_url}/sparql")
+    try:
+        article = await fetcher.fetch_article("CO", "266g")
+        assert article["success"] is True
+        assert article["law_code"] == "CO"
+        assert article["title"] == "Art. 266g"
+        assert "<li>a. premier</li>" in article["content"]
+
+        # Le deuxième article est servi depuis l'acte déjà téléchargé
+        article = await fetcher.fetch_article("co", "1")
+        assert article["content"].startswith("<h2>Code des obligations - Art. 1</h2>")
+        assert await fetcher.fetch_article("CO", "999") is None
+    finally:
+        await fetcher.aclose()
+
+    assert StubFedlexHandler.requests == [("POST", "/sparql"), ("GET", "/filestore/co.html")]
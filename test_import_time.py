@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app')
+
+# Budget d'import de main.py en secondes, vérifié seulement s'il est défini (mesure dépendante de la machine)
+IMPORT_TIME_BUDGET = os.getenv("IMPORT_TIME_BUDGET")
+LAZY_MODULES = ("selenium", "chromedriver_autoinstaller", "playwright", "bs4", "nltk", "openai", "uvicorn")
+
+
+def test_main_import_is_lazy_and_offline(tmp_path):
+    env = {**os.environ, "OPENAI_API_KEY": "test", "SEMANTIC_CACHE_ENABLED": "false"}
+    code = f"import sys; sys.path.insert(0, {APP_DIR!r}); import main"
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60)
+    assert completed.returncode == 0, completed.stderr[-2000:]
+
+    imported = {}
+    for line in completed.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                imported[name.strip()] = int(cumulative) / 1e6
+
+    assert not [name for name in imported if name.split(".")[0] in LAZY_MODULES]
+    if IMPORT_TIME_BUDGET:
+        assert imported["main"] < float(IMPORT_TIME_BUDGET)
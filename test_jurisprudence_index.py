@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from jurisprudence_index import JurisprudenceIndex
+
+DECISIONS = [
+    {"title": "4A_1/2020", "link": "a", "summary": "Résiliation du contrat de bail pour justes motifs, bail commercial, bail résilié."},
+    {"title": "4A_2/2020", "link": "b", "summary": "Contrat de bail à loyer, résiliation ordinaire."},
+    {"title": "4A_3/2020", "link": "c", "summary": "Contrat de travail, licenciement immédiat."},
+    {"title": "4A_4/2020", "link": "d", "summary": "Contrat de vente, garantie pour les défauts."},
+]
+
+
+def build_index():
+    index = JurisprudenceIndex(stopwords=["de", "du", "le", "la", "les", "pour", "a"])
+    index.add(DECISIONS)
+    return index
+
+
+def test_bm25_ranks_frequent_and_rare_terms_first():
+    index = build_index()
+    titles = [decision["title"] for decision in index.search("bail contrat")]
+    # « bail » est rare et répété dans la première décision ; « contrat » est présent partout
+    assert titles[:2] == ["4A_1/2020", "4A_2/2020"]
+    assert set(titles[2:]) == {"4A_3/2020", "4A_4/2020"}
+
+
+def test_match_all_and_min_score_filter_weak_matches():
+    index = build_index()
+    assert [decision["title"] for decision in index.search("résiliation bail", match_all=True)] == ["4A_1/2020", "4A_2/2020"]
+    assert index.search("bail inexistant", match_all=True) == []
+    # Un terme présent dans toutes les décisions a un score trop faible pour être retenu
+    assert index.search("contrat", min_score=0.5) == []
+
+
+def test_keywords_are_fresh_only_after_an_online_fetch_within_ttl():
+    index = build_index()
+    assert not index.is_fresh("Résiliation bail", ttl=60)
+    index.mark_fetched("bail résiliation")
+    assert index.is_fresh("Résiliation bail", ttl=60)
+    index.mark_fetched("bail résiliation", fetched_at=time.time() - 120)
+    assert not index.is_fresh("Résiliation bail", ttl=60)
@@ -0,0 +1,37 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+import pytest
+
+from law_registry import LawRegistry, law_registry
+
+
+@pytest.mark.parametrize("cited, expected", [
+    ("CO", "CO"),
+    ("CO suisse", "CO"),
+    ("Code des obligations", "CO"),
+    ("Cst.", "Cst"),
+    ("Cst. féd.", "Cst"),
+    ("LAMAL", "LAMal"),
+    ("LGEO", "LGéo"),
+    ("LGA", "LGG"),
+    ("al. 2 CP", "CP"),
+    ("Loi fédérale sur l'assurance-maladie (LAMal)", "LAMal"),
+    ("Code", None),
+    ("LXYZ", None),
+])
+def test_resolve(cited, expected):
+    assert law_registry.resolve(cited) == expected
+
+
+def test_conflicts_are_rejected():
+    link = "https://www.fedlex.admin.ch/eli/cc/2018/801/fr"
+    with pytest.raises(ValueError, match="même lien"):
+        LawRegistry({"LEFin": {"lien": link, "titre": "A"}, "LSFin": {"lien": link, "titre": "B"}})
+    with pytest.raises(ValueError, match="alias"):
+        LawRegistry({
+            "LGA": {"lien": "https://www.fedlex.admin.ch/eli/cc/1/fr", "titre": "Loi sur le génie génétique"},
+            "LGG": {"lien": "https://www.fedlex.admin.ch/eli/cc/2/fr", "titre": "Loi sur le genie genetique"},
+        })
@@ -0,0 +1,49 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+import pytest
+
+from metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("stage_seconds", "Durée d'une étape.", ["stage"], buckets=[0.1, 1])
+    histogram.observe(0.05, stage="parse")
+    histogram.observe(0.5, stage="parse")
+    histogram.observe(5, stage="parse")
+
+    lines = registry.render().splitlines()
+    assert "# TYPE stage_seconds histogram" in lines
+    assert 'stage_seconds_bucket{stage="parse",le="0.1"} 1' in lines
+    assert 'stage_seconds_bucket{stage="parse",le="1"} 2' in lines
+    assert 'stage_seconds_bucket{stage="parse",le="+Inf"} 3' in lines
+    assert 'stage_seconds_sum{stage="parse"} 5.55' in lines
+    assert 'stage_seconds_count{stage="parse"} 3' in lines
+
+
+def test_counter_labels_are_validated_and_escaped():
+    registry = MetricsRegistry()
+    errors = registry.counter("errors_total", "Erreurs.", ["upstream"])
+    errors.inc(upstream='fedlex "http"')
+    errors.inc(2, upstream='fedlex "http"')
+
+    assert 'errors_total{upstream="fedlex \\"http\\""} 3' in registry.render().splitlines()
+    with pytest.raises(ValueError):
+        errors.inc(service="openai")
+
+
+def test_existing_stats_are_exported_one_family_per_value():
+    registry = MetricsRegistry()
+    groups = lambda: {"gpt4": {"executed": 4, "inflight": 1}, "article": {"executed": 2, "inflight": 0}}
+    registry.register_stat("flight_executed_total", "counter", "Appels exécutés.", groups, "executed", label="group")
+    registry.register_stat("flight_inflight", "gauge", "Appels en cours.", groups, "inflight", label="group")
+    registry.register_stat("admission_avg_wait_seconds", "gauge", "Attente moyenne.", lambda: {"avg_wait": 0.5}, "avg_wait")
+
+    lines = registry.render().splitlines()
+    assert "# TYPE flight_executed_total counter" in lines and "# TYPE flight_inflight gauge" in lines
+    assert 'flight_executed_total{group="gpt4"} 4' in lines
+    assert 'flight_inflight{group="article"} 0' in lines
+    assert "admission_avg_wait_seconds 0.5" in lines
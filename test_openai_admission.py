@@ -0,0 +1,89 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from openai_admission import AdmissionController, AdmissionRejected
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_and_round_robin_between_clients():
+    controller = AdmissionController(max_concurrency=1, tokens_per_minute=1_000_000, max_queue=10)
+    order = []
+    release = asyncio.Event()
+
+    async def call(client_id, label):
+        async with controller.admit(client_id, 10):
+            order.append(label)
+            await release.wait()
+
+    first = asyncio.create_task(call("a", "a1"))
+    await asyncio.sleep(0)
+    others = [asyncio.create_task(call(client_id, label)) for client_id, label in (("a", "a2"), ("a", "a3"), ("b", "b1"))]
+    await asyncio.sleep(0)
+    assert controller.stats()["queue_depth"] == 3
+    assert controller.stats()["queue_depth_by_client"] == {"a": 2, "b": 1}
+
+    release.set()
+    await asyncio.gather(first, *others)
+    assert order == ["a1", "a2", "b1", "a3"]
+    assert controller.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected_with_retry_after():
+    controller = AdmissionController(max_concurrency=1, tokens_per_minute=1_000_000, max_queue=1)
+    release = asyncio.Event()
+
+    async def call():
+        async with controller.admit("a", 10):
+            await release.wait()
+
+    tasks = [asyncio.create_task(call()), asyncio.create_task(call())]
+    await asyncio.sleep(0)
+    with pytest.raises(AdmissionRejected) as rejected:
+        async with controller.admit("b", 10):
+            pass
+    assert rejected.value.retry_after >= 1
+    assert controller.stats()["rejected"] == 1
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_token_budget_delays_admission():
+    controller = AdmissionController(max_concurrency=10, tokens_per_minute=600, max_queue=10)
+    async with controller.admit("a", 600):
+        pass
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    async with controller.admit("a", 10):
+        pass
+    assert loop.time() - started >= 0.5
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_queue():
+    controller = AdmissionController(max_concurrency=1, tokens_per_minute=1_000_000, max_queue=10)
+    release = asyncio.Event()
+
+    async def call():
+        async with controller.admit("a", 10):
+            await release.wait()
+
+    running = asyncio.create_task(call())
+    await asyncio.sleep(0)
+    waiting = asyncio.create_task(call())
+    await asyncio.sleep(0)
+    waiting.cancel()
+    await asyncio.sleep(0)
+    assert controller.stats()["queue_depth"] == 0
+
+    release.set()
+    await running
+    assert controller.stats()["in_flight"] == 0
@@ -0,0 +1,100 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+import pytest
+
+from playwright_manager import PlaywrightManager
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+
+class FakeContext:
+    def __init__(self):
+        self.page_obj = FakePage()
+        self.closed = False
+
+    async def add_init_script(self, script):
+        pass
+
+    async def new_page(self):
+        return self.page_obj
+
+    async def close(self):
+        self.closed = True
+        self.page_obj.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.fail_new_context = False
+        self.contexts = []
+
+    def is_connected(self):
+        return True
+
+    async def new_context(self, locale=None):
+        if self.fail_new_context:
+            raise RuntimeError("new_context indisponible")
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+
+async def started_manager(pool_size=1, **kwargs):
+    manager = PlaywrightManager(pool_size=pool_size, **kwargs)
+    manager._browser = FakeBrowser()
+    manager._pages = asyncio.Queue()
+    for _ in range(pool_size):
+        manager._pages.put_nowait(await manager._new_entry())
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_failed_context_creation_keeps_the_slot():
+    manager = await started_manager()
+    manager._browser.contexts[0].page_obj.closed = True
+    manager._browser.fail_new_context = True
+
+    with pytest.raises(RuntimeError):
+        async with manager.page():
+            pass
+    assert manager._pages.qsize() == 1
+
+    manager._browser.fail_new_context = False
+    async with manager.page() as page:
+        assert not page.is_closed()
+    assert manager._pages.qsize() == 1
+
+
+@pytest.mark.asyncio
+async def test_search_error_recycles_context_even_if_recreation_fails():
+    manager = await started_manager()
+    first_context = manager._browser.contexts[0]
+    manager._browser.fail_new_context = True
+
+    with pytest.raises(ValueError):
+        async with manager.page():
+            raise ValueError("erreur de recherche")
+    assert first_context.closed
+    # La place est rendue vide, jamais avec le contexte fermé
+    assert manager._pages.qsize() == 1 and manager._pages.get_nowait() is None
+
+
+@pytest.mark.asyncio
+async def test_checkout_times_out_when_pool_is_exhausted():
+    manager = await started_manager(acquire_timeout=0.01)
+
+    async with manager.page():
+        with pytest.raises(asyncio.TimeoutError):
+            async with manager.page():
+                pass
+    assert manager._pages.qsize() == 1
@@ -0,0 +1,53 @@
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+import pytest
+
+from rate_limiter import AsyncTokenBucket, HostRateLimiter
+
+
+@pytest.mark.asyncio
+async def test_bucket_allows_burst_then_waits_for_refill():
+    bucket = AsyncTokenBucket(rate=20, burst=2)
+    assert await bucket.acquire() < 0.01
+    assert await bucket.acquire() < 0.01
+    # Rafale épuisée : le troisième jeton est régénéré en 1/20 s
+    assert await bucket.acquire() >= 0.03
+    assert bucket.stats()["acquired"] == 3
+
+
+@pytest.mark.asyncio
+async def test_bucket_refills_up_to_burst_only():
+    bucket = AsyncTokenBucket(rate=100, burst=1)
+    await bucket.acquire()
+    await asyncio.sleep(0.05)
+    assert await bucket.acquire() < 0.01
+    assert await bucket.acquire() >= 0.005
+
+
+@pytest.mark.asyncio
+async def test_hosts_have_isolated_buckets():
+    limiter = HostRateLimiter(limits={"www.fedlex.admin.ch": {"rate": 0.1, "burst": 1}}, default={"rate": 0.1, "burst": 1})
+    assert await limiter.acquire("https://www.fedlex.admin.ch/eli/cc/27/317_321_377/fr") < 0.01
+    assert await limiter.acquire("https://entscheidsuche.ch/_search.php") < 0.01
+    assert limiter.bucket("www.fedlex.admin.ch") is limiter.bucket("https://www.fedlex.admin.ch/eli/cc/24/233_245_233/fr")
+
+
+@pytest.mark.asyncio
+async def test_blocking_acquirer_takes_a_token_per_call_from_a_thread():
+    limiter = HostRateLimiter(limits={}, default={"rate": 20, "burst": 1})
+    acquire = limiter.blocking_acquirer("www.fedlex.admin.ch", asyncio.get_running_loop())
+
+    def load_pages():
+        started_at = time.monotonic()
+        for _ in range(3):
+            acquire()
+        return time.monotonic() - started_at
+
+    # Trois chargements : le premier jeton est disponible, les deux suivants attendent 1/20 s chacun
+    assert await asyncio.to_thread(load_pages) >= 0.08
+    assert limiter.stats()["www.fedlex.admin.ch"]["acquired"] == 3
@@ -0,0 +1,80 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from semantic_cache import SemanticCache
+
+VOCABULARY = ["divorce", "conditions", "bail", "résiliation", "suisse", "licenciement"]
+
+
+def embed(question):
+    words = question.lower().replace("?", " ").split()
+    return [sum(word.startswith(term[:6]) for word in words) for term in VOCABULARY]
+
+
+@pytest.mark.asyncio
+async def test_similar_questions_share_an_answer():
+    cache = SemanticCache(embed, dim=len(VOCABULARY), threshold=0.8)
+    await cache.set("Quelles sont les conditions du divorce ?", {"assistantResponse": "divorce"})
+
+    assert await cache.get("conditions pour divorcer en Suisse") == {"assistantResponse": "divorce"}
+    assert await cache.get("résiliation du bail") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_question_is_evicted():
+    cache = SemanticCache(embed, dim=len(VOCABULARY), threshold=0.99, max_entries=2)
+    await cache.set("divorce", "a")
+    await cache.set("bail", "b")
+    assert await cache.get("divorce") == "a"
+    await cache.set("licenciement", "c")
+
+    assert await cache.get("bail") is None
+    assert await cache.get("divorce") == "a"
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_entries_survive_a_restart(tmp_path):
+    path = str(tmp_path / "semantic.npz")
+    cache = SemanticCache(embed, dim=len(VOCABULARY), path=path)
+    await cache.set("conditions du divorce", {"assistantResponse": "ok"})
+    cache.save()
+
+    reloaded = SemanticCache(embed, dim=len(VOCABULARY), path=path)
+    assert len(reloaded) == 1
+    assert await reloaded.get("Conditions du divorce") == {"assistantResponse": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_embedding_dimension_is_checked():
+    cache = SemanticCache(lambda question: np.ones(3), dim=len(VOCABULARY), model="constant")
+    assert await cache.get("divorce") is None
+    assert cache.stats()["embedding_errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_embeddings_use_the_named_cache():
+    from cache import cache_stats
+
+    cache = SemanticCache(embed, dim=len(VOCABULARY), model="vocabulary")
+    await cache.set("licenciement abusif", "a")
+    assert await cache.get("licenciement abusif") == "a"
+    assert cache_stats()["embeddings"]["hits"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_entries_of_another_model_are_dropped(tmp_path):
+    path = str(tmp_path / "semantic.npz")
+    cache = SemanticCache(embed, dim=len(VOCABULARY), path=path, model="modele-a")
+    await cache.set("conditions du divorce", {"assistantResponse": "ok"})
+    cache.save()
+
+    assert len(SemanticCache(embed, dim=len(VOCABULARY), path=path, model="modele-a")) == 1
+    assert len(SemanticCache(embed, dim=len(VOCABULARY), path=path, model="modele-b")) == 0
@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from cache import BoundedTTLCache
+from shared_cache import TwoLevelCache, create_backend
+
+
+@pytest.mark.asyncio
+async def test_sqlite_tier_is_shared_between_workers(tmp_path):
+    url = f"sqlite:///{tmp_path / 'cache.db'}"
+    worker_a = TwoLevelCache("article", BoundedTTLCache("article"), create_backend(url))
+    worker_b = TwoLevelCache("article", BoundedTTLCache("article"), create_backend(url))
+    try:
+        article = {"success": True, "articles": [{"law_code": "CO", "article_number": "1", "title": "Art. 1"}]}
+        await worker_a.set("CO-1", article)
+
+        assert await worker_b.get("CO-1") == article
+        assert worker_b.stats()["l2_hits"] == 1
+        # Le second accès est servi par le L1 du worker B
+        assert await worker_b.get("CO-1") == article
+        assert worker_b.stats()["l2_hits"] == 1
+        assert await worker_b.get("CO-2") is None
+    finally:
+        await worker_a.backend.aclose()
+        await worker_b.backend.aclose()
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_not_served(tmp_path):
+    backend = create_backend(f"sqlite:///{tmp_path / 'cache.db'}")
+    cache = TwoLevelCache("gpt4", BoundedTTLCache("gpt4"), backend, ttl=-1)
+    try:
+        await cache.set("question", {"assistantResponse": "..."})
+        cache.l1.clear()
+        assert await cache.get("question") is None
+    finally:
+        await backend.aclose()
@@ -0,0 +1,51 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+import pytest
+
+from stream_listeners import StreamListeners
+
+
+@pytest.mark.asyncio
+async def test_cancelled_subscriber_receives_no_more_deltas():
+    listeners = StreamListeners()
+    flight = asyncio.get_running_loop().create_future()
+    received = {"cancelled": [], "kept": []}
+
+    async def subscriber(name):
+        async def on_delta(delta):
+            received[name].append(delta)
+
+        with listeners.subscribe("question", on_delta):
+            await asyncio.shield(flight)
+
+    cancelled = asyncio.create_task(subscriber("cancelled"))
+    kept = asyncio.create_task(subscriber("kept"))
+    await asyncio.sleep(0)
+
+    # Premier fragment : le flux prend la liste des abonnés
+    taken = listeners.take("question")
+    await StreamListeners.publish(taken, "a")
+    cancelled.cancel()
+    await asyncio.gather(cancelled, return_exceptions=True)
+    await StreamListeners.publish(taken, "b")
+
+    flight.set_result(None)
+    await kept
+    assert received == {"cancelled": ["a"], "kept": ["a", "b"]}
+    assert taken == [] and len(listeners) == 0
+
+
+@pytest.mark.asyncio
+async def test_subscriber_leaving_before_first_delta_is_forgotten():
+    listeners = StreamListeners()
+
+    async def on_delta(delta):
+        pass
+
+    with listeners.subscribe("question", on_delta):
+        assert len(listeners) == 1
+    assert len(listeners) == 0 and listeners.take("question") == []
@@ -0,0 +1,111 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+import pytest
+
+from webdriver_pool import WebDriverPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.healthy = True
+        self.quit_called = False
+
+    def execute_script(self, script):
+        if not self.healthy:
+            raise RuntimeError("session perdue")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeFactory:
+    def __init__(self):
+        self.drivers = []
+
+    def __call__(self):
+        driver = FakeDriver()
+        self.drivers.append(driver)
+        return driver
+
+
+def test_returned_driver_is_reused():
+    factory = FakeFactory()
+    pool = WebDriverPool(factory, size=1, max_uses=10)
+    with pool.driver() as first:
+        pass
+    with pool.driver() as second:
+        pass
+
+    assert first is second and len(factory.drivers) == 1
+    assert pool.stats()["checkouts"] == 2 and pool.stats()["idle"] == 1
+
+
+def test_unhealthy_idle_driver_is_replaced():
+    factory = FakeFactory()
+    pool = WebDriverPool(factory, size=1)
+    assert pool.warm() == 1
+    factory.drivers[0].healthy = False
+
+    with pool.driver() as driver:
+        assert driver is factory.drivers[1]
+    assert factory.drivers[0].quit_called
+    assert pool.stats()["discarded"] == 1
+
+
+def test_failed_driver_is_discarded_only_if_unhealthy():
+    factory = FakeFactory()
+    pool = WebDriverPool(factory, size=1)
+    with pytest.raises(ValueError):
+        with pool.driver():
+            raise ValueError("page introuvable")
+    assert pool.stats()["idle"] == 1
+
+    with pytest.raises(ValueError):
+        with pool.driver() as driver:
+            driver.healthy = False
+            raise ValueError("session perdue")
+    assert driver.quit_called and pool.stats()["idle"] == 0
+
+
+def test_driver_is_recycled_after_max_uses():
+    factory = FakeFactory()
+    pool = WebDriverPool(factory, size=1, max_uses=2)
+    for _ in range(3):
+        with pool.driver():
+            pass
+
+    assert len(factory.drivers) == 2
+    assert factory.drivers[0].quit_called and not factory.drivers[1].quit_called
+    assert pool.stats()["recycled"] == 1
+
+
+def test_checkout_times_out_when_pool_is_exhausted():
+    pool = WebDriverPool(FakeFactory(), size=1, acquire_timeout=0.01)
+    with pool.driver():
+        with pytest.raises(TimeoutError):
+            with pool.driver():
+                pass
+
+
+def test_warm_counts_borrowed_drivers():
+    factory = FakeFactory()
+    pool = WebDriverPool(factory, size=2)
+    with pool.driver():
+        assert pool.warm() == 1
+        assert pool.warm() == 1
+        assert len(factory.drivers) == 2
+    with pool.driver(), pool.driver():
+        pass
+    assert len(factory.drivers) == 2 and pool.stats()["idle"] == 2
+
+
+def test_warm_creates_nothing_when_every_slot_is_borrowed():
+    factory = FakeFactory()
+    pool = WebDriverPool(factory, size=1)
+    with pool.driver():
+        assert pool.warm() == 0
+    assert len(factory.drivers) == 1
@@ -0,0 +1,66 @@
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from ws_outbox import OutboxClosed, WebSocketOutbox
+
+
+class RecordingWebSocket:
+    def __init__(self):
+        self.frames = []
+
+    async def send_text(self, text):
+        self.frames.append(json.loads(text))
+
+
+@pytest.mark.asyncio
+async def test_messages_are_batched_within_the_flush_window():
+    websocket = RecordingWebSocket()
+    outbox = WebSocketOutbox(websocket, flush_interval=0.01)
+    for number in range(3):
+        await outbox.send({"type": "article", "data": {"article_number": str(number)}, "requestId": "q1"})
+    assert websocket.frames == []
+
+    await asyncio.sleep(0.05)
+    assert len(websocket.frames) == 1
+    assert websocket.frames[0]["type"] == "batch"
+    assert [message["data"]["article_number"] for message in websocket.frames[0]["data"]] == ["0", "1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_identical_results_are_sent_once_per_question():
+    websocket = RecordingWebSocket()
+    outbox = WebSocketOutbox(websocket, flush_interval=0)
+    for request_id in ("q1", "q1", "q2"):
+        await outbox.send({"type": "analysis", "data": {"Résumé": "x"}, "requestId": request_id})
+        await outbox.send({"type": "assistantDelta", "data": " de", "requestId": request_id})
+    await outbox.send({"type": "complete", "data": "Traitement terminé", "requestId": "q1"})
+    await outbox.send({"type": "complete", "data": "Traitement terminé", "requestId": "q1"})
+
+    sent = [(frame["requestId"], frame["type"]) for frame in websocket.frames]
+    assert sent == [
+        ("q1", "analysis"), ("q1", "assistantDelta"), ("q1", "assistantDelta"),
+        ("q2", "analysis"), ("q2", "assistantDelta"), ("q1", "complete"), ("q1", "complete"),
+    ]
+    assert outbox.stats()["deduplicated"] == 1
+    # Une question terminée n'occupe plus de mémoire dans la file de la connexion
+    assert "q1" not in outbox._seen and "q2" in outbox._seen
+
+
+@pytest.mark.asyncio
+async def test_large_batches_are_flushed_immediately_and_close_flushes_the_rest():
+    websocket = RecordingWebSocket()
+    outbox = WebSocketOutbox(websocket, flush_interval=10, max_batch_messages=2)
+    for number in range(3):
+        await outbox.send({"type": "progress", "data": number})
+    assert len(websocket.frames) == 1
+
+    await outbox.close()
+    assert websocket.frames[-1] == {"type": "progress", "data": 2}
+    with pytest.raises(OutboxClosed):
+        await outbox.send({"type": "progress", "data": 3})